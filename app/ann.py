@@ -0,0 +1,127 @@
+"""
+Approximate candidate generation for large catalogs.
+
+An inverted-file (IVF) index over TruncatedSVD-reduced TF-IDF rows: jobs are
+assigned to the nearest of n_lists k-means centroids, and a query only looks
+at the jobs in its nprobe closest lists. Those candidates are then re-ranked
+with the exact TF-IDF + skills formula, so scores are identical to exact
+ranking for every job that makes it into the candidate set.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from .ranking import subset_top_k
+
+DEFAULT_NPROBE = 8
+# rows projected per block while assigning; bounds the dense (rows x components) buffer
+_BLOCK = 65536
+
+
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+class IVFIndex:
+    """
+    Cluster lists over job rows. Immutable; extended() returns a new index
+    with appended rows assigned to the existing centroids.
+    """
+
+    def __init__(self, components: np.ndarray, centroids: np.ndarray, assign: np.ndarray):
+        self.components = components  # (n_components, n_features) float32
+        self.centroids = centroids  # (n_lists, n_components) float32, unit rows
+        self.assign = assign  # list id per job row, int32
+        # rows grouped by list: rows[offsets[c]:offsets[c + 1]] belong to list c, ascending
+        self.rows = np.argsort(assign, kind="stable").astype(np.int32)
+        self.offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=len(centroids)), out=self.offsets[1:])
+
+    @classmethod
+    def build(
+        cls,
+        job_tfidf: sp.csr_matrix,
+        n_components: int = 64,
+        n_lists: Optional[int] = None,
+        sample_size: int = 100_000,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Fit the projection and centroids on a row sample, then assign every row.
+        n_lists defaults to sqrt(n_jobs); with nprobe=8 that scores under 1% of a 1M catalog.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+
+        n_jobs, n_features = job_tfidf.shape
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(n_jobs, size=min(sample_size, n_jobs), replace=False))
+        n_components = max(1, min(n_components, n_features - 1, len(sample) - 1))
+        svd = TruncatedSVD(n_components=n_components, algorithm="randomized", n_iter=4, random_state=seed)
+        reduced = _unit_rows(svd.fit_transform(job_tfidf[sample]).astype(np.float32))
+        n_lists = n_lists or int(np.sqrt(n_jobs))
+        n_lists = max(1, min(n_lists, len(sample)))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=1, random_state=seed)
+        kmeans.fit(reduced)
+        components = svd.components_.astype(np.float32)
+        centroids = _unit_rows(kmeans.cluster_centers_.astype(np.float32))
+        return cls(components, centroids, cls._assign(components, centroids, job_tfidf))
+
+    @staticmethod
+    def _assign(components: np.ndarray, centroids: np.ndarray, job_tfidf: sp.csr_matrix) -> np.ndarray:
+        assign = np.empty(job_tfidf.shape[0], dtype=np.int32)
+        for start in range(0, job_tfidf.shape[0], _BLOCK):
+            block = job_tfidf[start:start + _BLOCK]
+            assign[start:start + block.shape[0]] = np.argmax(_unit_rows(block @ components.T) @ centroids.T, axis=1)
+        return assign
+
+    def __len__(self) -> int:
+        return len(self.assign)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def extended(self, new_tfidf: sp.csr_matrix) -> "IVFIndex":
+        added = self._assign(self.components, self.centroids, new_tfidf)
+        return IVFIndex(self.components, self.centroids, np.concatenate([self.assign, added]))
+
+    def candidates(self, query: sp.spmatrix, nprobe: int = DEFAULT_NPROBE, min_candidates: int = 0) -> np.ndarray:
+        """
+        Sorted job rows in the query's nprobe nearest lists, probing further
+        lists until at least min_candidates rows are collected.
+        """
+        reduced = _unit_rows(np.asarray(query @ self.components.T, dtype=np.float32).reshape(1, -1))[0]
+        order = np.argsort(-(self.centroids @ reduced))
+        sizes = np.diff(self.offsets)[order]
+        needed = int(np.searchsorted(np.cumsum(sizes), min_candidates)) + 1 if min_candidates else 0
+        lists = order[:min(len(order), max(nprobe, needed))]
+        return np.sort(np.concatenate([self.rows[self.offsets[c]:self.offsets[c + 1]] for c in lists]))
+
+
+def ann_top_k(
+    ann: IVFIndex,
+    resume_vec: sp.spmatrix,
+    job_tfidf: sp.csr_matrix,
+    resume_skill_ids: np.ndarray,
+    job_skills: sp.csr_matrix,
+    top_k: int,
+    weight_tfidf: float = 0.7,
+    weight_skills: float = 0.3,
+    nprobe: int = DEFAULT_NPROBE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two-stage hybrid ranking: IVF candidates, then exact scores on those rows only.
+
+    Returns (row indices, scores) of the top_k jobs, best first. Rows appended
+    to job_tfidf after ann was built are always scored.
+    """
+    rows = ann.candidates(resume_vec, nprobe=nprobe, min_candidates=top_k)
+    if job_tfidf.shape[0] > len(ann):
+        rows = np.concatenate([rows, np.arange(len(ann), job_tfidf.shape[0], dtype=rows.dtype)])
+    return subset_top_k(
+        rows, resume_vec, job_tfidf, resume_skill_ids, job_skills, top_k,
+        weight_tfidf=weight_tfidf, weight_skills=weight_skills,
+    )
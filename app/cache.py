@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ScoreVectors:
+    """
+    Raw per-job scores for one resume against one index version; any
+    weighting or top_k can be recombined from these without re-scoring.
+    """
+    tfidf: np.ndarray
+    skills: np.ndarray
+    resume_skill_ids: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.tfidf.nbytes + self.skills.nbytes + self.resume_skill_ids.nbytes
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of ScoreVectors with a TTL and a byte budget.
+
+    Keys are (owner token, resume fingerprint). Owners rotate their token
+    whenever their index changes and call invalidate() with the old one, so
+    stale vectors are never served and their memory is released at once.
+    """
+
+    def __init__(self, max_bytes: int = 256 << 20, ttl: float = 600.0, max_entries: int = 4096):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[float, ScoreVectors]]" = OrderedDict()
+
+    def get(self, owner: Hashable, key: str) -> Optional[ScoreVectors]:
+        with self._lock:
+            entry = self._entries.get((owner, key))
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                self._pop((owner, key))
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((owner, key))
+            self.hits += 1
+            return entry[1]
+
+    def put(self, owner: Hashable, key: str, value: ScoreVectors) -> None:
+        if value.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._pop((owner, key))
+            self._entries[(owner, key)] = (time.monotonic(), value)
+            self._bytes += value.nbytes
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, owner: Hashable) -> None:
+        with self._lock:
+            for k in [k for k in self._entries if k[0] == owner]:
+                self._pop(k)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, k) -> None:
+        entry = self._entries.pop(k, None)
+        if entry is not None:
+            self._bytes -= entry[1].nbytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_shared: Optional[ResultCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Process-wide cache shared by JobRecommender and the Flask match route.
+    Sized by RESULT_CACHE_MB (default 256) and RESULT_CACHE_TTL seconds (default 600).
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ResultCache(
+                    max_bytes=int(float(os.getenv("RESULT_CACHE_MB", "256")) * (1 << 20)),
+                    ttl=float(os.getenv("RESULT_CACHE_TTL", "600")),
+                )
+    return _shared
@@ -0,0 +1,181 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from .skills import SkillVocabulary
+
+FACETS = ("location", "company", "title", "skills")
+
+FilterValue = Union[str, Sequence[str]]
+
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def _title_terms(title: Optional[str]) -> List[str]:
+    return re.findall(r"[a-z0-9+#]+", str(title or "").lower())
+
+
+def _values(value: FilterValue, sep: Optional[str] = None) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(sep) if sep else [value]
+    return [v for v in (str(x).strip() for x in value) if v]
+
+
+def _postings(values_per_row: Iterable[Iterable[str]], offset: int = 0) -> Dict[str, np.ndarray]:
+    rows: Dict[str, List[int]] = defaultdict(list)
+    for i, values in enumerate(values_per_row, start=offset):
+        for v in set(values):
+            if v:
+                rows[v].append(i)
+    return {k: np.array(v, dtype=np.int32) for k, v in rows.items()}
+
+
+def _merged(old: Dict[str, np.ndarray], added: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    # appended rows have larger ids, so concatenation keeps every posting sorted
+    merged = dict(old)
+    for key, rows in added.items():
+        merged[key] = np.concatenate([old[key], rows]) if key in old else rows
+    return merged
+
+
+def _intersect(a: np.ndarray, b: np.ndarray, n_rows: int) -> np.ndarray:
+    """
+    Intersection of two sorted unique row arrays, a being the shorter one.
+    """
+    if len(a) * 32 < len(b):
+        # binary-search the short list in the long one
+        pos = np.searchsorted(b, a)
+        pos[pos == len(b)] = 0
+        return a[b[pos] == a]
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[a] = True
+    return b[mask[b]]
+
+
+def _union(postings: List[np.ndarray], n_rows: int) -> np.ndarray:
+    """
+    Sorted union of row arrays; a mask over all rows beats sorting once they are large.
+    """
+    if len(postings) == 1:
+        return postings[0]
+    merged = np.concatenate(postings) if postings else np.zeros(0, dtype=np.int32)
+    if len(merged) * 64 < n_rows:
+        return np.unique(merged)
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[merged] = True
+    return np.flatnonzero(mask).astype(np.int32)
+
+
+class FacetIndex:
+    """
+    Inverted indexes from job facet values to sorted row arrays.
+
+    location and company match whole normalised values (any of several
+    given), title matches keywords (all must appear) and skills matches
+    canonical skill ids from the job skills matrix (all must be present).
+    rows() intersects the postings, smallest first, so a filtered query only
+    ever touches the surviving rows. Immutable; extended() returns a new index.
+    """
+
+    def __init__(self, postings: Dict[str, Dict[str, np.ndarray]], job_skills: sp.csr_matrix):
+        self.postings = postings
+        self.n_rows = job_skills.shape[0]
+        # column-major skills: rows per skill id, each sorted
+        self.skill_rows = job_skills.tocsc()
+        self.skill_rows.sort_indices()
+
+    @classmethod
+    def build(
+        cls,
+        locations: Iterable[Optional[str]],
+        companies: Iterable[Optional[str]],
+        titles: Iterable[Optional[str]],
+        job_skills: sp.csr_matrix,
+    ) -> "FacetIndex":
+        return cls(cls._facet_postings(locations, companies, titles, 0), job_skills)
+
+    @staticmethod
+    def _facet_postings(locations, companies, titles, offset: int) -> Dict[str, Dict[str, np.ndarray]]:
+        return {
+            "location": _postings(([_norm(v)] for v in locations), offset),
+            "company": _postings(([_norm(v)] for v in companies), offset),
+            "title": _postings((_title_terms(v) for v in titles), offset),
+        }
+
+    def extended(
+        self,
+        locations: Iterable[Optional[str]],
+        companies: Iterable[Optional[str]],
+        titles: Iterable[Optional[str]],
+        job_skills: sp.csr_matrix,
+    ) -> "FacetIndex":
+        """
+        Index with rows appended after n_rows; job_skills is the full, already extended matrix.
+        """
+        added = self._facet_postings(locations, companies, titles, self.n_rows)
+        return FacetIndex({name: _merged(self.postings[name], added[name]) for name in added}, job_skills)
+
+    def arrays(self) -> Dict[str, tuple]:
+        """
+        Per facet: (values, offsets, rows) with all postings concatenated, for app.index_store.
+        """
+        out = {}
+        for name, postings in self.postings.items():
+            keys = list(postings)
+            offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+            np.cumsum([len(postings[k]) for k in keys], out=offsets[1:])
+            rows = np.concatenate([postings[k] for k in keys]) if keys else np.zeros(0, dtype=np.int32)
+            out[name] = (keys, offsets, rows)
+        return out
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, tuple], job_skills: sp.csr_matrix) -> "FacetIndex":
+        postings = {
+            name: {key: rows[offsets[i]:offsets[i + 1]] for i, key in enumerate(keys)}
+            for name, (keys, offsets, rows) in arrays.items()
+        }
+        return cls(postings, job_skills)
+
+    def _skill_posting(self, skill_id: Optional[int]) -> np.ndarray:
+        if skill_id is None or skill_id >= self.skill_rows.shape[1]:
+            return np.zeros(0, dtype=np.int32)
+        start, stop = self.skill_rows.indptr[skill_id], self.skill_rows.indptr[skill_id + 1]
+        return self.skill_rows.indices[start:stop]
+
+    def rows(self, filters: Optional[Mapping[str, FilterValue]], skill_vocab: SkillVocabulary) -> Optional[np.ndarray]:
+        """
+        Sorted rows matching every given facet, or None when filters is empty.
+        Unknown facet names raise ValueError.
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v not in (None, "", [])}
+        unknown = set(filters) - set(FACETS)
+        if unknown:
+            raise ValueError(f"Unknown filters: {sorted(unknown)}; expected any of {list(FACETS)}")
+        if not filters:
+            return None
+        empty = np.zeros(0, dtype=np.int32)
+        # sorted row arrays that must all match
+        required: List[np.ndarray] = []
+        for facet in ("location", "company"):
+            if facet in filters:
+                postings = [self.postings[facet].get(_norm(v), empty) for v in _values(filters[facet])]
+                required.append(_union(postings, self.n_rows))
+        if "title" in filters:
+            terms = [t for v in _values(filters["title"]) for t in _title_terms(v)]
+            required += [self.postings["title"].get(t, empty) for t in terms]
+        if "skills" in filters:
+            required += [self._skill_posting(i) for i in skill_vocab.lookup(_values(filters["skills"], sep=";"))]
+        if not required:
+            return empty
+        required.sort(key=len)
+        rows = required[0]
+        for other in required[1:]:
+            if not len(rows):
+                break
+            rows = _intersect(rows, other, self.n_rows)
+        return rows
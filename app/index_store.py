@@ -0,0 +1,262 @@
+"""
+Precomputed, memory-mapped ranking index.
+
+An index directory holds one subdirectory per build plus a CURRENT file
+naming the active one:
+
+    index/
+      CURRENT
+      20261018T120000-3f2a9c/
+        manifest.json      format, counts, vectorizer params, metadata columns
+        vocabulary.json    TF-IDF terms in column order
+        idf.npy
+        tfidf.{data,indices,indptr}.npy
+        skills.{indices,indptr}.npy
+        skill_vocab.json   canonical skill names and alias spellings
+        ids.npy            database ids per row (backend builds only)
+        ann.{components,centroids,assign}.npy   IVF candidate index (optional)
+        neighbors.{rows,scores}.npy   similar-jobs lists (optional)
+        facets/<facet>.{values.json,offsets.npy,rows.npy}   filter postings (optional)
+        meta/<column>.{offsets,bytes}.npy
+
+Arrays are opened with np.load(mmap_mode="r") so every worker process maps
+the same pages from the OS cache instead of holding its own copy.
+
+Build from a jobs CSV:
+
+    python -m app.index_store --jobs data/jobs_sample.csv --skills data/skills_master.txt --out index
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+from .ann import DEFAULT_NPROBE, IVFIndex
+from .facets import FacetIndex
+from .job_table import StringColumn
+from .neighbors import NeighborTable
+from .skills import SkillVocabulary
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+FORMAT_VERSION = 1
+_VECTORIZER_PARAMS = (
+    "lowercase", "stop_words", "token_pattern", "ngram_range", "analyzer", "max_df", "min_df",
+    "max_features", "binary", "norm", "use_idf", "smooth_idf", "sublinear_tf",
+)
+
+
+@dataclass
+class StoredIndex:
+    path: Path
+    manifest: dict
+    vectorizer: "TfidfVectorizer"
+    job_tfidf: sp.csr_matrix
+    skill_vocab: SkillVocabulary
+    job_skills: sp.csr_matrix
+    columns: Dict[str, StringColumn] = field(default_factory=dict)
+    ids: Optional[np.ndarray] = None
+    ann: Optional[IVFIndex] = None
+    facets: Optional[FacetIndex] = None
+    neighbors: Optional[NeighborTable] = None
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+
+def _save_csr(target: Path, name: str, matrix: sp.csr_matrix, with_data: bool = True) -> None:
+    # match the index dtype scipy would pick, otherwise it copies the mapped arrays on load
+    index_dtype = np.int32 if max(matrix.nnz, *matrix.shape) < np.iinfo(np.int32).max else np.int64
+    if with_data:
+        np.save(target / f"{name}.data.npy", np.ascontiguousarray(matrix.data))
+    np.save(target / f"{name}.indices.npy", np.ascontiguousarray(matrix.indices, dtype=index_dtype))
+    np.save(target / f"{name}.indptr.npy", np.ascontiguousarray(matrix.indptr, dtype=index_dtype))
+
+
+def _load_csr(target: Path, name: str, shape, mmap_mode: Optional[str]) -> sp.csr_matrix:
+    indices = np.load(target / f"{name}.indices.npy", mmap_mode=mmap_mode)
+    indptr = np.load(target / f"{name}.indptr.npy", mmap_mode=mmap_mode)
+    data_path = target / f"{name}.data.npy"
+    data = np.load(data_path, mmap_mode=mmap_mode) if data_path.exists() else np.ones(len(indices), dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=tuple(shape), copy=False)
+
+
+def save_index(
+    out_dir: Path,
+    vectorizer: "TfidfVectorizer",
+    job_tfidf: sp.csr_matrix,
+    skill_vocab: SkillVocabulary,
+    job_skills: sp.csr_matrix,
+    columns: Dict[str, Iterable[Optional[str]]],
+    ids: Optional[np.ndarray] = None,
+    ann: Optional[IVFIndex] = None,
+    facets: Optional[FacetIndex] = None,
+    neighbors: Optional[NeighborTable] = None,
+) -> Path:
+    """
+    Write a new index version under out_dir and point CURRENT at it.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    created = time.time()
+    digest = hashlib.sha256(job_tfidf.indptr.tobytes() + job_tfidf.indices[:4096].tobytes()).hexdigest()[:8]
+    version = time.strftime("%Y%m%dT%H%M%S", time.gmtime(created)) + f"-{digest}"
+    tmp = out_dir / f".{version}.tmp"
+    (tmp / "meta").mkdir(parents=True)
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, col in vectorizer.vocabulary_.items():
+        terms[col] = term
+    (tmp / "vocabulary.json").write_text(json.dumps(terms), encoding="utf-8")
+    np.save(tmp / "idf.npy", vectorizer.idf_)
+    _save_csr(tmp, "tfidf", job_tfidf)
+    _save_csr(tmp, "skills", job_skills, with_data=False)
+    (tmp / "skill_vocab.json").write_text(
+        json.dumps(skill_vocab.state()), encoding="utf-8"
+    )
+    if ids is not None:
+        np.save(tmp / "ids.npy", np.asarray(ids, dtype=np.int64))
+    if ann is not None:
+        np.save(tmp / "ann.components.npy", ann.components)
+        np.save(tmp / "ann.centroids.npy", ann.centroids)
+        np.save(tmp / "ann.assign.npy", ann.assign)
+    if neighbors is not None:
+        np.save(tmp / "neighbors.rows.npy", np.ascontiguousarray(neighbors.rows))
+        np.save(tmp / "neighbors.scores.npy", np.ascontiguousarray(neighbors.scores))
+    if facets is not None:
+        (tmp / "facets").mkdir()
+        for name, (values, offsets, rows) in facets.arrays().items():
+            (tmp / "facets" / f"{name}.values.json").write_text(json.dumps(values), encoding="utf-8")
+            np.save(tmp / "facets" / f"{name}.offsets.npy", offsets)
+            np.save(tmp / "facets" / f"{name}.rows.npy", rows)
+    for name, values in columns.items():
+        col = StringColumn.from_strings(values)
+        np.save(tmp / "meta" / f"{name}.offsets.npy", col.offsets)
+        np.save(tmp / "meta" / f"{name}.bytes.npy", col.buffer)
+
+    params = {k: v for k, v in vectorizer.get_params().items() if k in _VECTORIZER_PARAMS}
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "created_at": created,
+        "n_jobs": int(job_tfidf.shape[0]),
+        "n_features": int(job_tfidf.shape[1]),
+        "n_skills": int(job_skills.shape[1]),
+        "vectorizer": params,
+        "columns": list(columns),
+        "has_ids": ids is not None,
+        "has_ann": ann is not None,
+        "neighbors": neighbors.n_neighbors if neighbors is not None else 0,
+        "facets": list(facets.postings) if facets is not None else [],
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    target = out_dir / version
+    os.replace(tmp, target)
+    (out_dir / ".CURRENT.tmp").write_text(version, encoding="utf-8")
+    os.replace(out_dir / ".CURRENT.tmp", out_dir / "CURRENT")
+    return target
+
+
+def resolve_index_dir(path: Path) -> Path:
+    path = Path(path)
+    current = path / "CURRENT"
+    if current.exists():
+        return path / current.read_text(encoding="utf-8").strip()
+    return path
+
+
+def load_index(path: Path, mmap_mode: Optional[str] = "r") -> StoredIndex:
+    """
+    Open an index directory (or a specific version inside it).
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    target = resolve_index_dir(path)
+    manifest = json.loads((target / "manifest.json").read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format {manifest.get('format')} in {target}")
+
+    terms = json.loads((target / "vocabulary.json").read_text(encoding="utf-8"))
+    params = dict(manifest["vectorizer"])
+    if params.get("ngram_range") is not None:
+        params["ngram_range"] = tuple(params["ngram_range"])
+    vectorizer = TfidfVectorizer(**params, vocabulary={t: i for i, t in enumerate(terms)})
+    vectorizer.idf_ = np.load(target / "idf.npy")
+
+    skill_vocab = SkillVocabulary.from_state(json.loads((target / "skill_vocab.json").read_text(encoding="utf-8")))
+
+    n_jobs = manifest["n_jobs"]
+    columns = {
+        name: StringColumn(
+            np.load(target / "meta" / f"{name}.offsets.npy", mmap_mode=mmap_mode),
+            np.load(target / "meta" / f"{name}.bytes.npy", mmap_mode=mmap_mode),
+        )
+        for name in manifest["columns"]
+    }
+    job_skills = _load_csr(target, "skills", (n_jobs, manifest["n_skills"]), mmap_mode)
+    facets = None
+    if manifest.get("facets"):
+        facets = FacetIndex.from_arrays(
+            {
+                name: (
+                    json.loads((target / "facets" / f"{name}.values.json").read_text(encoding="utf-8")),
+                    np.load(target / "facets" / f"{name}.offsets.npy"),
+                    np.load(target / "facets" / f"{name}.rows.npy", mmap_mode=mmap_mode),
+                )
+                for name in manifest["facets"]
+            },
+            job_skills,
+        )
+    return StoredIndex(
+        path=target,
+        manifest=manifest,
+        vectorizer=vectorizer,
+        job_tfidf=_load_csr(target, "tfidf", (n_jobs, manifest["n_features"]), mmap_mode),
+        skill_vocab=skill_vocab,
+        job_skills=job_skills,
+        columns=columns,
+        ids=np.load(target / "ids.npy", mmap_mode=mmap_mode) if manifest.get("has_ids") else None,
+        ann=IVFIndex(
+            np.load(target / "ann.components.npy"),
+            np.load(target / "ann.centroids.npy"),
+            np.load(target / "ann.assign.npy"),
+        ) if manifest.get("has_ann") else None,
+        facets=facets,
+        neighbors=NeighborTable(
+            np.load(target / "neighbors.rows.npy", mmap_mode=mmap_mode),
+            np.load(target / "neighbors.scores.npy", mmap_mode=mmap_mode),
+        ) if manifest.get("neighbors") else None,
+    )
+
+
+def main() -> None:
+    from .recommender import JobRecommender
+
+    parser = argparse.ArgumentParser(description="Build a memory-mappable job index from a jobs CSV.")
+    parser.add_argument("--jobs", type=Path, required=True, help="jobs CSV (job_id,title,company,location,description,skills)")
+    parser.add_argument("--skills", type=Path, required=True, help="skills master list")
+    parser.add_argument("--out", type=Path, required=True, help="index directory; a new version is added under it")
+    parser.add_argument("--ann", action="store_true", help="also build the IVF index for two-stage retrieval")
+    parser.add_argument("--neighbors", type=int, default=0, help="also store this many similar jobs per job")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rec = JobRecommender(args.jobs, args.skills, ann_nprobe=DEFAULT_NPROBE if args.ann else None)
+    if args.neighbors:
+        rec.neighbors = NeighborTable.build(rec.job_tfidf, args.neighbors)
+    target = rec.save_index(args.out)
+    print(f"Wrote {len(rec.jobs)} jobs to {target} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
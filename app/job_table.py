@@ -0,0 +1,304 @@
+"""
+Columnar job metadata for JobRecommender.
+
+Each column is a handful of NumPy arrays rather than a Python object per
+row: job_id and the raw skills string are StringColumns (one UTF-8 buffer
+plus offsets), and title, company and location are DictColumns (an int32
+code per row into the distinct values). Descriptions, by far the largest
+column, stay in the source CSV and are read on demand (CsvColumn), or are
+memory-mapped when the table comes from a prebuilt index. Skill ids live
+in the recommender's CSR jobs x skills matrix, and normalised descriptions
+are produced on the fly while fitting, so neither is stored per row. Only
+the rows of a result page are ever decoded into str objects.
+"""
+import csv
+import sys
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COLUMNS = ("job_id", "title", "company", "location", "description", "skills")
+# few distinct values, repeated across many rows
+DICT_COLUMNS = ("title", "company", "location")
+
+
+class StringColumn:
+    """
+    Read-only string column stored as one UTF-8 buffer plus row offsets.
+    """
+
+    def __init__(self, offsets: np.ndarray, buffer: np.ndarray):
+        self.offsets = offsets
+        self.buffer = buffer
+
+    @classmethod
+    def from_strings(cls, values: Iterable[Optional[str]]) -> "StringColumn":
+        buffer = bytearray()
+        offsets = array("q", [0])
+        for v in values:
+            buffer += (v or "").encode("utf-8")
+            offsets.append(len(buffer))
+        return cls(np.array(offsets, dtype=np.int64), np.frombuffer(bytes(buffer), dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        return self.buffer[self.offsets[row]:self.offsets[row + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def extended(self, values: Iterable[Optional[str]]) -> "StringColumn":
+        added = StringColumn.from_strings(values)
+        return StringColumn(
+            np.concatenate([self.offsets, added.offsets[1:] + self.offsets[-1]]),
+            np.concatenate([self.buffer, added.buffer]),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.buffer.nbytes
+
+
+class DictColumn:
+    """
+    Dictionary-encoded string column: an int32 code per row into a list of distinct values.
+    """
+
+    def __init__(self, codes: np.ndarray, values: List[str]):
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def from_strings(cls, values: Iterable[Optional[str]]) -> "DictColumn":
+        return cls._encode(values, {})
+
+    @classmethod
+    def _encode(cls, values: Iterable[Optional[str]], lookup: Dict[str, int]) -> "DictColumn":
+        codes = array("i")
+        for v in values:
+            v = v or ""
+            code = lookup.get(v)
+            if code is None:
+                code = lookup[v] = len(lookup)
+            codes.append(code)
+        return cls(np.array(codes, dtype=np.int32), list(lookup))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __iter__(self):
+        values = self.values
+        return (values[c] for c in self.codes.tolist())
+
+    def extended(self, values: Iterable[Optional[str]]) -> "DictColumn":
+        added = self._encode(values, {v: i for i, v in enumerate(self.values)})
+        return DictColumn(np.concatenate([self.codes, added.codes]), added.values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sys.getsizeof(self.values) + sum(sys.getsizeof(v) for v in self.values)
+
+
+class CsvColumn:
+    """
+    One field of a CSV file read on demand; only each record's byte offset is
+    held. Rows appended later live in an in-memory StringColumn. The file
+    must not be rewritten while the column is in use.
+    """
+
+    def __init__(self, path: Path, field: int, offsets: np.ndarray, appended: Optional[StringColumn] = None):
+        self.path = Path(path)
+        self.field = field
+        self.offsets = offsets
+        self.appended = appended if appended is not None else StringColumn.from_strings([])
+
+    def __len__(self) -> int:
+        return len(self.offsets) + len(self.appended)
+
+    def __getitem__(self, row: int) -> str:
+        if row >= len(self.offsets):
+            return self.appended[row - len(self.offsets)]
+        with open(self.path, "rb") as f:
+            f.seek(int(self.offsets[row]))
+            return _field(next(_records(f))[1], self.field)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.values()
+
+    def values(self, start: int = 0) -> Iterator[str]:
+        """
+        Rows from start on in one sequential read; indexing reopens the file per row.
+        """
+        n_file = len(self.offsets)
+        if start < n_file:
+            with open(self.path, "rb") as f:
+                f.seek(int(self.offsets[start]))
+                for _, record in _records(f):
+                    yield _field(record, self.field)
+        for i in range(max(start - n_file, 0), len(self.appended)):
+            yield self.appended[i]
+
+    def extended(self, values: Iterable[Optional[str]]) -> "CsvColumn":
+        return CsvColumn(self.path, self.field, self.offsets, self.appended.extended(values))
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.appended.nbytes
+
+
+def _field(record: List[str], i: int) -> str:
+    # short rows read as empty trailing fields, like csv.DictReader
+    return record[i] if i < len(record) else ""
+
+
+def _records(f) -> Iterator[tuple]:
+    """
+    (byte offset, fields) per non-empty record of a binary CSV file, from its current position.
+    """
+    consumed = [f.tell()]
+
+    def lines():
+        # csv.reader pulls exactly the lines of one record per next(), so consumed tracks record starts
+        for line in f:
+            consumed[0] += len(line)
+            yield line.decode("utf-8-sig" if consumed[0] == len(line) else "utf-8")
+
+    reader = csv.reader(lines())
+    while True:
+        start = consumed[0]
+        record = next(reader, None)
+        if record is None:
+            return
+        if record:
+            yield start, record
+
+
+Column = Union[StringColumn, DictColumn, CsvColumn]
+
+
+class JobTable:
+    """
+    Immutable job metadata, one row per job in index row order.
+
+    Built from a CSV or records, columns are encoded as described above; a
+    table opened from a prebuilt index keeps its memory-mapped StringColumns
+    as they are. extended() returns a new table, so readers holding the old
+    one see a consistent snapshot.
+    """
+
+    def __init__(self, columns: Mapping[str, Column]):
+        missing = set(COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Jobs CSV missing columns: {missing}")
+        self.columns = {name: columns[name] for name in COLUMNS}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Optional[str]]]) -> "JobTable":
+        """
+        Encode dict-like rows in one streaming pass, descriptions included.
+        """
+        return cls(cls._encode(rows, COLUMNS))
+
+    @staticmethod
+    def _encode(rows: Iterable[Mapping[str, Optional[str]]], names: Sequence[str]) -> Dict[str, Column]:
+        lookups: Dict[str, Dict[str, int]] = {name: {} for name in DICT_COLUMNS if name in names}
+        codes = {name: array("i") for name in lookups}
+        buffers = {name: bytearray() for name in names if name not in lookups}
+        offsets = {name: array("q", [0]) for name in buffers}
+        for row in rows:
+            for name, lookup in lookups.items():
+                v = row[name] or ""
+                code = lookup.get(v)
+                if code is None:
+                    code = lookup[v] = len(lookup)
+                codes[name].append(code)
+            for name, buffer in buffers.items():
+                buffer += (row[name] or "").encode("utf-8")
+                offsets[name].append(len(buffer))
+        columns: Dict[str, Column] = {
+            name: DictColumn(np.array(codes[name], dtype=np.int32), list(lookup)) for name, lookup in lookups.items()
+        }
+        for name, buffer in buffers.items():
+            columns[name] = StringColumn(
+                np.array(offsets[name], dtype=np.int64), np.frombuffer(bytes(buffer), dtype=np.uint8)
+            )
+        return columns
+
+    @classmethod
+    def from_csv(cls, path: Path, descriptions_in_memory: bool = False) -> "JobTable":
+        """
+        Encode a jobs CSV in one pass. Descriptions are left in the file and
+        read on demand unless descriptions_in_memory is set.
+        """
+        path = Path(path)
+        with open(path, "rb") as f:
+            records = _records(f)
+            _, header = next(records, (0, []))
+            missing = set(COLUMNS) - set(header)
+            if missing:
+                raise ValueError(f"Jobs CSV missing columns: {missing}")
+            field = {name: header.index(name) for name in COLUMNS}
+            names = COLUMNS if descriptions_in_memory else [n for n in COLUMNS if n != "description"]
+            starts = array("q")
+
+            def rows() -> Iterator[Dict[str, str]]:
+                for start, record in records:
+                    starts.append(start)
+                    yield {name: _field(record, i) for name, i in field.items()}
+
+            columns = cls._encode(rows(), names)
+        if not descriptions_in_memory:
+            columns["description"] = CsvColumn(path, field["description"], np.array(starts, dtype=np.int64))
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["job_id"])
+
+    def column(self, name: str) -> Column:
+        return self.columns[name]
+
+    def values(self, name: str, start: int = 0) -> Iterator[str]:
+        """
+        A column's values from row start on, streamed when it lives in the CSV.
+        """
+        column = self.columns[name]
+        if isinstance(column, CsvColumn):
+            return column.values(start)
+        return (column[i] for i in range(start, len(column)))
+
+    def skill_lists(self, start: int = 0) -> Iterator[List[str]]:
+        """
+        ";"-separated skills per row from start on, for SkillVocabulary.matrix().
+        """
+        for skills in self.values("skills", start):
+            yield [t.strip() for t in skills.split(";") if t.strip()]
+
+    def extended(self, rows: Sequence[Mapping[str, Optional[str]]]) -> "JobTable":
+        return JobTable({name: col.extended([row[name] for row in rows]) for name, col in self.columns.items()})
+
+    def take(self, rows: Iterable[int], names: Sequence[str] = COLUMNS) -> Dict[str, List[str]]:
+        """
+        Decoded values of the given rows, per column.
+        """
+        rows = [int(r) for r in rows]
+        return {name: [self.columns[name][r] for r in rows] for name in names}
+
+    def to_frame(self, rows: Optional[Sequence[int]] = None, names: Sequence[str] = COLUMNS) -> "pd.DataFrame":
+        import pandas as pd
+
+        rows = range(len(self)) if rows is None else rows
+        return pd.DataFrame(self.take(rows, names), index=list(rows))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
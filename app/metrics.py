@@ -0,0 +1,145 @@
+"""
+Opt-in per-stage latency metrics for the ranking hot path.
+
+Code wraps each stage in `with stage("score"):`. With METRICS unset this
+returns a shared no-op context manager, costing one function call. When
+enabled, each stage's duration goes into a process-wide histogram
+(rendered in Prometheus text format by render_prometheus()). It is also
+added to the innermost collect_timings() block of the current thread or
+task, which lets a request report its own breakdown. Stages may nest:
+"db" around an index load includes the "fit" inside it.
+"""
+import bisect
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+# seconds; spans sub-millisecond kernels to multi-second refits
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = os.getenv("METRICS", "0").lower() in ("1", "true", "yes")
+_NOOP = nullcontext()
+_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("timings", default=None)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram per stage label, safe to update from any thread.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # stage -> (per-bucket counts with +Inf last, sum, count)
+        self._series: Dict[str, List] = {}
+
+    def observe(self, label: str, seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            # first bucket whose upper bound is >= seconds; past the last one lands in +Inf
+            series[0][bisect.bisect_left(self.buckets, seconds)] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {label: (list(s[0]), s[1], s[2]) for label, s in self._series.items()}
+        for label in sorted(series):
+            counts, total, count = series[label]
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{self.name}_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{stage="{label}"}} {total:.6f}')
+            lines.append(f'{self.name}_count{{stage="{label}"}} {count}')
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+STAGE_SECONDS = Histogram("job_recommender_stage_seconds", "Time spent in each ranking stage.")
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record(self.name, time.perf_counter() - self.start)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    global _enabled
+    _enabled = value
+
+
+def stage(name: str):
+    """
+    Context manager timing one stage; a shared no-op unless metrics are enabled.
+    """
+    return _Stage(name) if _enabled else _NOOP
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Add an externally measured duration (e.g. from a worker process) to a stage.
+    """
+    if not _enabled:
+        return
+    STAGE_SECONDS.observe(name, seconds)
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """
+    Collect stage seconds recorded in this thread or task while the block runs.
+    The dict stays empty when metrics are disabled.
+    """
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def timings_ms(timings: Dict[str, float]) -> Dict[str, float]:
+    return {name: round(seconds * 1000.0, 3) for name, seconds in timings.items()}
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """
+    Server-Timing header value, durations in milliseconds.
+    """
+    return ", ".join(f"{name};dur={seconds * 1000.0:.3f}" for name, seconds in timings.items())
+
+
+def render_prometheus() -> str:
+    lines = STAGE_SECONDS.render()
+    if not _enabled:
+        lines.insert(0, "# metrics are disabled; set METRICS=1 to record stage timings")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,217 @@
+"""
+Precomputed "similar jobs" lists: the n nearest jobs to every job by TF-IDF cosine.
+
+Lists are two (n_jobs, n) arrays, int32 rows and float32 scores, best
+first and padded with -1 / -inf when a job has fewer than n neighbours
+with a positive score; looking a job up is one row slice.
+
+They are built with blocked sparse products: a block of job rows times
+the transposed job matrix gives that block's scores against the whole
+catalog, kept dense just long enough to take each row's top n. Blocks
+are sized so that dense array stays under block_cells and run on a
+pool of their own (SIMILAR_JOBS_WORKERS threads, default 1), never the
+request scorer's, with at most one block queued per thread, so a build
+cannot starve request scoring. SciPy's products and NumPy's
+partitioning release the GIL. All pairs cost O(n_jobs^2), so large
+catalogs build them offline into the prebuilt index.
+
+Cosine is symmetric, so extended() only scores appended jobs: their rows
+give their own lists and, read as columns, every existing job they beat.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from .metrics import stage
+from .shards import row_block
+
+DEFAULT_NEIGHBORS = 10
+# dense block x n_jobs scores held per worker thread while a block is ranked
+BLOCK_CELLS = 1 << 22
+WORKERS = int(os.getenv("SIMILAR_JOBS_WORKERS", "1"))
+
+
+def _top_block(scores: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best n columns per row of a dense score block, best first and lower
+    column first on ties; non-positive scores become -1 / -inf padding.
+    """
+    n_rows, n_cols = scores.shape
+    rows = np.full((n_rows, n), -1, dtype=np.int32)
+    out = np.full((n_rows, n), -np.inf, dtype=np.float32)
+    k = min(n, n_cols)
+    if k == 0 or n_rows == 0:
+        return rows, out
+    if k < n_cols:
+        idx = np.argpartition(scores, n_cols - k, axis=1)[:, n_cols - k:]
+    else:
+        idx = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+    top = np.take_along_axis(scores, idx, axis=1)
+    order = np.lexsort((idx, -top))
+    idx = np.take_along_axis(idx, order, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    keep = top > 0
+    rows[:, :k] = np.where(keep, idx, -1)
+    out[:, :k] = np.where(keep, top, -np.inf)
+    return rows, out
+
+
+def _run_blocks(run: Callable[[int, int], None], bounds: Sequence[Tuple[int, int]], workers: int) -> None:
+    """
+    run(a, b) for every block on a pool of its own, submitting a block only
+    when a thread is free; Executor.map would queue all of them up front.
+    """
+    if workers <= 1 or len(bounds) <= 1:
+        for a, b in bounds:
+            run(a, b)
+        return
+    with ThreadPoolExecutor(workers, thread_name_prefix="neighbors") as pool:
+        pending = set()
+        for a, b in bounds:
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(pool.submit(run, a, b))
+        for future in pending:
+            future.result()
+
+
+def _scan(
+    job_tfidf: sp.csr_matrix,
+    start: int,
+    stop: int,
+    visit: Callable[[int, int, np.ndarray], None],
+    workers: Optional[int],
+    block_cells: int,
+) -> None:
+    """
+    Call visit(a, b, scores) for row blocks of start:stop, scores being the
+    dense (b - a) x n_jobs cosine block with each job's own score at -inf.
+    """
+    n_jobs = job_tfidf.shape[0]
+    if start >= stop:
+        return
+    # terms x jobs, converted once and shared by every block
+    columns = job_tfidf.T.tocsr()
+    step = max(1, block_cells // max(n_jobs, 1))
+
+    def run(a: int, b: int) -> None:
+        scores = (row_block(job_tfidf, a, b) @ columns).toarray()
+        scores[np.arange(b - a), np.arange(a, b)] = -np.inf
+        visit(a, b, scores)
+
+    bounds = [(a, min(a + step, stop)) for a in range(start, stop, step)]
+    _run_blocks(run, bounds, WORKERS if workers is None else workers)
+
+
+class NeighborTable:
+    """
+    Immutable per-job neighbour lists in job matrix row order; extended()
+    returns a new table, so readers holding the old one are unaffected.
+    """
+
+    def __init__(self, rows: np.ndarray, scores: np.ndarray):
+        self.rows = rows
+        self.scores = scores
+
+    @classmethod
+    def build(
+        cls,
+        job_tfidf: sp.csr_matrix,
+        n_neighbors: int = DEFAULT_NEIGHBORS,
+        workers: Optional[int] = None,
+        block_cells: int = BLOCK_CELLS,
+    ) -> "NeighborTable":
+        """
+        Lists for every row of an L2-normalised job matrix.
+        """
+        if n_neighbors < 1:
+            raise ValueError("n_neighbors must be at least 1")
+        n_jobs = job_tfidf.shape[0]
+        rows = np.empty((n_jobs, n_neighbors), dtype=np.int32)
+        scores = np.empty((n_jobs, n_neighbors), dtype=np.float32)
+
+        def fill(a: int, b: int, block: np.ndarray) -> None:
+            rows[a:b], scores[a:b] = _top_block(block, n_neighbors)
+
+        with stage("neighbors"):
+            _scan(job_tfidf, 0, n_jobs, fill, workers, block_cells)
+        return cls(rows, scores)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def n_neighbors(self) -> int:
+        return self.rows.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.scores.nbytes
+
+    def neighbors(self, row: int, top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (rows, scores) of one job's nearest jobs, best first, at most top_k.
+        """
+        rows, scores = self.rows[row], self.scores[row]
+        k = int(np.count_nonzero(rows >= 0))
+        if top_k is not None:
+            k = min(k, max(top_k, 0))
+        return np.asarray(rows[:k]), np.asarray(scores[:k])
+
+    def extended(
+        self,
+        job_tfidf: sp.csr_matrix,
+        workers: Optional[int] = None,
+        block_cells: int = BLOCK_CELLS,
+    ) -> "NeighborTable":
+        """
+        Lists for job_tfidf, whose first len(self) rows are the ones this
+        table was built from and the rest were appended since. Only the
+        appended rows are scored.
+        """
+        old, n_jobs, n = len(self), job_tfidf.shape[0], self.n_neighbors
+        if n_jobs < old:
+            raise ValueError("job matrix has fewer rows than the table; rebuild instead")
+        if n_jobs == old:
+            return self
+        rows = np.empty((n_jobs, n), dtype=np.int32)
+        scores = np.empty((n_jobs, n), dtype=np.float32)
+        rows[:old] = self.rows
+        scores[:old] = self.scores
+        # an appended job enters an existing list only if it beats that list's last entry
+        threshold = np.maximum(self.scores[:, -1], 0.0)
+        hits: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+        def fill(a: int, b: int, block: np.ndarray) -> None:
+            rows[a:b], scores[a:b] = _top_block(block, n)
+            new, existing = np.nonzero(block[:, :old] > threshold)
+            hits.append((existing, new + a, block[new, existing]))
+
+        with stage("neighbors"):
+            _scan(job_tfidf, old, n_jobs, fill, workers, block_cells)
+            # blocks whose rows beat no existing list still append empty hit arrays
+            if any(len(h[0]) for h in hits):
+                self._merge(rows, scores, *(np.concatenate(parts) for parts in zip(*hits)))
+        return NeighborTable(rows, scores)
+
+    @staticmethod
+    def _merge(
+        rows: np.ndarray, scores: np.ndarray, existing: np.ndarray, new: np.ndarray, new_scores: np.ndarray
+    ) -> None:
+        # group the (existing row, new row, score) hits by existing row and re-rank each touched list
+        order = np.argsort(existing, kind="stable")
+        existing, new, new_scores = existing[order], new[order], new_scores[order]
+        cuts = np.flatnonzero(np.diff(existing)) + 1
+        n = rows.shape[1]
+        for lo, hi in zip(np.concatenate([[0], cuts]), np.concatenate([cuts, [len(existing)]])):
+            r = existing[lo]
+            cand_rows = np.concatenate([rows[r], new[lo:hi]])
+            cand_scores = np.concatenate([scores[r], new_scores[lo:hi]])
+            best = np.lexsort((cand_rows, -cand_scores))[:n]
+            rows[r] = np.where(np.isfinite(cand_scores[best]), cand_rows[best], -1)
+            scores[r] = cand_scores[best]
@@ -1,19 +1,34 @@
 import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
-from pdfminer.high_level import extract_text as pdf_extract_text
-from docx import Document
+from .metrics import record
+from .resume_cache import ResumeCache, content_digest
 
 
-def read_text_from_file(file_path: Path) -> str:
+SUPPORTED_SUFFIXES = {".pdf", ".docx", ".txt"}
+
+
+def read_text_from_file(file_path: Path, max_pages: Optional[int] = None) -> str:
     """
     Read and extract text from a resume file. Supports PDF, DOCX, and TXT.
+    max_pages limits PDF extraction to the first pages.
     """
     suffix = file_path.suffix.lower()
     if suffix == ".pdf":
-        return pdf_extract_text(str(file_path)) or ""
+        from pdfminer.high_level import extract_text as pdf_extract_text
+
+        return pdf_extract_text(str(file_path), maxpages=max_pages or 0) or ""
     if suffix in {".docx"}:
+        from docx import Document
+
         doc = Document(str(file_path))
         return "\n".join(p.text for p in doc.paragraphs)
     if suffix in {".txt"}:
@@ -21,15 +36,21 @@ def read_text_from_file(file_path: Path) -> str:
     raise ValueError(f"Unsupported file type: {suffix}")
 
 
-def read_text_from_bytes(name: str, data: bytes) -> str:
+def read_text_from_bytes(name: str, data: bytes, max_pages: Optional[int] = None) -> str:
     """
     Extract text when given an uploaded file's name and bytes content.
+    max_pages limits PDF extraction to the first pages.
     """
+    # the PDF and DOCX libraries load on first use, normally inside parser workers
     suffix = Path(name).suffix.lower()
     if suffix == ".pdf":
+        from pdfminer.high_level import extract_text as pdf_extract_text
+
         with io.BytesIO(data) as fp:
-            return pdf_extract_text(fp) or ""
+            return pdf_extract_text(fp, maxpages=max_pages or 0) or ""
     if suffix in {".docx"}:
+        from docx import Document
+
         with io.BytesIO(data) as fp:
             doc = Document(fp)
             return "\n".join(p.text for p in doc.paragraphs)
@@ -38,4 +59,175 @@ def read_text_from_bytes(name: str, data: bytes) -> str:
     raise ValueError(f"Unsupported file type: {suffix}")
 
 
+@dataclass
+class ParseResult:
+    name: str
+    text: str = ""
+    error: Optional[str] = None
+    seconds: float = 0.0
+    digest: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _parse_in_worker(name: str, data: bytes, max_pages: Optional[int]) -> Tuple[str, float]:
+    start = time.perf_counter()
+    text = read_text_from_bytes(name, data, max_pages=max_pages)
+    return text, time.perf_counter() - start
+
+
+@dataclass
+class _Job:
+    name: str
+    data: bytes
+    digest: Optional[str] = None
+    deadline: float = 0.0
+    pool: Optional[ProcessPoolExecutor] = None
+    retried: bool = False
+
+
+class ParserPool:
+    """
+    Process pool for resume text extraction.
+
+    pdfminer is pure Python and holds the GIL for the whole parse, so documents
+    are parsed in worker processes. At most `workers` documents are in flight,
+    which makes each one's deadline start roughly when it starts running; a
+    document past its deadline is reported as failed and the pool is recycled
+    to kill the stuck worker (other in-flight documents are resubmitted).
+
+    With a ResumeCache, documents whose bytes were parsed before are answered
+    from it without touching the pool.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: float = 30.0,
+        max_pages: Optional[int] = 20,
+        max_bytes: int = 10 << 20,
+        cache: Optional[ResumeCache] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a multi-threaded web worker is unsafe
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _recycle(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = None
+        for proc in list((getattr(broken, "_processes", None) or {}).values()):
+            proc.terminate()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _check(self, name: str, data: bytes) -> Optional[str]:
+        if Path(name).suffix.lower() not in SUPPORTED_SUFFIXES:
+            return f"Unsupported file type: {Path(name).suffix.lower()}"
+        if len(data) > self.max_bytes:
+            return f"File too large: {len(data)} bytes (limit {self.max_bytes})"
+        return None
+
+    def parse_many(self, items: Iterable[Tuple[str, bytes]]) -> Iterator[ParseResult]:
+        """
+        Parse (name, bytes) pairs in parallel, yielding results in completion order.
+        """
+        pending = iter(items)
+        exhausted = False
+        inflight: Dict[Future, _Job] = {}
+
+        def submit(job: _Job) -> None:
+            pool = self._executor()
+            try:
+                future = pool.submit(_parse_in_worker, job.name, job.data, self.max_pages)
+            except BrokenProcessPool:
+                self._recycle(pool)
+                pool = self._executor()
+                future = pool.submit(_parse_in_worker, job.name, job.data, self.max_pages)
+            job.deadline = time.monotonic() + self.timeout
+            job.pool = pool
+            inflight[future] = job
+
+        def finished(job: _Job, text: str, seconds: float) -> ParseResult:
+            # extraction time measured in the worker, without queueing or IPC
+            record("parse", seconds)
+            if job.digest is not None:
+                from .processing import normalize_text
+
+                self.cache.put_text(job.digest, text, normalize_text(text))
+            return ParseResult(job.name, text=text, seconds=seconds, digest=job.digest)
+
+        while True:
+            while not exhausted and len(inflight) < self.workers:
+                try:
+                    name, data = next(pending)
+                except StopIteration:
+                    exhausted = True
+                    break
+                error = self._check(name, data)
+                if error:
+                    yield ParseResult(name, error=error)
+                    continue
+                job = _Job(name, data)
+                if self.cache is not None:
+                    job.digest = content_digest(data)
+                    cached = self.cache.get_text(job.digest)
+                    if cached is not None:
+                        yield ParseResult(name, text=cached[0], digest=job.digest)
+                        continue
+                submit(job)
+            if not inflight:
+                return
+
+            next_deadline = min(job.deadline for job in inflight.values())
+            done, _ = wait(inflight, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                job = inflight.pop(future)
+                try:
+                    text, seconds = future.result()
+                    yield finished(job, text, seconds)
+                except BrokenProcessPool:
+                    # recycled after another document timed out, or a worker crashed
+                    self._recycle(job.pool)
+                    if job.retried:
+                        yield ParseResult(job.name, error="worker pool restarted")
+                    else:
+                        job.retried = True
+                        submit(job)
+                except Exception as e:
+                    yield ParseResult(job.name, error=f"{type(e).__name__}: {e}")
+
+            now = time.monotonic()
+            expired = [f for f, job in inflight.items() if job.deadline <= now and not f.done()]
+            for future in expired:
+                job = inflight.pop(future)
+                yield ParseResult(job.name, error=f"Timed out after {self.timeout:g}s")
+                self._recycle(job.pool)
+
+    def parse(self, name: str, data: bytes) -> str:
+        """
+        Parse one document with the pool's timeout and limits; raises ValueError on failure.
+        """
+        result = next(self.parse_many([(name, data)]))
+        if not result.ok:
+            raise ValueError(result.error)
+        return result.text
 
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,31 +1,55 @@
+import os
 import re
-from pathlib import Path
-from typing import Iterable, List, Set
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Set, Union
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+from .skills import load_skills_master  # noqa: F401  (re-exported)
 
-_NLTK_RESOURCES = [
-    ("stopwords", "corpora/stopwords"),
-    ("wordnet", "corpora/wordnet"),
-    ("omw-1.4", "corpora/omw-1.4"),
-]
+# NLP_OFFLINE=1: never download corpora or models; a missing one raises straight away
+NLP_OFFLINE = os.getenv("NLP_OFFLINE", "0").lower() in ("1", "true", "yes")
 
+_NLTK_RESOURCES = {
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+    "omw-1.4": "corpora/omw-1.4",
+}
 
-def ensure_nltk() -> None:
-    for pkg, path in _NLTK_RESOURCES:
+
+def ensure_nltk(packages: Iterable[str] = tuple(_NLTK_RESOURCES), offline: Optional[bool] = None) -> None:
+    """
+    Make sure the given NLTK corpora are installed, downloading missing ones.
+    offline (default NLP_OFFLINE) raises LookupError instead of touching the network.
+    """
+    import nltk
+
+    offline = NLP_OFFLINE if offline is None else offline
+    for pkg in packages:
         try:
-            nltk.data.find(path)
+            nltk.data.find(_NLTK_RESOURCES[pkg])
         except LookupError:
+            if offline:
+                raise LookupError(
+                    f"NLTK resource {pkg!r} is not installed and NLP_OFFLINE is set; "
+                    f"install it with `python -m nltk.downloader {pkg}`"
+                ) from None
             nltk.download(pkg, quiet=True)
 
 
-ensure_nltk()
+# corpora load on first use; the ranking path never needs them
+@lru_cache(maxsize=None)
+def _stop_words() -> FrozenSet[str]:
+    ensure_nltk(["stopwords"])
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("english"))
+
 
+@lru_cache(maxsize=None)
+def _lemmatizer():
+    ensure_nltk(["wordnet", "omw-1.4"])
+    from nltk.stem import WordNetLemmatizer
 
-_lemmatizer = WordNetLemmatizer()
-_stop_words = set(stopwords.words("english"))
+    return WordNetLemmatizer()
 
 
 def normalize_text(text: str) -> str:
@@ -37,35 +61,60 @@ def normalize_text(text: str) -> str:
 
 def tokenize(text: str) -> List[str]:
     tokens = re.findall(r"[a-z0-9+.#/\-]+", text.lower())
-    return [t for t in tokens if t and t not in _stop_words]
+    stop_words = _stop_words()
+    return [t for t in tokens if t and t not in stop_words]
 
 
 def lemmatize_tokens(tokens: Iterable[str]) -> List[str]:
-    return [_lemmatizer.lemmatize(t) for t in tokens]
+    lemmatizer = _lemmatizer()
+    return [lemmatizer.lemmatize(t) for t in tokens]
 
 
-def load_skills_master(path: Path) -> List[str]:
-    if not path.exists():
-        return []
-    skills = [line.strip() for line in path.read_text(encoding="utf-8", errors="ignore").splitlines()]
-    return [s for s in skills if s]
+class SkillMatcher:
+    """
+    Compiled multi-phrase matcher: a trie over normalised tokens.
 
+    Built once from the skills master; extraction is a single left-to-right
+    pass over the text's tokens, walking at most max-phrase-length trie
+    levels from each position. Matches are whole tokens, the same boundaries
+    the old " phrase " padding search gave.
+    """
 
-def extract_skills(text: str, skill_phrases: Iterable[str]) -> Set[str]:
+    _END = ""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._root: dict = {}
+        self._depth = 0
+        for phrase in phrases:
+            tokens = normalize_text(phrase).split()
+            if not tokens:
+                continue
+            node = self._root
+            for tok in tokens:
+                node = node.setdefault(tok, {})
+            node.setdefault(self._END, []).append(phrase)
+            self._depth = max(self._depth, len(tokens))
+
+    def find(self, text: str) -> Set[str]:
+        tokens = normalize_text(text).split()
+        found: Set[str] = set()
+        for start in range(len(tokens)):
+            node = self._root
+            for tok in tokens[start:start + self._depth]:
+                node = node.get(tok)
+                if node is None:
+                    break
+                hits = node.get(self._END)
+                if hits:
+                    found.update(hits)
+        return found
+
+
+def extract_skills(text: str, skill_phrases: Union[SkillMatcher, Iterable[str]]) -> Set[str]:
     """
     Extract skills by case-insensitive phrase matching.
-    Handles both single and multi-word skills.
+    Handles both single and multi-word skills. Pass a prebuilt SkillMatcher
+    on hot paths; a plain phrase list is compiled on every call.
     """
-    normalized = f" {normalize_text(text)} "
-    found: Set[str] = set()
-    for phrase in skill_phrases:
-        p = phrase.strip().lower()
-        if not p:
-            continue
-        # match whole word/phrase boundaries crudely by padding spaces
-        if f" {p} " in normalized:
-            found.add(phrase)
-    return found
-
-
-
+    matcher = skill_phrases if isinstance(skill_phrases, SkillMatcher) else SkillMatcher(skill_phrases)
+    return matcher.find(text)
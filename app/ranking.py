@@ -0,0 +1,139 @@
+from typing import Iterator, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from .skills import overlap_scores, overlap_scores_many
+
+# resumes scored per CSR x dense product; wider blocks lose cache locality on the job matrix
+BATCH_CHUNK = 32
+# upper bound on dense score cells (jobs x resumes) held at once by batch ranking
+MAX_BATCH_CELLS = 1 << 24
+# above this share of all rows, a filtered ranking scores every row instead of slicing the subset out
+SUBSET_MAX_FRACTION = 0.25
+
+
+def sparse_scores(query: sp.spmatrix, matrix: sp.csr_matrix) -> np.ndarray:
+    """
+    Cosine similarity of one query row against every row of matrix.
+
+    TfidfVectorizer output is already L2-normalised, so this is a single CSR
+    mat-vec with no re-normalisation and no n x 1 sparse intermediate.
+    """
+    return matrix @ query.toarray().ravel()
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(n + k log k).
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    idx = np.argpartition(scores, n - k)[n - k:] if k < n else np.arange(n)
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def combine_top_k(
+    tfidf_scores: np.ndarray,
+    skill_scores: np.ndarray,
+    top_k: int,
+    weight_tfidf: float = 0.7,
+    weight_skills: float = 0.3,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weight precomputed per-job score vectors and select the top_k rows.
+    """
+    score = weight_tfidf * tfidf_scores
+    if weight_skills:
+        score = score + weight_skills * skill_scores
+    idx = top_k_indices(score, top_k)
+    return idx, score[idx]
+
+
+def hybrid_top_k(
+    resume_vec: sp.spmatrix,
+    job_tfidf: sp.csr_matrix,
+    resume_skill_ids: np.ndarray,
+    job_skills: sp.csr_matrix,
+    top_k: int,
+    weight_tfidf: float = 0.7,
+    weight_skills: float = 0.3,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank jobs by weight_tfidf * cosine + weight_skills * skill overlap.
+
+    Returns (row indices, scores) of the top_k jobs, best first.
+    """
+    score = weight_tfidf * sparse_scores(resume_vec, job_tfidf)
+    if weight_skills:
+        score += weight_skills * overlap_scores(job_skills, resume_skill_ids)
+    idx = top_k_indices(score, top_k)
+    return idx, score[idx]
+
+
+def subset_top_k(
+    rows: np.ndarray,
+    resume_vec: sp.spmatrix,
+    job_tfidf: sp.csr_matrix,
+    resume_skill_ids: np.ndarray,
+    job_skills: sp.csr_matrix,
+    top_k: int,
+    weight_tfidf: float = 0.7,
+    weight_skills: float = 0.3,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    hybrid_top_k restricted to the given sorted rows.
+
+    Small subsets are sliced out and scored on their own; past
+    SUBSET_MAX_FRACTION of the matrix, copying the rows costs more than a
+    full mat-vec, so everything is scored and the rows picked afterwards.
+    Returns (row indices into the full matrices, scores), best first.
+    """
+    if not len(rows):
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float64)
+    if len(rows) > SUBSET_MAX_FRACTION * job_tfidf.shape[0]:
+        score = weight_tfidf * sparse_scores(resume_vec, job_tfidf)[rows]
+        if weight_skills:
+            score += weight_skills * overlap_scores(job_skills, resume_skill_ids)[rows]
+        idx = top_k_indices(score, top_k)
+        return rows[idx], score[idx]
+    idx, scores = hybrid_top_k(
+        resume_vec, job_tfidf[rows], resume_skill_ids, job_skills[rows], top_k,
+        weight_tfidf=weight_tfidf, weight_skills=weight_skills,
+    )
+    return rows[idx], scores
+
+
+def hybrid_top_k_many(
+    resume_vecs: sp.csr_matrix,
+    job_tfidf: sp.csr_matrix,
+    resume_skills: sp.csr_matrix,
+    job_skills: sp.csr_matrix,
+    top_k: int,
+    weight_tfidf: float = 0.7,
+    weight_skills: float = 0.3,
+    chunk_size: int = BATCH_CHUNK,
+    max_cells: int = MAX_BATCH_CELLS,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    hybrid_top_k for many resumes, yielding (row indices, scores) per resume
+    in input order.
+
+    Resumes are scored chunk_size at a time with one CSR x dense product per
+    chunk, which streams the job matrix once per chunk instead of once per
+    resume. Chunks shrink so the dense jobs x chunk block stays under max_cells.
+    """
+    n_jobs = job_tfidf.shape[0]
+    chunk = max(1, min(chunk_size, max_cells // max(n_jobs, 1)))
+    for start in range(0, resume_vecs.shape[0], chunk):
+        stop = min(start + chunk, resume_vecs.shape[0])
+        score = weight_tfidf * (job_tfidf @ resume_vecs[start:stop].T.toarray())
+        if weight_skills:
+            overlap = overlap_scores_many(job_skills, resume_skills[start:stop])
+            score[overlap.row, overlap.col] += weight_skills * overlap.data
+        for col in range(stop - start):
+            column = score[:, col]
+            idx = top_k_indices(column, top_k)
+            yield idx, column[idx]
@@ -1,14 +1,28 @@
+import threading
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Sequence, Set, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence
 
 import numpy as np
-import pandas as pd
-from rapidfuzz.fuzz import ratio as fuzz_ratio
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
 
-from .processing import extract_skills, load_skills_master, normalize_text
+from .ann import IVFIndex, ann_top_k
+from .cache import ScoreVectors, fingerprint, get_result_cache
+from .facets import FacetIndex, FilterValue
+from .index_store import load_index, save_index
+from .job_table import COLUMNS, JobTable
+from .metrics import stage
+from .neighbors import NeighborTable
+from .processing import SkillMatcher, extract_skills, load_skills_master, normalize_text
+from .ranking import subset_top_k
+from .resume_cache import ResumeFeatures, cached_features, get_resume_cache, model_version
+from .shards import get_scorer
+from .skills import SkillVocabulary, skill_id_rows, stack_skill_rows
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
 
 
 @dataclass
@@ -21,46 +35,293 @@ class JobRecord:
     skills: List[str]
 
 
+class _Snapshot(NamedTuple):
+    vectorizer: "TfidfVectorizer"
+    job_tfidf: sp.csr_matrix
+    job_skills: sp.csr_matrix
+    jobs: JobTable
+    cache_token: str
+    model_version: str
+    ann: Optional[IVFIndex]
+    facets: FacetIndex
+
+
 class JobRecommender:
-    def __init__(self, jobs_csv: Path, skills_path: Path):
-        self.jobs_df = self._load_jobs(jobs_csv)
+    """
+    In-process recommender over a jobs CSV or a prebuilt index.
+
+    With ann_nprobe set, recommend() runs in two stages: an IVF index over
+    SVD-reduced TF-IDF rows (app.ann) picks candidate jobs and only those are
+    scored exactly. ann_nprobe is the recall/latency knob and can be
+    overridden per call; None keeps exact scoring of every job.
+
+    Job metadata is a columnar JobTable (app.job_table), not a DataFrame;
+    recommend() still returns a DataFrame of the top rows.
+
+    similar_jobs() answers from precomputed neighbour lists (app.neighbors),
+    loaded with a prebuilt index or built on first use, which add_jobs()
+    extends and refit() rebuilds once they exist.
+    """
+
+    def __init__(
+        self, jobs_csv: Path, skills_path: Path, refit_threshold: float = 0.2, ann_nprobe: Optional[int] = None
+    ):
+        self.jobs = JobTable.from_csv(jobs_csv)
         self.skills_master = load_skills_master(skills_path)
-        self.vectorizer = TfidfVectorizer(
+        self.skill_matcher = SkillMatcher(self.skills_master)
+        # skills canonicalised to integer ids once, stored as a sparse jobs x skills matrix
+        self.skill_vocab = SkillVocabulary(self.skills_master)
+        self.job_skills = self.skill_vocab.matrix(self.jobs.skill_lists())
+        self.skill_display = self._skill_display(self.skill_vocab, self.skills_master)
+        self.facets = self._build_facets(self.jobs, self.job_skills)
+        self._init_runtime(refit_threshold, ann_nprobe)
+        self.vectorizer = self._make_vectorizer()
+        with stage("fit"):
+            self.job_tfidf = self.vectorizer.fit_transform(self._corpus(self.jobs))
+        self.model_version = model_version(self.vectorizer, self.skills_master)
+        self.ann = IVFIndex.build(self.job_tfidf) if ann_nprobe else None
+        self.neighbors: Optional[NeighborTable] = None
+        self.n_fitted = len(self.jobs)
+
+    @classmethod
+    def from_index(
+        cls, index_dir: Path, skills_path: Path, refit_threshold: float = 0.2, ann_nprobe: Optional[int] = None
+    ) -> "JobRecommender":
+        """
+        Open a prebuilt index directory (see app.index_store) without reading
+        the CSV or refitting; the matrices are memory-mapped read-only. The
+        stored IVF index is used when present, otherwise built if ann_nprobe is set.
+        """
+        stored = load_index(index_dir)
+        rec = cls.__new__(cls)
+        # the stored columns stay memory-mapped; pages are shared by every worker
+        rec.jobs = JobTable(stored.columns)
+        rec.skills_master = load_skills_master(skills_path)
+        rec.skill_matcher = SkillMatcher(rec.skills_master)
+        rec._init_runtime(refit_threshold, ann_nprobe)
+        rec.vectorizer = stored.vectorizer
+        rec.job_tfidf = stored.job_tfidf
+        rec.model_version = model_version(rec.vectorizer, rec.skills_master)
+        rec.ann = None
+        if ann_nprobe:
+            rec.ann = stored.ann if stored.ann is not None else IVFIndex.build(rec.job_tfidf)
+        rec.neighbors = stored.neighbors
+        rec.n_fitted = len(rec.jobs)
+        rec.skill_vocab = stored.skill_vocab
+        rec.skill_display = cls._skill_display(rec.skill_vocab, rec.skills_master)
+        rec.job_skills = stored.job_skills
+        rec.facets = stored.facets if stored.facets is not None else cls._build_facets(rec.jobs, rec.job_skills)
+        return rec
+
+    def _init_runtime(self, refit_threshold: float, ann_nprobe: Optional[int]) -> None:
+        # fraction of appended (not yet fitted) jobs that triggers a background refit
+        self.refit_threshold = refit_threshold
+        self.ann_nprobe = ann_nprobe
+        self._lock = threading.Lock()
+        self._refitting = False
+        self.cache = get_result_cache()
+        # exact scoring, split across row shards when SCORE_WORKERS > 1
+        self.scorer = get_scorer()
+        # parsed resumes and their features, on disk and shared across runs
+        self.resume_cache = get_resume_cache()
+        # identifies this index state in the shared result cache; rotated on every change
+        self.cache_token = uuid.uuid4().hex
+
+    def _rotate_cache_token(self) -> None:
+        old, self.cache_token = self.cache_token, uuid.uuid4().hex
+        self.cache.invalidate(old)
+
+    def save_index(self, out_dir: Path) -> Path:
+        with self._lock:
+            return save_index(
+                out_dir,
+                self.vectorizer,
+                self.job_tfidf,
+                self.skill_vocab,
+                self.job_skills,
+                {name: self.jobs.column(name) for name in COLUMNS},
+                ann=self.ann,
+                facets=self.facets,
+                neighbors=self.neighbors,
+            )
+
+    @staticmethod
+    def _build_facets(jobs: JobTable, job_skills: sp.csr_matrix) -> FacetIndex:
+        return FacetIndex.build(jobs.column("location"), jobs.column("company"), jobs.column("title"), job_skills)
+
+    @staticmethod
+    def _make_vectorizer() -> "TfidfVectorizer":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        return TfidfVectorizer(
             stop_words="english",
             ngram_range=(1, 2),
             min_df=1,
             max_features=50000,
         )
-        self.job_corpus = self.jobs_df["description_norm"].tolist()
-        self.job_tfidf = self.vectorizer.fit_transform(self.job_corpus)
 
     @staticmethod
-    def _load_jobs(path: Path) -> pd.DataFrame:
-        df = pd.read_csv(path)
-        expected_cols = {"job_id", "title", "company", "location", "description", "skills"}
-        missing = expected_cols - set(df.columns)
-        if missing:
-            raise ValueError(f"Jobs CSV missing columns: {missing}")
-        df["description_norm"] = df["description"].fillna("").astype(str).map(normalize_text)
-        df["skills_list"] = (
-            df["skills"].fillna("")
-            .astype(str)
-            .map(lambda s: [t.strip() for t in s.split(";") if t.strip()])
-        )
-        return df
-
-    def _skills_overlap(self, resume_skills: Set[str], job_skills: Sequence[str]) -> float:
-        if not resume_skills or not job_skills:
-            return 0.0
-        # compute fuzzy overlap: if a resume skill is similar to any job skill > 85
-        matched = 0
-        for rs in resume_skills:
-            for js in job_skills:
-                if fuzz_ratio(rs.lower(), js.lower()) >= 85:
-                    matched += 1
-                    break
-        denom = len(resume_skills.union(set(job_skills)))
-        return matched / max(1, denom)
+    def _corpus(jobs: JobTable, start: int = 0) -> Iterator[str]:
+        # normalised on the fly; keeping a normalised copy per row would double the text held
+        return (normalize_text(d) for d in jobs.values("description", start))
+
+    @property
+    def drift(self) -> float:
+        """
+        Appended jobs as a fraction of the jobs the vocabulary and IDF were fitted on.
+        """
+        return (len(self.jobs) - self.n_fitted) / max(1, self.n_fitted)
+
+    def add_jobs(self, jobs: Sequence[JobRecord]) -> None:
+        """
+        Append jobs using the already fitted vocabulary and IDF weights.
+
+        New terms are ignored until the next refit, which starts in the
+        background once drift exceeds refit_threshold.
+        """
+        if not jobs:
+            return
+        rows = [
+            {
+                "job_id": j.job_id,
+                "title": j.title,
+                "company": j.company,
+                "location": j.location,
+                "description": j.description,
+                "skills": ";".join(j.skills),
+            }
+            for j in jobs
+        ]
+        with self._lock:
+            # the new state is built first and swapped in only once all of it succeeded
+            new_tfidf = self.vectorizer.transform([normalize_text(j.description or "") for j in jobs])
+            new_skills = self.skill_vocab.matrix([t.strip() for t in j.skills if t.strip()] for j in jobs)
+            job_tfidf = sp.vstack([self.job_tfidf, new_tfidf], format="csr")
+            job_skills = stack_skill_rows(self.job_skills, new_skills)
+            facets = self.facets.extended(
+                [j.location for j in jobs], [j.company for j in jobs], [j.title for j in jobs], job_skills
+            )
+            ann = self.ann.extended(new_tfidf) if self.ann is not None else None
+            neighbors = self.neighbors.extended(job_tfidf) if self.neighbors is not None else None
+            self.jobs = self.jobs.extended(rows)
+            self.job_tfidf = job_tfidf
+            self.job_skills = job_skills
+            self.facets = facets
+            self.ann = ann
+            self.neighbors = neighbors
+            self._rotate_cache_token()
+            start_refit = self.drift > self.refit_threshold and not self._refitting
+            if start_refit:
+                self._refitting = True
+        if start_refit:
+            threading.Thread(target=self.refit, name="job-recommender-refit", daemon=True).start()
+
+    def refit(self) -> None:
+        """
+        Refit vocabulary and IDF over all jobs, then swap the new model in.
+        """
+        try:
+            with self._lock:
+                jobs = self.jobs
+                n_neighbors = self.neighbors.n_neighbors if self.neighbors is not None else 0
+            vectorizer = self._make_vectorizer()
+            with stage("fit"):
+                job_tfidf = vectorizer.fit_transform(self._corpus(jobs))
+            version = model_version(vectorizer, self.skills_master)
+            ann = IVFIndex.build(job_tfidf) if self.ann_nprobe else None
+            neighbors = NeighborTable.build(job_tfidf, n_neighbors) if n_neighbors else None
+            with self._lock:
+                # jobs appended while we were fitting
+                if len(self.jobs) > len(jobs):
+                    extra_tfidf = vectorizer.transform(self._corpus(self.jobs, start=len(jobs)))
+                    job_tfidf = sp.vstack([job_tfidf, extra_tfidf], format="csr")
+                    ann = ann.extended(extra_tfidf) if ann is not None else None
+                    neighbors = neighbors.extended(job_tfidf) if neighbors is not None else None
+                self.vectorizer = vectorizer
+                self.job_tfidf = job_tfidf
+                self.model_version = version
+                self.ann = ann
+                self.neighbors = neighbors
+                self.n_fitted = len(jobs)
+                self._rotate_cache_token()
+        finally:
+            self._refitting = False
+
+    def _snapshot(self) -> _Snapshot:
+        with self._lock:
+            return _Snapshot(
+                self.vectorizer,
+                self.job_tfidf,
+                self.job_skills,
+                self.jobs,
+                self.cache_token,
+                self.model_version,
+                self.ann,
+                self.facets,
+            )
+
+    def _resume_skill_ids(self, text_norm: str) -> np.ndarray:
+        return self.skill_vocab.encode(extract_skills(text_norm, self.skill_matcher))
+
+    def resume_features(self, vectorizer: "TfidfVectorizer", version: str, resume_texts: Sequence[str]) -> List[ResumeFeatures]:
+        """
+        TF-IDF rows and skill ids for raw resume texts, through the on-disk resume cache.
+        """
+        def compute(texts: List[str]) -> List[ResumeFeatures]:
+            with stage("tfidf_transform"):
+                texts_norm = [normalize_text(t) for t in texts]
+                vecs = vectorizer.transform(texts_norm)
+            with stage("skill_extract"):
+                skill_ids = [self._resume_skill_ids(t) for t in texts_norm]
+            return [ResumeFeatures(vecs[i], skill_ids[i]) for i in range(len(texts_norm))]
+
+        with stage("features"):
+            return cached_features(self.resume_cache, version, resume_texts, compute)
+
+    @staticmethod
+    def _skill_display(vocab: SkillVocabulary, skills_master: Sequence[str]) -> Dict[int, str]:
+        # resume skills come from the master list, so matches are shown in its spelling, not the lowercased id name
+        display: Dict[int, str] = {}
+        for spelling, skill_id in zip(skills_master, vocab.lookup(skills_master)):
+            if skill_id is not None:
+                display.setdefault(skill_id, spelling)
+        return display
+
+    def _result_frame(
+        self,
+        jobs: JobTable,
+        job_skills: sp.csr_matrix,
+        top_idx: np.ndarray,
+        top_scores: np.ndarray,
+        resume_ids: np.ndarray,
+    ) -> "pd.DataFrame":
+        # only the top_k rows are decoded; they are already in score order
+        result = jobs.to_frame(top_idx, ["job_id", "title", "company", "location", "skills", "description"])
+        result.insert(4, "score", top_scores)
+        result.insert(6, "resume_skills_matched", [
+            ", ".join(sorted(
+                self.skill_display.get(i, self.skill_vocab.names[i])
+                for i in np.intersect1d(job_skills[row].indices, resume_ids)
+            ))
+            for row in top_idx
+        ])
+        return result
+
+    def score_vectors(self, resume_text: str) -> ScoreVectors:
+        """
+        Raw per-job TF-IDF and skill scores for a resume, served from the
+        shared result cache when the same text was scored against this index state.
+        """
+        vectorizer, job_tfidf, job_skills, _, token, version, _, _ = self._snapshot()
+        key = fingerprint(normalize_text(resume_text))
+        cached = self.cache.get(token, key)
+        if cached is not None:
+            return cached
+        features = self.resume_features(vectorizer, version, [resume_text])[0]
+        tfidf, skills = self.scorer.score_vectors(features.tfidf, job_tfidf, features.skill_ids, job_skills)
+        vectors = ScoreVectors(tfidf=tfidf, skills=skills, resume_skill_ids=features.skill_ids)
+        self.cache.put(token, key, vectors)
+        return vectors
 
     def recommend(
         self,
@@ -68,28 +329,107 @@ class JobRecommender:
         top_k: int = 10,
         weight_tfidf: float = 0.7,
         weight_skills: float = 0.3,
-    ) -> pd.DataFrame:
-        text_norm = normalize_text(resume_text)
-        resume_vec = self.vectorizer.transform([text_norm])
-        sim = cosine_similarity(resume_vec, self.job_tfidf).ravel()
-
-        resume_skills = extract_skills(text_norm, self.skills_master)
-        skills_scores = np.array([
-            self._skills_overlap(resume_skills, skills) for skills in self.jobs_df["skills_list"]
-        ])
-
-        score = weight_tfidf * sim + weight_skills * skills_scores
-        top_idx = np.argsort(-score)[:top_k]
+        nprobe: Optional[int] = None,
+        filters: Optional[Dict[str, FilterValue]] = None,
+    ) -> "pd.DataFrame":
+        """
+        Top jobs for a resume. nprobe overrides ann_nprobe for this call (0 forces exact scoring).
 
-        result = self.jobs_df.iloc[top_idx].copy()
-        result["score"] = score[top_idx]
-        result["resume_skills_matched"] = [
-            ", ".join(sorted(extract_skills(";".join(skills), resume_skills))) if resume_skills else ""
-            for skills in result["skills_list"]
-        ]
-        return result[[
-            "job_id", "title", "company", "location", "score", "skills", "resume_skills_matched", "description"
-        ]].sort_values("score", ascending=False)
+        filters restricts results by location, company, title keywords and
+        required skills (see app.facets); only the matching jobs are scored.
+        """
+        snap = self._snapshot()
+        with stage("filter"):
+            rows = snap.facets.rows(filters, self.skill_vocab)
+        nprobe = self.ann_nprobe if nprobe is None else nprobe
+        if rows is not None or (snap.ann is not None and nprobe):
+            features = self.resume_features(snap.vectorizer, snap.model_version, [resume_text])[0]
+            if rows is not None:
+                # filtered sets are scored exactly; they are usually smaller than an IVF probe
+                with stage("subset_score"):
+                    top_idx, top_scores = subset_top_k(
+                        rows,
+                        features.tfidf,
+                        snap.job_tfidf,
+                        features.skill_ids,
+                        snap.job_skills,
+                        top_k,
+                        weight_tfidf=weight_tfidf,
+                        weight_skills=weight_skills,
+                    )
+            else:
+                with stage("ann_score"):
+                    top_idx, top_scores = ann_top_k(
+                        snap.ann,
+                        features.tfidf,
+                        snap.job_tfidf,
+                        features.skill_ids,
+                        snap.job_skills,
+                        top_k,
+                        weight_tfidf=weight_tfidf,
+                        weight_skills=weight_skills,
+                        nprobe=nprobe,
+                    )
+            with stage("result_frame"):
+                return self._result_frame(snap.jobs, snap.job_skills, top_idx, top_scores, features.skill_ids)
+        job_skills, jobs = snap.job_skills, snap.jobs
+        vectors = self.score_vectors(resume_text)
+        # a refit may have landed between the two snapshots; only score rows both agree on
+        n = min(len(vectors.tfidf), len(jobs))
+        top_idx, top_scores = self.scorer.top_k(
+            vectors.tfidf[:n], vectors.skills[:n], top_k, weight_tfidf=weight_tfidf, weight_skills=weight_skills
+        )
+        with stage("result_frame"):
+            return self._result_frame(jobs, job_skills, top_idx, top_scores, vectors.resume_skill_ids)
 
+    def recommend_many(
+        self,
+        resume_texts: Sequence[str],
+        top_k: int = 10,
+        weight_tfidf: float = 0.7,
+        weight_skills: float = 0.3,
+    ) -> List["pd.DataFrame"]:
+        """
+        recommend() for many resumes, with one transform call and a chunked
+        resumes x jobs product. Results are returned in input order.
+        """
+        if not resume_texts:
+            return []
+        vectorizer, job_tfidf, job_skills, jobs, _, version, _, _ = self._snapshot()
+        features = self.resume_features(vectorizer, version, resume_texts)
+        resume_vecs = sp.vstack([f.tfidf for f in features], format="csr")
+        resume_ids = [f.skill_ids for f in features]
+        resume_skills = skill_id_rows(resume_ids, len(self.skill_vocab))
 
+        ranked = self.scorer.top_k_many(
+            resume_vecs,
+            job_tfidf,
+            resume_skills,
+            job_skills,
+            top_k,
+            weight_tfidf=weight_tfidf,
+            weight_skills=weight_skills,
+        )
+        return [
+            self._result_frame(jobs, job_skills, top_idx, top_scores, ids)
+            for (top_idx, top_scores), ids in zip(ranked, resume_ids)
+        ]
 
+    def similar_jobs(self, row: int, top_k: int = 5) -> "pd.DataFrame":
+        """
+        Jobs most similar to the job at row (a recommend() result index) by
+        TF-IDF cosine, best first. The first call builds the lists for the
+        whole catalog unless the index was opened with them.
+        """
+        with self._lock:
+            neighbors, job_tfidf, jobs = self.neighbors, self.job_tfidf, self.jobs
+        if neighbors is None:
+            neighbors = NeighborTable.build(job_tfidf)
+            with self._lock:
+                # keep them only if no jobs were added and no refit swapped in meanwhile
+                if self.neighbors is None and self.job_tfidf is job_tfidf:
+                    self.neighbors = neighbors
+        idx, scores = neighbors.neighbors(row, top_k)
+        result = jobs.to_frame(idx, ["job_id", "title", "company", "location"])
+        result["score"] = scores
+        return result
@@ -0,0 +1,285 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from .cache import fingerprint
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def model_version(vectorizer, skills_master: Iterable[str]) -> str:
+    """
+    Stable id for a fitted vocabulary/IDF plus skills master, identical across
+    processes that load the same index. Resume skill ids only depend on the
+    master list (it is registered first), so appended jobs do not change it.
+    """
+    h = hashlib.sha256()
+    h.update(str(len(vectorizer.vocabulary_)).encode())
+    h.update(np.ascontiguousarray(vectorizer.idf_, dtype=np.float64).tobytes())
+    h.update("\n".join(skills_master).encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
+@dataclass
+class ResumeFeatures:
+    """
+    Everything scoring needs from a resume: its 1 x vocab TF-IDF row and skill ids.
+    """
+    tfidf: sp.csr_matrix
+    skill_ids: np.ndarray
+
+    def to_blobs(self) -> Tuple[bytes, bytes, bytes]:
+        row = self.tfidf.tocsr()
+        return (
+            row.indices.astype(np.int32).tobytes(),
+            row.data.astype(np.float32).tobytes(),
+            np.asarray(self.skill_ids, dtype=np.int32).tobytes(),
+        )
+
+    @classmethod
+    def from_blobs(cls, n_features: int, indices: bytes, data: bytes, skill_ids: bytes) -> "ResumeFeatures":
+        idx = np.frombuffer(indices, dtype=np.int32)
+        tfidf = sp.csr_matrix(
+            (np.frombuffer(data, dtype=np.float32), idx, np.array([0, len(idx)], dtype=np.int32)),
+            shape=(1, n_features),
+        )
+        return cls(tfidf=tfidf, skill_ids=np.frombuffer(skill_ids, dtype=np.int32))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    digest TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    text_norm TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS features (
+    digest TEXT NOT NULL,
+    model TEXT NOT NULL,
+    n_features INTEGER NOT NULL,
+    indices BLOB NOT NULL,
+    data BLOB NOT NULL,
+    skill_ids BLOB NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, model)
+);
+CREATE INDEX IF NOT EXISTS ix_documents_last_used ON documents (last_used);
+CREATE INDEX IF NOT EXISTS ix_features_last_used ON features (last_used);
+"""
+
+
+class ResumeCache:
+    """
+    Content-addressed on-disk cache of parsed resumes, shared by processes on one host.
+
+    documents maps the SHA-256 of uploaded bytes to the extracted and
+    normalised text, so a re-uploaded file skips pdfminer. features maps
+    (text fingerprint, model version) to the TF-IDF row and skill ids, so a
+    known resume skips normalisation, skill extraction and the transform.
+    Both tables share one byte budget with least-recently-used eviction.
+    documents holds raw resume text, so entries unused for ttl seconds are
+    neither served nor kept (ttl <= 0 keeps them until evicted).
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 512 << 20, ttl: float = 7 * 24 * 3600.0):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._expired_at = 0.0
+        self._expire_locked(time.time())
+        self._bytes = self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return sum(
+            self._conn.execute(f"SELECT COALESCE(SUM(nbytes), 0) FROM {table}").fetchone()[0]
+            for table in ("documents", "features")
+        )
+
+    def _fresh(self, last_used: float, now: float) -> bool:
+        return self.ttl <= 0 or now - last_used <= self.ttl
+
+    def _expire_locked(self, now: float) -> None:
+        # at most once a minute; lookups skip expired rows in between
+        if self.ttl <= 0 or now - self._expired_at < 60:
+            return
+        self._expired_at = now
+        cutoff = now - self.ttl
+        deleted = sum(
+            self._conn.execute(f"DELETE FROM {table} WHERE last_used < ?", (cutoff,)).rowcount
+            for table in ("documents", "features")
+        )
+        if deleted:
+            self._bytes = self._total_bytes()
+
+    def _count(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_text(self, digest: str) -> Optional[Tuple[str, str]]:
+        """
+        (text, text_norm) for a document digest, or None.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, text_norm, last_used FROM documents WHERE digest = ?", (digest,)
+            ).fetchone()
+            if row is not None and not self._fresh(row[2], now):
+                row = None
+            self._count(row is not None)
+            if row is None:
+                return None
+            self._conn.execute("UPDATE documents SET last_used = ? WHERE digest = ?", (now, digest))
+            return row[0], row[1]
+
+    def put_text(self, digest: str, text: str, text_norm: str) -> None:
+        nbytes = len(text.encode("utf-8")) + len(text_norm.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (digest, text, text_norm, nbytes, last_used) VALUES (?, ?, ?, ?, ?)",
+                (digest, text, text_norm, nbytes, time.time()),
+            )
+            self._bytes += nbytes
+            self._expire_locked(time.time())
+            self._evict_locked()
+
+    def get_features(self, digest: str, model: str) -> Optional[ResumeFeatures]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT n_features, indices, data, skill_ids, last_used FROM features WHERE digest = ? AND model = ?",
+                (digest, model),
+            ).fetchone()
+            if row is not None and not self._fresh(row[4], now):
+                row = None
+            self._count(row is not None)
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE features SET last_used = ? WHERE digest = ? AND model = ?", (now, digest, model)
+            )
+        return ResumeFeatures.from_blobs(*row[:4])
+
+    def put_features(self, digest: str, model: str, features: ResumeFeatures) -> None:
+        indices, data, skill_ids = features.to_blobs()
+        nbytes = len(indices) + len(data) + len(skill_ids)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO features (digest, model, n_features, indices, data, skill_ids, nbytes, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, model, features.tfidf.shape[1], indices, data, skill_ids, nbytes, time.time()),
+            )
+            self._bytes += nbytes
+            self._expire_locked(time.time())
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        # other processes write to the same file; recount before deleting anything
+        self._bytes = self._total_bytes()
+        target = int(self.max_bytes * 0.9)
+        while self._bytes > target:
+            oldest = self._conn.execute(
+                "SELECT 'documents', digest, NULL, nbytes, last_used FROM documents"
+                " UNION ALL SELECT 'features', digest, model, nbytes, last_used FROM features"
+                " ORDER BY last_used LIMIT 256"
+            ).fetchall()
+            if not oldest:
+                break
+            self._conn.execute("BEGIN")
+            for table, digest, model, nbytes, _ in oldest:
+                if table == "documents":
+                    self._conn.execute("DELETE FROM documents WHERE digest = ?", (digest,))
+                else:
+                    self._conn.execute("DELETE FROM features WHERE digest = ? AND model = ?", (digest, model))
+                self._bytes -= nbytes
+                if self._bytes <= target:
+                    break
+            self._conn.execute("COMMIT")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute("DELETE FROM features")
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_shared: Optional[ResumeCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_resume_cache() -> Optional[ResumeCache]:
+    """
+    Process-wide resume cache at RESUME_CACHE_PATH, bounded by RESUME_CACHE_MB
+    (default 512) and RESUME_CACHE_TTL seconds unused (default 7 days). It
+    stores resume text, so it is off unless a path is configured.
+    """
+    global _shared
+    path = os.getenv("RESUME_CACHE_PATH", "")
+    if not path:
+        return None
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ResumeCache(
+                    Path(path),
+                    max_bytes=int(float(os.getenv("RESUME_CACHE_MB", "512")) * (1 << 20)),
+                    ttl=float(os.getenv("RESUME_CACHE_TTL", str(7 * 24 * 3600))),
+                )
+    return _shared
+
+
+def cached_features(
+    cache: Optional[ResumeCache],
+    model: str,
+    texts: Sequence[str],
+    compute: Callable[[List[str]], List[ResumeFeatures]],
+) -> List[ResumeFeatures]:
+    """
+    ResumeFeatures per text in input order. Texts are looked up by fingerprint
+    under model; the misses go through one compute() call and are stored.
+    """
+    if cache is None:
+        return compute(list(texts))
+    keys = [fingerprint(t) for t in texts]
+    found: List[Optional[ResumeFeatures]] = [cache.get_features(k, model) for k in keys]
+    missing = [i for i, f in enumerate(found) if f is None]
+    if missing:
+        for i, features in zip(missing, compute([texts[i] for i in missing])):
+            cache.put_features(keys[i], model, features)
+            found[i] = features
+    return found
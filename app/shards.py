@@ -0,0 +1,201 @@
+"""
+Multi-core scoring over row shards of the job matrices.
+
+The catalog is split into contiguous row ranges, and each shard is a
+zero-copy CSR view: its data and indices are slices of the full arrays,
+memory-mapped ones included. SciPy's sparse products and NumPy's
+partitioning release the GIL, so a thread pool scores shards in parallel
+without copying the matrices into worker processes. Per-shard top-k lists
+are merged with a heap.
+"""
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+import scipy.sparse as sp
+
+from .metrics import stage
+from .ranking import BATCH_CHUNK, combine_top_k, hybrid_top_k_many, sparse_scores
+from .skills import overlap_scores
+
+# smaller shards cost more in dispatch than they gain in parallelism
+MIN_SHARD_ROWS = 50_000
+
+T = TypeVar("T")
+TopK = Tuple[np.ndarray, np.ndarray]
+
+
+def row_block(matrix: sp.csr_matrix, start: int, stop: int) -> sp.csr_matrix:
+    """
+    Rows start:stop of a CSR matrix sharing its data and indices arrays.
+    """
+    lo, hi = matrix.indptr[start], matrix.indptr[stop]
+    # the (data, indices, indptr) constructor prunes slices of larger buffers
+    # into copies, so the arrays are attached after building an empty matrix
+    block = sp.csr_matrix((stop - start, matrix.shape[1]), dtype=matrix.dtype)
+    block.data = matrix.data[lo:hi]
+    block.indices = matrix.indices[lo:hi]
+    block.indptr = matrix.indptr[start:stop + 1] - lo
+    return block
+
+
+def merge_top_k(parts: Sequence[TopK], top_k: int) -> TopK:
+    """
+    Merge per-shard (rows, scores) lists, each best first, into the overall top_k.
+    Ties keep shard order, so the lower row wins as in a single-shard ranking.
+    """
+    heads = [zip(-scores, rows) for rows, scores in parts]
+    best = list(itertools.islice(heapq.merge(*heads), top_k))
+    if not best:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float64)
+    neg, rows = zip(*best)
+    return np.array(rows, dtype=np.intp), -np.array(neg, dtype=np.float64)
+
+
+class ShardedScorer:
+    """
+    Scores a resume against row shards of the job matrices on a thread pool.
+
+    shards is the most row ranges a catalog is cut into (each keeps at least
+    min_shard_rows rows) and workers the threads scoring them. With one
+    worker the shards run inline on the calling thread; with one shard the
+    plain ranking kernels are used. Results match unsharded scoring.
+    """
+
+    def __init__(self, shards: int = 1, workers: int = 1, min_shard_rows: int = MIN_SHARD_ROWS):
+        self.shards = max(1, shards)
+        self.workers = max(1, workers)
+        self.min_shard_rows = max(1, min_shard_rows)
+        self._pool = (
+            ThreadPoolExecutor(self.workers, thread_name_prefix="score-shard") if self.workers > 1 else None
+        )
+
+    def bounds(self, n_rows: int) -> List[Tuple[int, int]]:
+        n = max(1, min(self.shards, n_rows // self.min_shard_rows))
+        edges = np.linspace(0, n_rows, n + 1).astype(np.int64)
+        return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:])]
+
+    def _map(self, fn: Callable[[int, int], T], bounds: List[Tuple[int, int]]) -> List[T]:
+        if self._pool is None or len(bounds) == 1:
+            return [fn(a, b) for a, b in bounds]
+        return list(self._pool.map(lambda ab: fn(*ab), bounds))
+
+    def score_vectors(
+        self,
+        resume_vec: sp.spmatrix,
+        job_tfidf: sp.csr_matrix,
+        resume_skill_ids: np.ndarray,
+        job_skills: sp.csr_matrix,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-job cosine and skill overlap scores, each shard filling its own slice.
+        float64 like the unsharded and batch kernels, so every path reports the same scores.
+        """
+        n_rows = job_tfidf.shape[0]
+        tfidf = np.empty(n_rows, dtype=np.float64)
+        skills = np.empty(n_rows, dtype=np.float64)
+
+        def fill_tfidf(start: int, stop: int) -> None:
+            tfidf[start:stop] = sparse_scores(resume_vec, row_block(job_tfidf, start, stop))
+
+        def fill_skills(start: int, stop: int) -> None:
+            skills[start:stop] = overlap_scores(row_block(job_skills, start, stop), resume_skill_ids)
+
+        bounds = self.bounds(n_rows)
+        with stage("cosine"):
+            self._map(fill_tfidf, bounds)
+        with stage("skill_overlap"):
+            self._map(fill_skills, bounds)
+        return tfidf, skills
+
+    def top_k(
+        self,
+        tfidf_scores: np.ndarray,
+        skill_scores: np.ndarray,
+        top_k: int,
+        weight_tfidf: float = 0.7,
+        weight_skills: float = 0.3,
+    ) -> TopK:
+        """
+        combine_top_k() per shard, merged.
+        """
+        bounds = self.bounds(len(tfidf_scores))
+        if len(bounds) == 1:
+            with stage("top_k"):
+                return combine_top_k(tfidf_scores, skill_scores, top_k, weight_tfidf, weight_skills)
+
+        def shard(start: int, stop: int) -> TopK:
+            idx, scores = combine_top_k(
+                tfidf_scores[start:stop], skill_scores[start:stop], top_k, weight_tfidf, weight_skills
+            )
+            return idx + start, scores
+
+        with stage("top_k"):
+            return merge_top_k(self._map(shard, bounds), top_k)
+
+    def top_k_many(
+        self,
+        resume_vecs: sp.csr_matrix,
+        job_tfidf: sp.csr_matrix,
+        resume_skills: sp.csr_matrix,
+        job_skills: sp.csr_matrix,
+        top_k: int,
+        weight_tfidf: float = 0.7,
+        weight_skills: float = 0.3,
+    ) -> Iterator[TopK]:
+        """
+        hybrid_top_k_many() with every block of resumes scored across shards;
+        yields (row indices, scores) per resume in input order.
+        """
+        bounds = self.bounds(job_tfidf.shape[0])
+        if len(bounds) == 1:
+            yield from hybrid_top_k_many(
+                resume_vecs, job_tfidf, resume_skills, job_skills, top_k, weight_tfidf, weight_skills
+            )
+            return
+        for start in range(0, resume_vecs.shape[0], BATCH_CHUNK):
+            block_vecs = resume_vecs[start:start + BATCH_CHUNK]
+            block_skills = resume_skills[start:start + BATCH_CHUNK]
+
+            def shard(lo: int, hi: int) -> List[TopK]:
+                ranked = hybrid_top_k_many(
+                    block_vecs,
+                    row_block(job_tfidf, lo, hi),
+                    block_skills,
+                    row_block(job_skills, lo, hi),
+                    top_k,
+                    weight_tfidf,
+                    weight_skills,
+                )
+                return [(idx + lo, scores) for idx, scores in ranked]
+
+            per_shard = self._map(shard, bounds)
+            for parts in zip(*per_shard):
+                yield merge_top_k(parts, top_k)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+
+_shared: Optional[ShardedScorer] = None
+_shared_lock = threading.Lock()
+
+
+def get_scorer() -> ShardedScorer:
+    """
+    Process-wide scorer shared by JobRecommender and the Flask services.
+    SCORE_WORKERS threads (default 1, i.e. inline) score up to SCORE_SHARDS
+    row ranges (default SCORE_WORKERS) per request.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                workers = int(os.getenv("SCORE_WORKERS", "1"))
+                _shared = ShardedScorer(shards=int(os.getenv("SCORE_SHARDS", str(workers))), workers=workers)
+    return _shared
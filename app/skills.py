@@ -0,0 +1,153 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+
+# minimum rapidfuzz ratio for two spellings to count as the same skill
+FUZZY_CUTOFF = 85
+
+
+def load_skills_master(path: Path) -> List[str]:
+    if not path.exists():
+        return []
+    skills = [line.strip() for line in path.read_text(encoding="utf-8", errors="ignore").splitlines()]
+    return [s for s in skills if s]
+
+
+class SkillVocabulary:
+    """
+    Canonical integer ids for skill spellings.
+
+    Spellings are lowercased once and aliased to an already known skill when
+    their fuzzy ratio is >= FUZZY_CUTOFF, resolved in bulk with
+    rapidfuzz.process.cdist. Ids are append-only, so matrices built earlier
+    stay valid as the vocabulary grows.
+    """
+
+    def __init__(self, skills_master: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # master entries are canonical by definition; only later spellings are aliased
+        self.add(skills_master, fuzzy=False)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, skills: Iterable[str], fuzzy: bool = True) -> None:
+        new = [s for s in dict.fromkeys(s.strip().lower() for s in skills if s and s.strip()) if s not in self._ids]
+        # bound the cdist score matrices for large taxonomies
+        for start in range(0, len(new), 1024):
+            self._add_chunk(new[start:start + 1024], fuzzy)
+
+    def _add_chunk(self, chunk: List[str], fuzzy: bool) -> None:
+        alias = np.full(len(chunk), -1, dtype=np.int64)
+        inner = None
+        if fuzzy:
+            from rapidfuzz import process
+            from rapidfuzz.fuzz import ratio as fuzz_ratio
+
+            if self._ids:
+                known = list(self._ids)
+                scores = process.cdist(
+                    chunk, known, scorer=fuzz_ratio, score_cutoff=FUZZY_CUTOFF, dtype=np.uint8, workers=-1
+                )
+                best = scores.argmax(axis=1)
+                hit = scores[np.arange(len(chunk)), best] >= FUZZY_CUTOFF
+                alias[hit] = [self._ids[known[j]] for j in best[hit]]
+            # unresolved spellings may still be near-duplicates of each other
+            inner = process.cdist(chunk, chunk, scorer=fuzz_ratio, score_cutoff=FUZZY_CUTOFF, dtype=np.uint8, workers=-1)
+        for i, spelling in enumerate(chunk):
+            if alias[i] < 0:
+                earlier = np.flatnonzero(inner[i, :i] >= FUZZY_CUTOFF) if inner is not None else ()
+                if len(earlier):
+                    alias[i] = alias[earlier[0]]
+                else:
+                    alias[i] = len(self.names)
+                    self.names.append(spelling)
+            self._ids[spelling] = int(alias[i])
+
+    def state(self) -> dict:
+        return {"names": self.names, "aliases": self._ids}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "SkillVocabulary":
+        vocab = cls()
+        vocab.names = list(state["names"])
+        vocab._ids = {spelling: int(skill_id) for spelling, skill_id in state["aliases"].items()}
+        return vocab
+
+    def lookup(self, skills: Iterable[str]) -> List[Optional[int]]:
+        """
+        Ids for known spellings (None when unknown), without registering anything.
+        """
+        return [self._ids.get(s.strip().lower()) for s in skills]
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Sorted unique ids for skills, registering unseen spellings.
+        """
+        skills = [s.strip().lower() for s in skills if s and s.strip()]
+        self.add(skills)
+        return np.unique(np.fromiter((self._ids[s] for s in skills), dtype=np.int32, count=len(skills)))
+
+    def matrix(self, skill_lists: Iterable[Sequence[str]]) -> sp.csr_matrix:
+        """
+        Binary jobs x skills matrix, one row per skill list.
+        """
+        return skill_id_rows([self.encode(skills) for skills in skill_lists], len(self))
+
+
+def skill_id_rows(rows: Sequence[np.ndarray], n_skills: int) -> sp.csr_matrix:
+    """
+    Binary CSR matrix with one row per array of sorted unique skill ids.
+    """
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=indptr[1:])
+    indices = np.concatenate(rows).astype(np.int32, copy=False) if len(rows) else np.zeros(0, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(rows), n_skills))
+
+
+def stack_skill_rows(*blocks: sp.csr_matrix) -> sp.csr_matrix:
+    """
+    vstack skill matrices built at different vocabulary sizes, in one pass.
+    """
+    n_cols = max(m.shape[1] for m in blocks)
+    return sp.vstack(
+        [sp.csr_matrix((m.data, m.indices, m.indptr), shape=(m.shape[0], n_cols)) for m in blocks], format="csr"
+    )
+
+
+def overlap_scores(job_skills: sp.csr_matrix, resume_ids: np.ndarray) -> np.ndarray:
+    """
+    Jaccard overlap between one resume's skill ids and every job row:
+    |R & J| / |R | J|, with one sparse mat-vec for the intersections.
+    """
+    n_jobs, n_cols = job_skills.shape
+    if len(resume_ids) == 0 or n_jobs == 0:
+        return np.zeros(n_jobs, dtype=np.float64)
+    resume = np.zeros(n_cols, dtype=np.float32)
+    resume[resume_ids[resume_ids < n_cols]] = 1.0
+    inter = job_skills @ resume
+    job_sizes = np.diff(job_skills.indptr)
+    union = job_sizes + len(resume_ids) - inter
+    return np.where(job_sizes > 0, inter / np.maximum(union, 1), 0.0)
+
+
+def overlap_scores_many(job_skills: sp.csr_matrix, resume_skills: sp.csr_matrix) -> sp.coo_matrix:
+    """
+    Jaccard overlap for a block of resumes at once, as a sparse (jobs, resumes)
+    matrix holding only the pairs that share at least one skill.
+    """
+    n_cols = job_skills.shape[1]
+    resume_sizes = np.diff(resume_skills.indptr)
+    # ids newer than job_skills cannot intersect it but still count towards the union
+    resume_skills = resume_skills[:, :n_cols] if resume_skills.shape[1] > n_cols else resume_skills
+    resume_skills = sp.csr_matrix(
+        (resume_skills.data, resume_skills.indices, resume_skills.indptr), shape=(resume_skills.shape[0], n_cols)
+    )
+    inter = (job_skills @ resume_skills.T).tocoo()
+    job_sizes = np.diff(job_skills.indptr)
+    inter.data = inter.data / (job_sizes[inter.row] + resume_sizes[inter.col] - inter.data)
+    return inter
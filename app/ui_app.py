@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from urllib.parse import quote
 
@@ -11,8 +12,9 @@ _project_root = Path(__file__).resolve().parents[1]
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-from app.parser import read_text_from_bytes
+from app.parser import ParserPool
 from app.recommender import JobRecommender
+from app.resume_cache import get_resume_cache
 import requests
 
 
@@ -22,11 +24,44 @@ st.title("AI Powered Job Recommendation System")
 BASE_DIR = Path(__file__).resolve().parents[1]
 JOBS_CSV = BASE_DIR / "data" / "jobs_sample.csv"
 SKILLS_PATH = BASE_DIR / "data" / "skills_master.txt"
+# optional prebuilt index (python -m app.index_store ...); skips CSV parsing and refitting
+INDEX_DIR = os.getenv("INDEX_DIR")
+# two-stage retrieval for large catalogs: IVF lists probed per query (unset = exact scoring)
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "0")) or None
 
 
 @st.cache_resource(show_spinner=False)
 def load_recommender() -> JobRecommender:
-    return JobRecommender(JOBS_CSV, SKILLS_PATH)
+    if INDEX_DIR:
+        return JobRecommender.from_index(Path(INDEX_DIR), SKILLS_PATH, ann_nprobe=ANN_NPROBE)
+    return JobRecommender(JOBS_CSV, SKILLS_PATH, ann_nprobe=ANN_NPROBE)
+
+
+def similar_jobs(row_index, job_id: str, use_backend: bool, backend_url: str, top_k: int = 5) -> list:
+    """
+    Precomputed nearest jobs to one result: GET /api/jobs/<job_id>/similar in
+    backend mode, else the local recommender's neighbour lists by row.
+    """
+    if use_backend:
+        try:
+            resp = requests.get(
+                f"{backend_url.rstrip('/')}/api/jobs/{quote(str(job_id), safe='')}/similar",
+                params={"top_k": top_k},
+                timeout=10,
+            )
+            resp.raise_for_status()
+        except Exception:
+            # e.g. 503 while the backend is still computing the lists
+            return []
+        return resp.json().get("items", [])
+    return rec.similar_jobs(row_index, top_k=top_k).to_dict("records")
+
+
+@st.cache_resource(show_spinner=False)
+def load_parser() -> ParserPool:
+    # one worker is enough for a single upload; the point is the timeout and page cap,
+    # and re-uploads of the same file are answered from the resume cache
+    return ParserPool(workers=1, timeout=30.0, max_pages=20, cache=get_resume_cache())
 
 
 rec = load_recommender()
@@ -41,7 +76,10 @@ backend_url = st.sidebar.text_input("Backend URL", value="http://127.0.0.1:5000"
 
 resume_text = ""
 if uploaded is not None:
-    resume_text = read_text_from_bytes(uploaded.name, uploaded.read())
+    try:
+        resume_text = load_parser().parse(uploaded.name, uploaded.read())
+    except ValueError as e:
+        st.error(f"Could not read {uploaded.name}: {e}")
     with st.expander("Extracted Resume Text", expanded=False):
         st.write(resume_text[:5000] + ("..." if len(resume_text) > 5000 else ""))
 else:
@@ -87,7 +125,7 @@ if st.button("Recommend Jobs", type="primary"):
             hide_index=True,
         )
         with st.expander("Show details"):
-            for _, row in df.iterrows():
+            for row_index, row in df.iterrows():
                 st.markdown(f"### {row['title']} — {row['company']} ({row['location']})")
                 st.markdown(f"**Score**: {row['score']:.3f}")
                 st.markdown(f"**Skills**: {row['skills']}")
@@ -110,6 +148,15 @@ if st.button("Recommend Jobs", type="primary"):
                     ("Site search (company domain)", 'https://www.google.com/search?q=' + site_q),
                 ]
                 st.markdown(" · ".join([f"[{name}]({url})" for name, url in links]))
+                similar = similar_jobs(row_index, row["job_id"], use_backend, backend_url)
+                if similar:
+                    similar_links = [
+                        f"[{s['title']} — {s['company']}](https://www.google.com/search?q="
+                        + quote(f"{s['title']} {s['company']} careers {s['location']}")
+                        + f") ({s['score']:.2f})"
+                        for s in similar
+                    ]
+                    st.markdown("**Similar jobs**: " + " · ".join(similar_links))
                 st.markdown("**Description**:")
                 st.write(row["description"])
 
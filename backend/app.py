@@ -1,6 +1,18 @@
-from flask import Flask
+from flask import Flask, Response
 from flask_cors import CORS
-from .database import init_engine_and_session
+
+from app.cache import get_result_cache
+from app.metrics import render_prometheus
+from app.resume_cache import get_resume_cache
+
+from .database import init_engine_and_session, pool_stats
+from .services.candidates import CandidateIndex
+from .services.counts import create_job_counts
+from .services.index import INDEX_DIR, JobIndex
+from .services.matching import create_match_executor
+from .services.parsing import create_parser_pool
+from .services.similar import SimilarJobs
+from .services.tasks import TaskRegistry
 
 
 def create_app() -> Flask:
@@ -10,17 +22,58 @@ def create_app() -> Flask:
 	# Database
 	init_engine_and_session()
 
+	# Ranking index, shared by all requests; refitted only when the jobs table changes
+	job_index = JobIndex()
+	if INDEX_DIR:
+		job_index.load_prebuilt(INDEX_DIR)
+		service = job_index.sync()
+	else:
+		service = job_index.rebuild()
+	app.extensions["job_index"] = job_index
+	# similar-jobs lists for GET /api/jobs/<job_id>/similar: prebuilt ones are extended in the
+	# background; building from scratch in every worker is opt-in (SIMILAR_JOBS_BUILD=1)
+	similar_jobs = SimilarJobs()
+	similar_jobs.refresh(service)
+	app.extensions["similar_jobs"] = similar_jobs
+	# candidate resumes in the same vector space, built lazily on first reverse match
+	app.extensions["candidate_index"] = CandidateIndex()
+	# GET /api/jobs totals, re-counted at most every JOBS_COUNT_TTL seconds
+	app.extensions["job_counts"] = create_job_counts()
+	# background work (CSV ingest) that must not block request threads
+	app.extensions["tasks"] = TaskRegistry()
+	# resume parsing runs in worker processes (pdfminer holds the GIL)
+	app.extensions["parser_pool"] = create_parser_pool()
+	# /api/match scoring: identical in-flight requests share one computation, overflow gets 429
+	match_executor = create_match_executor()
+	app.extensions["match_executor"] = match_executor
+
 	# Blueprints
 	from .routes.jobs import jobs_bp
 	from .routes.users import users_bp
 	from .routes.match import match_bp
+	from .routes.resumes import resumes_bp
 
 	app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
 	app.register_blueprint(users_bp, url_prefix="/api/users")
 	app.register_blueprint(match_bp, url_prefix="/api/match")
+	app.register_blueprint(resumes_bp, url_prefix="/api/resumes")
 
 	@app.get("/api/health")
 	def health():
-		return {"status": "ok"}
+		resume_cache = get_resume_cache()
+		return {
+			"status": "ok",
+			"index": job_index.stats(),
+			"similar_jobs": similar_jobs.stats(),
+			"result_cache": get_result_cache().stats(),
+			"resume_cache": resume_cache.stats() if resume_cache is not None else None,
+			"match": match_executor.stats(),
+			"db": pool_stats(),
+		}
+
+	@app.get("/api/metrics")
+	def metrics():
+		# Prometheus text exposition; stage histograms are empty unless METRICS=1
+		return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
 
 	return app
@@ -0,0 +1,68 @@
+"""
+Asyncio serving mode: POST /api/match runs on the event loop, every other
+route is the unchanged Flask app mounted as WSGI.
+
+    uvicorn backend.asgi:app --host 0.0.0.0 --port 5000
+
+A match request only awaits the shared match executor, so a slow ranking or
+PDF parse holds a thread there instead of a server worker, and identical
+concurrent requests await the same computation. Both modes use the same
+executor and limits (MATCH_WORKERS, MATCH_MAX_PENDING).
+"""
+import asyncio
+import json
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from .app import create_app
+from .services.matching import MatchRequest, Saturated, match_response, run_match
+
+
+flask_app = create_app()
+_extensions = flask_app.extensions
+
+
+async def _match_request(request: Request) -> MatchRequest:
+	if request.headers.get("content-type", "").startswith("multipart/form-data"):
+		form = await request.form()
+		upload = form.get("resume")
+		if upload is not None and not isinstance(upload, str):
+			return MatchRequest.from_data(form, (upload.filename or "", await upload.read()))
+		return MatchRequest.from_data(form)
+	return MatchRequest.from_data(json.loads(await request.body() or b"{}"))
+
+
+async def match(request: Request) -> JSONResponse:
+	try:
+		req = await _match_request(request)
+	except (TypeError, ValueError) as e:
+		return JSONResponse({"error": str(e)}, status_code=400)
+	try:
+		future = _extensions["match_executor"].submit(
+			req.key, run_match, _extensions["job_index"], _extensions["parser_pool"], req
+		)
+		items, timings = await asyncio.wrap_future(future)
+	except Saturated as e:
+		return JSONResponse({"error": str(e)}, status_code=429, headers={"Retry-After": "1"})
+	except LookupError as e:
+		return JSONResponse({"error": str(e)}, status_code=404)
+	except ValueError as e:
+		return JSONResponse({"error": str(e)}, status_code=400)
+	body, headers = match_response(req, items, timings)
+	return JSONResponse(body, headers=headers)
+
+
+app = Starlette(
+	routes=[
+		Route("/api/match", match, methods=["POST"]),
+		Route("/api/match/", match, methods=["POST"]),
+		Mount("/", app=WSGIMiddleware(flask_app)),
+	],
+	middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+)
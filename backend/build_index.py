@@ -0,0 +1,31 @@
+import argparse
+import time
+from pathlib import Path
+
+from app.neighbors import NeighborTable
+
+from .database import init_engine_and_session
+from .services.index import JobIndex
+
+
+def build_index(out_dir: Path, neighbors: int = 0) -> Path:
+	"""
+	Fit the ranking model over the jobs table and write it as a memory-mappable
+	index directory (see app.index_store). Point INDEX_DIR at out_dir to have
+	every worker open it at startup instead of refitting. With neighbors set,
+	that many similar jobs per job are computed and stored as well.
+	"""
+	init_engine_and_session()
+	service = JobIndex().rebuild()
+	table = NeighborTable.build(service.job_tfidf, neighbors) if neighbors and service.job_tfidf is not None else None
+	return service.save_index(out_dir, neighbors=table)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Build a prebuilt job index from the database.")
+	parser.add_argument("--out", type=Path, required=True, help="index directory; a new version is added under it")
+	parser.add_argument("--neighbors", type=int, default=0, help="also store this many similar jobs per job")
+	args = parser.parse_args()
+	start = time.perf_counter()
+	target = build_index(args.out, args.neighbors)
+	print(f"Wrote index {target} in {time.perf_counter() - start:.1f}s")
@@ -2,12 +2,25 @@ import os
 from contextlib import contextmanager
 from typing import Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import scoped_session, sessionmaker, DeclarativeBase
 
+from app.metrics import stage
+
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///app.db")
 
+# connection pool; size it to the request threads plus background workers
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# server databases only: drop connections older than this, test each one on checkout
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no", "")
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "15"))
+
 _engine = None
 _Session = None
 
@@ -16,24 +29,88 @@ class Base(DeclarativeBase):
 	pass
 
 
+def _sqlite_file(url: str) -> bool:
+	url = make_url(url)
+	return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+	"""
+	create_engine() keyword arguments for the url's backend.
+	"""
+	pool = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
+	if _sqlite_file(url):
+		# a file is never dropped by a server, so no pre-ping or recycling
+		return {**pool, "connect_args": {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT}}
+	if make_url(url).get_backend_name() == "sqlite":
+		# in-memory: every pooled connection would see its own empty database
+		return {}
+	return {**pool, "pool_recycle": DB_POOL_RECYCLE, "pool_pre_ping": DB_POOL_PRE_PING}
+
+
+def _sqlite_pragmas(dbapi_connection, _record) -> None:
+	# WAL lets readers run alongside the writer; NORMAL only syncs at checkpoints
+	cursor = dbapi_connection.cursor()
+	cursor.execute("PRAGMA journal_mode=WAL")
+	cursor.execute("PRAGMA synchronous=NORMAL")
+	cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_MB << 20}")
+	cursor.close()
+
+
 def init_engine_and_session() -> None:
 	global _engine, _Session
 	if _engine is None:
-		_engine = create_engine(DATABASE_URL, echo=False, future=True)
+		_engine = create_engine(DATABASE_URL, echo=False, future=True, **engine_options(DATABASE_URL))
+		if _sqlite_file(DATABASE_URL):
+			event.listen(_engine, "connect", _sqlite_pragmas)
 		_Session = scoped_session(sessionmaker(bind=_engine, autoflush=False, autocommit=False))
+		# register models on Base.metadata before creating tables
+		from .models import job, user, user_features  # noqa: F401
 		Base.metadata.create_all(_engine)
+		# create_all skips tables that already exist; add indexes declared since
+		for table in Base.metadata.sorted_tables:
+			for index in table.indexes:
+				index.create(_engine, checkfirst=True)
+
+
+def get_engine():
+	if _engine is None:
+		raise RuntimeError("Database not initialized. Call init_engine_and_session() first.")
+	return _engine
+
+
+def pool_stats() -> dict:
+	"""
+	Connection pool occupancy, for sizing workers against DB_POOL_SIZE.
+	"""
+	pool = get_engine().pool
+	stats = {"pool": type(pool).__name__}
+	for name in ("size", "checkedin", "checkedout", "overflow"):
+		method = getattr(pool, name, None)
+		if callable(method):
+			stats[name] = method()
+	if "overflow" in stats:
+		# QueuePool counts overflow from -size while the base pool is not yet full
+		stats["overflow"] = max(0, stats["overflow"])
+	return stats
 
 
 @contextmanager
-def session_scope() -> Iterator[scoped_session]:
+def session_scope(read_only: bool = False) -> Iterator[scoped_session]:
+	"""
+	Session committed on success and rolled back on error. read_only skips the
+	commit round trip; the transaction is simply released on close.
+	"""
 	if _Session is None:
 		raise RuntimeError("Database not initialized. Call init_engine_and_session() first.")
 	session = _Session()
-	try:
-		yield session
-		session.commit()
-	except Exception:
-		session.rollback()
-		raise
-	finally:
-		session.close()
+	with stage("db"):
+		try:
+			yield session
+			if not read_only:
+				session.commit()
+		except Exception:
+			session.rollback()
+			raise
+		finally:
+			session.close()
@@ -8,7 +8,7 @@ class Job(Base):
 	id = Column(Integer, primary_key=True)
 	job_id = Column(String(64), unique=True, nullable=False)
 	title = Column(String(255), nullable=False)
-	company = Column(String(255), nullable=False)
-	location = Column(String(255), nullable=True)
+	company = Column(String(255), nullable=False, index=True)
+	location = Column(String(255), nullable=True, index=True)
 	description = Column(Text, nullable=False)
 	skills = Column(Text, nullable=True)  # semicolon-separated
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, String
+from ..database import Base
+
+
+class UserFeatures(Base):
+	__tablename__ = "user_features"
+
+	user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+	# index model the vector was computed with; rows from another version are recomputed on read
+	model_version = Column(String(32), nullable=False)
+	digest = Column(String(64), nullable=False)  # sha256 of the resume text
+	n_features = Column(Integer, nullable=False)
+	tfidf_indices = Column(LargeBinary, nullable=False)  # int32
+	tfidf_data = Column(LargeBinary, nullable=False)  # float32
+	skill_ids = Column(LargeBinary, nullable=False)  # int32, sorted
@@ -1,38 +1,85 @@
 from flask import Blueprint, request
 from pathlib import Path
+from sqlalchemy import func, select
 from ..database import session_scope
 from ..models.job import Job
+from ..models.user import User
 from ..seed import seed_jobs_from_csv
+from ..services.candidates import get_candidate_index
+from ..services.counts import get_job_counts
+from ..services.index import get_job_index
+from ..services.matching import job_rows
+from ..services.similar import get_similar_jobs
+from ..services.tasks import get_tasks
 
 
 jobs_bp = Blueprint("jobs", __name__)
 
 
+# columns a list request may project; id is always returned since it is the cursor
+JOB_FIELDS = {
+	"id": Job.id,
+	"job_id": Job.job_id,
+	"title": Job.title,
+	"company": Job.company,
+	"location": Job.location,
+	"skills": Job.skills,
+	"description": Job.description,
+}
+MAX_PAGE_SIZE = 200
+
+
 @jobs_bp.get("/")
 def list_jobs():
-	page = int(request.args.get("page", 1))
-	limit = int(request.args.get("limit", 20))
-	offset = (page - 1) * limit
-	with session_scope() as s:
-		total = s.query(Job).count()
-		items = s.query(Job).order_by(Job.id.desc()).offset(offset).limit(limit).all()
-		return {
-			"total": total,
-			"page": page,
-			"limit": limit,
-			"items": [
-				{
-					"id": j.id,
-					"job_id": j.job_id,
-					"title": j.title,
-					"company": j.company,
-					"location": j.location,
-					"skills": j.skills,
-					"description": j.description,
-				}
-				for j in items
-			],
-		}
+	"""
+	Newest jobs first. Query: limit (at most MAX_PAGE_SIZE), cursor (next_cursor
+	of the previous page), fields (comma-separated JOB_FIELDS), company, location.
+
+	cursor pages seek on the primary key, so every page costs the same; page
+	(OFFSET) is still accepted for old clients. total is cached per filter.
+	"""
+	try:
+		limit = min(max(int(request.args.get("limit", 20)), 1), MAX_PAGE_SIZE)
+		cursor = int(request.args["cursor"]) if request.args.get("cursor") else None
+		page = max(int(request.args.get("page", 1)), 1)
+	except ValueError:
+		return {"error": "limit, cursor and page must be integers"}, 400
+	names = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()] or list(JOB_FIELDS)
+	unknown = set(names) - set(JOB_FIELDS)
+	if unknown:
+		return {"error": f"Unknown fields: {sorted(unknown)}; expected any of {list(JOB_FIELDS)}"}, 400
+	names = ["id"] + [n for n in dict.fromkeys(names) if n != "id"]
+
+	conditions = []
+	for name in ("company", "location"):
+		value = request.args.get(name)
+		if value is not None:
+			conditions.append(JOB_FIELDS[name] == value)
+
+	query = select(*(JOB_FIELDS[n] for n in names)).where(*conditions).order_by(Job.id.desc())
+	if cursor is not None:
+		query = query.where(Job.id < cursor)
+	else:
+		query = query.offset((page - 1) * limit)
+
+	def count() -> int:
+		with session_scope(read_only=True) as s:
+			return s.execute(select(func.count(Job.id)).where(*conditions)).scalar()
+
+	total = get_job_counts().get((request.args.get("company"), request.args.get("location")), count)
+	with session_scope(read_only=True) as s:
+		# one extra row tells whether another page exists
+		rows = s.execute(query.limit(limit + 1)).all()
+	items = [row._asdict() for row in rows[:limit]]
+	body = {
+		"total": total,
+		"limit": limit,
+		"items": items,
+		"next_cursor": items[-1]["id"] if len(rows) > limit else None,
+	}
+	if cursor is None:
+		body["page"] = page
+	return body
 
 
 @jobs_bp.post("/")
@@ -49,17 +96,33 @@ def create_job():
 		)
 		s.add(job)
 		s.flush()
-		return {"id": job.id}, 201
+		job_pk = job.id
+	get_job_counts().clear()
+	# append the new posting to the shared index without refitting
+	job_index = get_job_index()
+	job_index.mark_stale()
+	service = job_index.sync()
+	get_similar_jobs().refresh(service)
+	return {"id": job_pk}, 201
 
 
 @jobs_bp.post("/seed")
 def seed_jobs():
 	"""
-	Seed jobs from a CSV file. Body: {"csv_path": "optional/path.csv"}
-	Defaults to data/jobs_sample.csv at project root.
+	Seed jobs from a CSV file in the background. Body: {"csv_path": "optional/path.csv", "chunk_size": 5000}
+	Defaults to data/jobs_sample.csv at project root. Poll GET /api/jobs/seed/<task_id> for progress.
 	"""
 	data = request.get_json(silent=True) or {}
+	if not isinstance(data, dict):
+		return {"error": "request body must be a JSON object"}, 400
 	csv_path = data.get("csv_path")
+	try:
+		chunk_size = int(data.get("chunk_size", 5000))
+	except (TypeError, ValueError):
+		chunk_size = 0
+	if chunk_size < 1:
+		# 0 or less would silently seed one row per chunk
+		return {"error": "chunk_size must be a positive integer"}, 400
 	if csv_path:
 		csv_file = Path(csv_path)
 	else:
@@ -67,5 +130,107 @@ def seed_jobs():
 		csv_file = Path(__file__).resolve().parents[2] / "data" / "jobs_sample.csv"
 	if not csv_file.exists():
 		return {"error": f"CSV not found: {csv_file}"}, 400
-	seed_jobs_from_csv(csv_file)
-	return {"status": "seeded", "csv": str(csv_file)}
+
+	job_index = get_job_index()
+	job_counts = get_job_counts()
+	similar = get_similar_jobs()
+
+	def run(task):
+		with session_scope(read_only=True) as s:
+			before = s.query(func.count(Job.id)).scalar()
+
+		def progress(stats):
+			task.progress = stats.to_dict()
+
+		stats = seed_jobs_from_csv(csv_file, chunk_size=chunk_size, progress=progress)
+		with session_scope(read_only=True) as s:
+			inserted = s.query(func.count(Job.id)).scalar() - before
+		job_counts.clear()
+		job_index.mark_stale()
+		if inserted < stats.rows:
+			# some rows were updated in place, which appending cannot pick up
+			job_index.rebuild_in_background()
+		else:
+			similar.refresh(job_index.sync())
+		return {**stats.to_dict(), "inserted": inserted, "updated": stats.rows - inserted, "csv": str(csv_file)}
+
+	task = get_tasks().submit("seed", run)
+	return {"status": "queued", "task_id": task.id, "csv": str(csv_file)}, 202
+
+
+@jobs_bp.get("/seed/<task_id>")
+def seed_status(task_id: str):
+	task = get_tasks().get(task_id)
+	if task is None or task.name != "seed":
+		return {"error": "task not found"}, 404
+	return task.to_dict()
+
+
+@jobs_bp.get("/<job_id>/candidates")
+def job_candidates(job_id: str):
+	"""
+	Rank candidates for a posting. Query: top_k, weight_tfidf, weight_skills.
+	"""
+	try:
+		top_k = int(request.args.get("top_k", 10))
+		weight_tfidf = float(request.args.get("weight_tfidf", 0.7))
+		weight_skills = float(request.args.get("weight_skills", 0.3))
+	except ValueError:
+		return {"error": "top_k must be an integer and weight_tfidf, weight_skills numbers"}, 400
+	with session_scope(read_only=True) as s:
+		job_pk = s.query(Job.id).filter(Job.job_id == job_id).scalar()
+	if job_pk is None:
+		return {"error": "job not found"}, 404
+
+	service = get_job_index().sync()
+	row = service.row_for_id(job_pk)
+	if row is None:
+		return {"error": "job not indexed"}, 404
+	ranked = get_candidate_index().top_candidates(
+		service, row, top_k=top_k, weight_tfidf=weight_tfidf, weight_skills=weight_skills
+	)
+
+	with session_scope(read_only=True) as s:
+		users = {
+			u.id: u
+			for u in s.query(User.id, User.name, User.email).filter(User.id.in_([uid for uid, _ in ranked]))
+		}
+		return {
+			"job_id": job_id,
+			"items": [
+				{"id": uid, "name": users[uid].name, "email": users[uid].email, "score": score}
+				for uid, score in ranked
+				if uid in users
+			],
+		}
+
+
+@jobs_bp.get("/<job_id>/similar")
+def similar_jobs(job_id: str):
+	"""
+	Postings most similar to a job, from the precomputed neighbour lists
+	(at most SIMILAR_JOBS_N). Query: top_k.
+	"""
+	try:
+		top_k = int(request.args.get("top_k", 10))
+	except ValueError:
+		return {"error": "top_k must be an integer"}, 400
+	similar = get_similar_jobs()
+	if not similar.enabled:
+		return {"error": "similar jobs are disabled"}, 404
+	with session_scope(read_only=True) as s:
+		job_pk = s.query(Job.id).filter(Job.job_id == job_id).scalar()
+	if job_pk is None:
+		return {"error": "job not found"}, 404
+
+	ranked = similar.similar(get_job_index().sync(), job_pk, top_k=top_k)
+	if ranked is None and similar.computing:
+		return {"error": "similar jobs are still being computed"}, 503, {"Retry-After": "5"}
+	if ranked is None:
+		return {
+			"error": "no similar-jobs lists cover this job; prebuild them with "
+			"`python -m backend.build_index --neighbors N` or set SIMILAR_JOBS_BUILD=1"
+		}, 404
+	rows = job_rows(pk for pk, _ in ranked)
+	# jobs deleted since the lists were computed are skipped
+	return {"job_id": job_id, "items": [{**rows[pk], "score": score} for pk, score in ranked if pk in rows]}
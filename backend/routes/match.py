@@ -1,10 +1,21 @@
-from pathlib import Path
-from flask import Blueprint, request
+import itertools
+import json
 
-from ..database import session_scope
-from ..models.job import Job
-from ..models.user import User
-from ..services.recommender import RecommenderService
+from flask import Blueprint, Response, request
+
+from ..services.index import get_job_index
+from ..services.matching import (
+	MatchRequest,
+	Saturated,
+	get_match_executor,
+	job_rows,
+	match_response,
+	parse_filters,
+	ranked_items,
+	run_match,
+)
+from ..services.parsing import get_parser_pool
+from ..services.user_features import load_user_features
 
 
 match_bp = Blueprint("match", __name__)
@@ -12,36 +23,82 @@ match_bp = Blueprint("match", __name__)
 
 @match_bp.post("/")
 def match_jobs():
+	"""
+	JSON body, or a multipart form with the same fields plus a "resume" file (PDF/DOCX/TXT).
+
+	Scoring runs on the shared match executor: identical concurrent requests
+	are computed once, and 429 is returned while it is saturated.
+	"""
+	upload = request.files.get("resume")
+	data = request.form if upload is not None else request.get_json(force=True)
+	try:
+		req = MatchRequest.from_data(data, (upload.filename or "", upload.read()) if upload is not None else None)
+	except (TypeError, ValueError) as e:
+		return {"error": str(e)}, 400
+	try:
+		items, timings = get_match_executor().submit(req.key, run_match, get_job_index(), get_parser_pool(), req).result()
+	except Saturated as e:
+		return {"error": str(e)}, 429, {"Retry-After": "1"}
+	except LookupError as e:
+		return {"error": str(e)}, 404
+	except ValueError as e:
+		return {"error": str(e)}, 400
+	return match_response(req, items, timings)
+
+
+@match_bp.post("/batch")
+def match_jobs_batch():
+	"""
+	Rank many resumes in one call.
+	Body: {"resume_texts": [...]} and/or {"user_ids": [...]}, plus the /api/match weights, top_k and filters.
+	Streams a JSON array of {"index", "user_id"?, "items"} in input order.
+	"""
 	data = request.get_json(force=True)
-	resume_text = data.get("resume_text")
-	user_id = data.get("user_id")
-	weight_tfidf = float(data.get("weight_tfidf", 0.7))
-	weight_skills = float(data.get("weight_skills", 0.3))
-	top_k = int(data.get("top_k", 10))
-
-	with session_scope() as s:
-		if not resume_text and user_id:
-			user = s.get(User, int(user_id))
-			if not user:
-				return {"error": "user not found"}, 404
-			resume_text = user.resume_text or ""
-
-		jobs = s.query(Job).all()
-		skills_master = []
-		rec = RecommenderService(jobs, skills_master)
-		ranked = rec.rank(resume_text or "", weight_tfidf=weight_tfidf, weight_skills=weight_skills, top_k=top_k)
-
-		return {
-			"items": [
-				{
-					"id": r.job.id,
-					"job_id": r.job.job_id,
-					"title": r.job.title,
-					"company": r.job.company,
-					"location": r.job.location,
-					"skills": r.job.skills,
-					"score": r.score,
-				}
-				for r in ranked
-			]
-		}
+	if not isinstance(data, dict):
+		return {"error": "request body must be a JSON object"}, 400
+	try:
+		weight_tfidf = float(data.get("weight_tfidf", 0.7))
+		weight_skills = float(data.get("weight_skills", 0.3))
+		top_k = int(data.get("top_k", 10))
+		user_ids = [int(u) for u in data.get("user_ids") or []]
+	except (TypeError, ValueError) as e:
+		return {"error": f"invalid weight_tfidf, weight_skills, top_k or user_ids: {e}"}, 400
+
+	rec = get_job_index().sync()
+	texts = [text or "" for text in data.get("resume_texts") or []]
+	entries = [{} for _ in texts]
+	features = rec.resume_features(texts) if texts and rec.job_tfidf is not None else [None] * len(texts)
+	if user_ids:
+		users = load_user_features(rec, user_ids)
+		missing = [u for u in user_ids if u not in users]
+		if missing:
+			return {"error": "user not found", "user_ids": missing}, 404
+		entries += [{"user_id": u} for u in user_ids]
+		features += [users[u][1] for u in user_ids]
+
+	try:
+		ranked = rec.rank_many_features(
+			features, weight_tfidf=weight_tfidf, weight_skills=weight_skills, top_k=top_k, filters=parse_filters(data)
+		)
+	except ValueError as e:
+		return {"error": str(e)}, 400
+
+	def generate():
+		yield "["
+		done = 0
+		while True:
+			# fetch metadata for a block of resumes in one query
+			block = list(itertools.islice(ranked, 64))
+			if not block:
+				break
+			rows = job_rows(r.id for results in block for r in results)
+			for results in block:
+				entry = entries[done]
+				row = {"index": done, "items": ranked_items(results, rows)}
+				if "user_id" in entry:
+					row["user_id"] = entry["user_id"]
+				yield ("," if done else "") + json.dumps(row)
+				done += 1
+		yield "]"
+
+	return Response(generate(), mimetype="application/json")
@@ -0,0 +1,107 @@
+import io
+import json
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from flask import Blueprint, Response, request
+
+from app.parser import SUPPORTED_SUFFIXES, ParseResult
+
+from ..services.index import get_job_index
+from ..services.nlp import extract_skills_spacy
+from ..services.parsing import get_parser_pool
+
+
+resumes_bp = Blueprint("resumes", __name__)
+
+MAX_ARCHIVE_MEMBERS = 5000
+# what a corrupt, truncated, encrypted or oddly compressed archive or member raises
+_ARCHIVE_ERRORS = (zipfile.BadZipFile, zipfile.LargeZipFile, RuntimeError, NotImplementedError, EOFError, zlib.error)
+
+
+def _expand(uploads: List[Tuple[str, bytes]], max_bytes: int, errors: List[ParseResult]) -> Iterator[Tuple[str, bytes]]:
+	"""
+	(name, bytes) for every uploaded file; .zip archives are decompressed one member at a time.
+
+	Archives and members that cannot be read are appended to errors instead
+	of raising, and members whose declared size exceeds max_bytes are
+	rejected before anything is inflated (reads stop at the declared size).
+	"""
+	for name, data in uploads:
+		if Path(name).suffix.lower() != ".zip":
+			yield name, data
+			continue
+		try:
+			archive = zipfile.ZipFile(io.BytesIO(data))
+		except _ARCHIVE_ERRORS as e:
+			errors.append(ParseResult(name, error=f"Unreadable archive: {e}"))
+			continue
+		with archive:
+			members = [m for m in archive.infolist() if not m.is_dir()]
+			if len(members) > MAX_ARCHIVE_MEMBERS:
+				errors.append(ParseResult(
+					name, error=f"Archive has {len(members)} files (limit {MAX_ARCHIVE_MEMBERS}); the rest were skipped"
+				))
+				members = members[:MAX_ARCHIVE_MEMBERS]
+			for member in members:
+				if Path(member.filename).suffix.lower() not in SUPPORTED_SUFFIXES:
+					# passed through empty and reported as unsupported by the pool
+					yield member.filename, b""
+					continue
+				if member.file_size > max_bytes:
+					errors.append(ParseResult(
+						member.filename, error=f"File too large: {member.file_size} bytes (limit {max_bytes})"
+					))
+					continue
+				try:
+					content = archive.read(member)
+				except _ARCHIVE_ERRORS as e:
+					errors.append(ParseResult(member.filename, error=f"Unreadable archive member: {e}"))
+					continue
+				yield member.filename, content
+
+
+@resumes_bp.post("/bulk")
+def parse_bulk():
+	"""
+	Extract text and skills from many resumes in parallel.
+	Body: multipart form with one or more "files" (PDF/DOCX/TXT, or .zip archives of them).
+	Streams a JSON array of {"name", "text", "skills", "error", "seconds"} in completion order;
+	a file that fails or times out is reported with "error" set and does not abort the batch.
+	"""
+	uploads = [(f.filename or "", f.read()) for f in request.files.getlist("files")]
+	if not uploads:
+		return {"error": "no files uploaded"}, 400
+	include_text = request.args.get("include_text", "1") not in {"0", "false"}
+	rec = get_job_index().sync()
+	pool = get_parser_pool()
+
+	def row(result: ParseResult) -> str:
+		entry = {
+			"name": result.name,
+			"skills": sorted(extract_skills_spacy(result.text, rec.skill_matcher)) if result.ok else [],
+			"error": result.error,
+			"seconds": round(result.seconds, 4),
+		}
+		if include_text:
+			entry["text"] = result.text
+		return json.dumps(entry)
+
+	def results() -> Iterator[ParseResult]:
+		# archive errors are found while the pool pulls files, so they are emitted as they appear
+		errors: List[ParseResult] = []
+		for result in pool.parse_many(_expand(uploads, pool.max_bytes, errors)):
+			yield from errors
+			errors.clear()
+			yield result
+		yield from errors
+
+	def generate():
+		yield "["
+		for n, result in enumerate(results()):
+			yield ("," if n else "") + row(result)
+		yield "]"
+
+	return Response(generate(), mimetype="application/json")
@@ -1,6 +1,9 @@
 from flask import Blueprint, request
 from ..database import session_scope
 from ..models.user import User
+from ..services.candidates import get_candidate_index
+from ..services.index import get_job_index
+from ..services.user_features import store_user_features
 
 
 users_bp = Blueprint("users", __name__)
@@ -18,7 +21,13 @@ def create_user():
 		)
 		s.add(user)
 		s.flush()
-		return {"id": user.id}, 201
+		user_pk, role, resume_text = user.id, user.role, user.resume_text
+	if resume_text:
+		rec = get_job_index().sync()
+		stored = store_user_features(rec, user_pk, resume_text)
+		if role == "candidate":
+			get_candidate_index().upsert(rec, user_pk, stored[1])
+	return {"id": user_pk}, 201
 
 
 @users_bp.put("/<int:user_id>/resume")
@@ -29,4 +38,9 @@ def update_resume(user_id: int):
 		if not user:
 			return {"error": "not found"}, 404
 		user.resume_text = data.get("resume_text", "")
-		return {"status": "updated"}
+		role, resume_text = user.role, user.resume_text
+	rec = get_job_index().sync()
+	stored = store_user_features(rec, user_id, resume_text)
+	if role == "candidate":
+		get_candidate_index().upsert(rec, user_id, stored[1])
+	return {"status": "updated"}
@@ -1,31 +1,107 @@
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
 import csv
+import time
 
-from .database import init_engine_and_session, session_scope
+from sqlalchemy import insert
+
+from .database import get_engine, init_engine_and_session
 from .models.job import Job
 
 
-def seed_jobs_from_csv(csv_path: Path) -> None:
+_UPDATE_COLUMNS = ("title", "company", "location", "description", "skills")
+
+
+@dataclass
+class SeedStats:
+	rows: int
+	chunks: int
+	seconds: float
+
+	@property
+	def rows_per_sec(self) -> float:
+		return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+	def to_dict(self) -> dict:
+		return {
+			"rows": self.rows,
+			"chunks": self.chunks,
+			"seconds": round(self.seconds, 3),
+			"rows_per_sec": round(self.rows_per_sec, 1),
+		}
+
+
+def _upsert_statement(dialect: str):
+	"""
+	INSERT ... ON CONFLICT (job_id) DO UPDATE for SQLite and Postgres; a plain
+	INSERT elsewhere, which still fails on duplicate job_id.
+	"""
+	if dialect == "sqlite":
+		from sqlalchemy.dialects.sqlite import insert as dialect_insert
+	elif dialect == "postgresql":
+		from sqlalchemy.dialects.postgresql import insert as dialect_insert
+	else:
+		return insert(Job)
+	stmt = dialect_insert(Job)
+	return stmt.on_conflict_do_update(
+		index_elements=[Job.job_id],
+		set_={name: stmt.excluded[name] for name in _UPDATE_COLUMNS},
+	)
+
+
+def _iter_chunks(csv_path: Path, chunk_size: int) -> Iterator[List[Dict[str, str]]]:
+	with csv_path.open(newline="", encoding="utf-8") as f:
+		# keyed by job_id: a statement may not upsert the same row twice
+		chunk: Dict[str, Dict[str, str]] = {}
+		for row in csv.DictReader(f):
+			job_id = (row.get("job_id") or "").strip()
+			if not job_id:
+				continue
+			chunk[job_id] = {
+				"job_id": job_id,
+				"title": row.get("title") or "",
+				"company": row.get("company") or "",
+				"location": row.get("location"),
+				"description": row.get("description") or "",
+				"skills": row.get("skills") or "",
+			}
+			if len(chunk) >= chunk_size:
+				yield list(chunk.values())
+				chunk = {}
+		if chunk:
+			yield list(chunk.values())
+
+
+def seed_jobs_from_csv(
+	csv_path: Path, chunk_size: int = 5000, progress: Optional[Callable[[SeedStats], None]] = None
+) -> SeedStats:
+	"""
+	Stream a jobs CSV into the database in chunks of chunk_size rows.
+
+	Each chunk is one executemany upsert on job_id committed in its own
+	transaction, so re-seeding updates rows in place and a failure keeps the
+	chunks already written.
+	"""
 	init_engine_and_session()
-	with session_scope() as s:
-		with csv_path.open(newline="", encoding="utf-8") as f:
-			reader = csv.DictReader(f)
-			for row in reader:
-				job = Job(
-					job_id=row.get("job_id"),
-					title=row.get("title"),
-					company=row.get("company"),
-					location=row.get("location"),
-					description=row.get("description", ""),
-					skills=row.get("skills", ""),
-				)
-				s.add(job)
+	engine = get_engine()
+	stmt = _upsert_statement(engine.dialect.name)
+	stats = SeedStats(rows=0, chunks=0, seconds=0.0)
+	start = time.perf_counter()
+	for chunk in _iter_chunks(csv_path, chunk_size):
+		with engine.begin() as conn:
+			conn.execute(stmt, chunk)
+		stats.rows += len(chunk)
+		stats.chunks += 1
+		stats.seconds = time.perf_counter() - start
+		if progress is not None:
+			progress(stats)
+	stats.seconds = time.perf_counter() - start
+	return stats
 
 
 if __name__ == "__main__":
 	base = Path(__file__).resolve().parents[1]
 	csv_file = base / "data" / "jobs_sample.csv"
-	seed_jobs_from_csv(csv_file)
-	print("Seeded jobs from", csv_file)
-
-
+	stats = seed_jobs_from_csv(csv_file)
+	print(f"Seeded {stats.rows} jobs from {csv_file} in {stats.seconds:.2f}s ({stats.rows_per_sec:.0f} rows/s)")
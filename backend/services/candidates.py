@@ -0,0 +1,121 @@
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from flask import current_app
+
+from app.ranking import sparse_scores, top_k_indices
+from app.resume_cache import ResumeFeatures
+from app.skills import overlap_scores, skill_id_rows, stack_skill_rows
+
+from ..database import session_scope
+from ..models.user import User
+from .recommender import RecommenderService
+from .user_features import load_user_features
+
+
+class CandidateIndex:
+	"""
+	Candidate resumes vectorised in the job index's TF-IDF and skill space,
+	so "top candidates for a job" is one sparse mat-vec over all candidates.
+
+	The index is rebuilt from the stored user features whenever the job
+	model is refitted. Resume updates are queued and merged on the next query; the
+	replaced rows are masked out until then.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._vectorizer = None
+		self._user_ids = np.zeros(0, dtype=np.int64)
+		self._tfidf: sp.csr_matrix = sp.csr_matrix((0, 0))
+		self._skills: sp.csr_matrix = sp.csr_matrix((0, 0))
+		self._alive = np.zeros(0, dtype=bool)
+		self._rows: Dict[int, int] = {}
+		self._pending: List[Tuple[int, sp.csr_matrix, sp.csr_matrix]] = []
+
+	def _rebuild_locked(self, service: RecommenderService) -> None:
+		with session_scope(read_only=True) as s:
+			user_ids = [
+				uid
+				for (uid,) in s.query(User.id)
+				.filter(User.role == "candidate", User.resume_text.isnot(None))
+				.order_by(User.id)
+			]
+		# stored vectors; ones from an older model version are recomputed here in bulk
+		stored = load_user_features(service, user_ids)
+		user_ids = [u for u in user_ids if u in stored]
+		features = [stored[u][1] for u in user_ids]
+		self._user_ids = np.array(user_ids, dtype=np.int64)
+		self._tfidf = (
+			sp.vstack([f.tfidf for f in features], format="csr")
+			if features
+			else sp.csr_matrix((0, len(service.vectorizer.vocabulary_)))
+		)
+		self._skills = skill_id_rows([f.skill_ids for f in features], len(service.skill_vocab))
+		self._alive = np.ones(len(user_ids), dtype=bool)
+		self._rows = {int(uid): i for i, uid in enumerate(self._user_ids)}
+		self._pending = []
+		self._vectorizer = service.vectorizer
+
+	def _merge_locked(self) -> None:
+		if not self._pending:
+			return
+		pending, self._pending = self._pending, []
+		start = len(self._user_ids)
+		self._user_ids = np.concatenate([self._user_ids, np.array([p[0] for p in pending], dtype=np.int64)])
+		self._tfidf = sp.vstack([self._tfidf] + [p[1] for p in pending], format="csr")
+		self._skills = stack_skill_rows(self._skills, *(p[2] for p in pending))
+		alive = np.concatenate([self._alive, np.ones(len(pending), dtype=bool)])
+		for offset, (user_id, _, _) in enumerate(pending):
+			old = self._rows.get(user_id)
+			if old is not None:
+				alive[old] = False
+			self._rows[user_id] = start + offset
+		self._alive = alive
+
+	def upsert(self, service: RecommenderService, user_id: int, features: ResumeFeatures) -> None:
+		"""
+		Queue a candidate's new resume vector (see services.user_features); cheap enough to call per request.
+		"""
+		if service.job_tfidf is None:
+			return
+		skills = skill_id_rows([features.skill_ids], len(service.skill_vocab))
+		with self._lock:
+			if self._vectorizer is not service.vectorizer:
+				# the next query rebuilds from the users table anyway
+				return
+			old = self._rows.get(user_id)
+			if old is not None:
+				self._alive[old] = False
+			self._pending.append((user_id, features.tfidf, skills))
+
+	def top_candidates(
+		self,
+		service: RecommenderService,
+		job_row: int,
+		top_k: int = 10,
+		weight_tfidf: float = 0.7,
+		weight_skills: float = 0.3,
+	) -> List[Tuple[int, float]]:
+		"""
+		(user id, score) for the best matching candidates for one indexed job row.
+		"""
+		with self._lock:
+			if self._vectorizer is not service.vectorizer:
+				self._rebuild_locked(service)
+			self._merge_locked()
+			user_ids, tfidf, skills, alive = self._user_ids, self._tfidf, self._skills, self._alive.copy()
+		if not alive.any():
+			return []
+		score = weight_tfidf * sparse_scores(service.job_tfidf[job_row], tfidf)
+		if weight_skills:
+			score += weight_skills * overlap_scores(skills, service.job_skills[job_row].indices)
+		score[~alive] = -np.inf
+		idx = top_k_indices(score, min(top_k, int(alive.sum())))
+		return [(int(user_ids[i]), float(score[i])) for i in idx]
+
+
+def get_candidate_index() -> CandidateIndex:
+	return current_app.extensions["candidate_index"]
@@ -0,0 +1,50 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Hashable, Tuple
+
+from flask import current_app
+
+
+JOBS_COUNT_TTL = float(os.getenv("JOBS_COUNT_TTL", "30"))
+
+
+class CountCache:
+	"""
+	Row counts keyed by filter, reused for ttl seconds so paging does not
+	re-count a large table on every request. clear() after writes that
+	should show up immediately.
+	"""
+
+	def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self._lock = threading.Lock()
+		self._counts: Dict[Hashable, Tuple[float, int]] = {}
+
+	def get(self, key: Hashable, compute: Callable[[], int]) -> int:
+		now = time.monotonic()
+		with self._lock:
+			hit = self._counts.get(key)
+		if hit is not None and now - hit[0] < self.ttl:
+			return hit[1]
+		count = compute()
+		with self._lock:
+			self._counts.pop(key, None)
+			if len(self._counts) >= self.max_entries:
+				# oldest first in insertion order
+				self._counts.pop(next(iter(self._counts)))
+			self._counts[key] = (now, count)
+		return count
+
+	def clear(self) -> None:
+		with self._lock:
+			self._counts.clear()
+
+
+def create_job_counts() -> CountCache:
+	return CountCache(ttl=JOBS_COUNT_TTL)
+
+
+def get_job_counts() -> CountCache:
+	return current_app.extensions["job_counts"]
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app.cache import get_result_cache
+from app.metrics import stage
+from app.skills import load_skills_master
+
+from ..database import session_scope
+from ..models.job import Job
+from .recommender import RecommenderService
+
+# columns needed to fit or extend the model and its filter postings; the rest is fetched per result page
+_INDEX_COLUMNS = (Job.id, Job.title, Job.company, Job.location, Job.description, Job.skills)
+
+
+REBUILD_DRIFT = float(os.getenv("INDEX_REBUILD_DRIFT", "0.2"))
+# seconds a sync() trusts the last table check; writes through this process are seen at once
+SYNC_TTL = float(os.getenv("INDEX_SYNC_TTL", "5"))
+INDEX_DIR = os.getenv("INDEX_DIR")
+# backend/services/ -> backend/ -> project root
+SKILLS_PATH = Path(os.getenv("SKILLS_PATH", Path(__file__).resolve().parents[2] / "data" / "skills_master.txt"))
+
+
+class JobIndex:
+	"""
+	Process-wide ranking index over the jobs table.
+
+	Built once in create_app() and shared by every request and thread. New
+	rows are appended incrementally with the fitted vocabulary and IDF; a full
+	refit runs in the background once appended rows exceed rebuild_drift of
+	the fitted ones, or synchronously if rows were deleted.
+
+	Checking the table costs a count over it, so sync() does that at most
+	once per sync_ttl seconds; write paths call mark_stale() to have the
+	next sync() check at once. Writes from other processes show up within
+	sync_ttl.
+	"""
+
+	def __init__(
+		self,
+		skills_master: Optional[List[str]] = None,
+		rebuild_drift: float = REBUILD_DRIFT,
+		sync_ttl: float = SYNC_TTL,
+	):
+		self.skills_master = skills_master if skills_master is not None else load_skills_master(SKILLS_PATH)
+		self.rebuild_drift = rebuild_drift
+		self.sync_ttl = sync_ttl
+		self.version = 0
+		self.built_at: Optional[float] = None
+		self._lock = threading.Lock()
+		self._service: Optional[RecommenderService] = None
+		self._signature: Optional[Tuple[int, int]] = None
+		self._rebuild_thread: Optional[threading.Thread] = None
+		# bumped by mark_stale(); the generation and time of the last table check
+		self._generation = 0
+		self._checked: Tuple[int, float] = (-1, float("-inf"))
+
+	@staticmethod
+	def _table_signature(s) -> Tuple[int, int]:
+		count, max_id = s.execute(select(func.count(Job.id), func.max(Job.id))).one()
+		return int(count or 0), int(max_id or 0)
+
+	def _load(self) -> Tuple[RecommenderService, Tuple[int, int]]:
+		with session_scope(read_only=True) as s:
+			signature = self._table_signature(s)
+			rows = s.execute(select(*_INDEX_COLUMNS).order_by(Job.id).execution_options(yield_per=5000))
+			service = RecommenderService(rows, self.skills_master)
+		return service, signature
+
+	def _swap_locked(self, service: RecommenderService, signature: Tuple[int, int]) -> RecommenderService:
+		if self._service is not None and self._service is not service:
+			get_result_cache().invalidate(self._service.cache_token)
+		self._service = service
+		self._signature = signature
+		self.version += 1
+		self.built_at = time.time()
+		return service
+
+	def load_prebuilt(self, index_dir: Path) -> RecommenderService:
+		"""
+		Start from an index written by `python -m backend.build_index`; rows
+		added to the table since the build are appended by the next sync().
+		"""
+		service = RecommenderService.from_index(index_dir, self.skills_master)
+		signature = (len(service.ids), int(service.ids[-1]) if len(service.ids) else 0)
+		with self._lock:
+			return self._swap_locked(service, signature)
+
+	def rebuild(self) -> RecommenderService:
+		with self._lock:
+			return self._swap_locked(*self._load())
+
+	def _background_rebuild(self) -> None:
+		# fit outside the lock so requests keep being served by the old model;
+		# rows added meanwhile are newer than the snapshot and get appended by sync()
+		try:
+			service, signature = self._load()
+			with self._lock:
+				self._swap_locked(service, signature)
+		finally:
+			self._rebuild_thread = None
+
+	def _sync_locked(self, signature: Tuple[int, int]) -> RecommenderService:
+		service = self._service
+		if service is None or service.job_tfidf is None:
+			return self._swap_locked(*self._load())
+		old_count, old_max = self._signature
+		with session_scope(read_only=True) as s:
+			new_rows = s.execute(select(*_INDEX_COLUMNS).where(Job.id > old_max).order_by(Job.id)).all()
+		if old_count + len(new_rows) != signature[0]:
+			# rows were deleted or rewritten in place; appending cannot express that
+			return self._swap_locked(*self._load())
+		if new_rows:
+			service = service.extended(new_rows)
+		self._swap_locked(service, signature)
+		if service.drift > self.rebuild_drift:
+			self._start_rebuild_locked()
+		return service
+
+	def _start_rebuild_locked(self) -> None:
+		if self._rebuild_thread is None:
+			self._rebuild_thread = threading.Thread(
+				target=self._background_rebuild, name="job-index-rebuild", daemon=True
+			)
+			self._rebuild_thread.start()
+
+	def rebuild_in_background(self) -> None:
+		"""
+		Refit from the table without blocking; for bulk changes to existing rows.
+		"""
+		with self._lock:
+			self._start_rebuild_locked()
+
+	def mark_stale(self) -> None:
+		"""
+		Have the next sync() check the table; call after writing jobs.
+		"""
+		with self._lock:
+			self._generation += 1
+
+	def sync(self) -> RecommenderService:
+		"""
+		Bring the index up to date with the jobs table and return the current service.
+		"""
+		service = self._service
+		generation, checked_at = self._checked
+		now = time.monotonic()
+		if service is not None and generation == self._generation and now - checked_at < self.sync_ttl:
+			return service
+		# read before the check, so a write committed during it marks the index stale again
+		generation = self._generation
+		with session_scope(read_only=True) as s:
+			signature = self._table_signature(s)
+		if service is not None and signature == self._signature:
+			self._checked = (generation, now)
+			return service
+		with stage("index_sync"), self._lock:
+			# another thread may have caught up while we waited for the lock
+			if self._service is None or signature != self._signature:
+				self._sync_locked(signature)
+			self._checked = (generation, now)
+			return self._service
+
+	def stats(self) -> dict:
+		service = self._service
+		return {
+			"version": self.version,
+			"built_at": (
+				datetime.fromtimestamp(self.built_at, tz=timezone.utc).isoformat() if self.built_at else None
+			),
+			"jobs": len(service) if service is not None else 0,
+			"drift": round(service.drift, 4) if service is not None else 0.0,
+			"rebuilding": self._rebuild_thread is not None,
+		}
+
+
+def get_job_index() -> JobIndex:
+	return current_app.extensions["job_index"]
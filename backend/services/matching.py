@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.cache import fingerprint
+from app.metrics import collect_timings, server_timing, stage, timings_ms
+from app.parser import ParserPool
+from app.resume_cache import content_digest
+
+from ..database import session_scope
+from ..models.job import Job
+from .index import JobIndex
+from .recommender import RankedJob
+from .user_features import load_user_features
+
+
+MATCH_WORKERS = int(os.getenv("MATCH_WORKERS", "0")) or None
+MATCH_MAX_PENDING = int(os.getenv("MATCH_MAX_PENDING", "64"))
+
+
+class Saturated(Exception):
+	"""
+	Raised instead of queueing once max_pending distinct computations are in flight.
+	"""
+
+
+class CoalescingExecutor:
+	"""
+	Thread pool that runs at most one computation per key at a time.
+
+	submit() returns the Future of an identical call already in flight, so a
+	burst of the same request costs one computation. Distinct calls in flight
+	(queued or running) are capped at max_pending; past that submit() raises
+	Saturated instead of growing the queue. Futures are concurrent.futures
+	ones: Flask threads block on result(), asyncio code awaits
+	asyncio.wrap_future().
+	"""
+
+	def __init__(self, workers: Optional[int] = None, max_pending: int = 64):
+		# ThreadPoolExecutor's own default
+		self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+		self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="match")
+		self.max_pending = max_pending
+		self._lock = threading.Lock()
+		self._inflight: Dict[Hashable, Future] = {}
+		self.submitted = 0
+		self.coalesced = 0
+		self.rejected = 0
+
+	def submit(self, key: Hashable, fn: Callable, *args) -> Future:
+		with self._lock:
+			future = self._inflight.get(key)
+			if future is not None:
+				self.coalesced += 1
+				return future
+			if len(self._inflight) >= self.max_pending:
+				self.rejected += 1
+				raise Saturated(f"{len(self._inflight)} match requests in flight; retry shortly")
+			future = self._executor.submit(fn, *args)
+			self._inflight[key] = future
+			self.submitted += 1
+		# outside the lock: the callback runs inline if fn already finished
+		future.add_done_callback(lambda f: self._done(key, f))
+		return future
+
+	def _done(self, key: Hashable, future: Future) -> None:
+		with self._lock:
+			if self._inflight.get(key) is future:
+				del self._inflight[key]
+
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				"workers": self.workers,
+				"max_pending": self.max_pending,
+				"in_flight": len(self._inflight),
+				"submitted": self.submitted,
+				"coalesced": self.coalesced,
+				"rejected": self.rejected,
+			}
+
+	def shutdown(self) -> None:
+		self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_match_executor() -> CoalescingExecutor:
+	return CoalescingExecutor(workers=MATCH_WORKERS, max_pending=MATCH_MAX_PENDING)
+
+
+def get_match_executor() -> CoalescingExecutor:
+	return current_app.extensions["match_executor"]
+
+
+def parse_filters(data) -> Optional[dict]:
+	"""
+	{"location", "company", "title", "skills"} filters; multipart forms send them as a JSON string.
+	"""
+	filters = data.get("filters")
+	if isinstance(filters, str):
+		filters = json.loads(filters) if filters.strip() else None
+	if filters is not None and not isinstance(filters, dict):
+		raise ValueError("filters must be an object")
+	return filters
+
+
+def job_rows(ids: Iterable[int]) -> Dict[int, dict]:
+	"""
+	Metadata for ranked jobs in one WHERE id IN (...) query; description is never loaded.
+	"""
+	ids = list(set(ids))
+	if not ids:
+		return {}
+	with session_scope(read_only=True) as s:
+		rows = s.execute(
+			select(Job.id, Job.job_id, Job.title, Job.company, Job.location, Job.skills).where(Job.id.in_(ids))
+		)
+		return {row.id: row._asdict() for row in rows}
+
+
+def ranked_items(ranked: List[RankedJob], rows: Dict[int, dict]) -> List[dict]:
+	# jobs deleted since the index was synced are skipped
+	return [{**rows[r.id], "score": r.score} for r in ranked if r.id in rows]
+
+
+@dataclass(frozen=True)
+class MatchRequest:
+	"""
+	A validated /api/match request; upload is (filename, bytes) of a resume file.
+	timings asks for the per-stage breakdown in the response and is not part of the key.
+	"""
+	resume_text: Optional[str]
+	user_id: Optional[int]
+	weight_tfidf: float
+	weight_skills: float
+	top_k: int
+	filters: Optional[dict]
+	upload: Optional[Tuple[str, bytes]] = None
+	timings: bool = False
+
+	@classmethod
+	def from_data(cls, data, upload: Optional[Tuple[str, bytes]] = None) -> "MatchRequest":
+		"""
+		Fields from a JSON body or form; ValueError on malformed values.
+		"""
+		if not isinstance(data, Mapping):
+			raise ValueError("request body must be a JSON object")
+		resume_text = data.get("resume_text")
+		if resume_text is not None and not isinstance(resume_text, str):
+			raise ValueError("resume_text must be a string")
+		user_id = data.get("user_id")
+		try:
+			user_id = int(user_id) if user_id not in (None, "") else None
+			weight_tfidf = float(data.get("weight_tfidf", 0.7))
+			weight_skills = float(data.get("weight_skills", 0.3))
+			top_k = int(data.get("top_k", 10))
+		except (TypeError, ValueError) as e:
+			# null or a list raises TypeError, not ValueError
+			raise ValueError(f"invalid weight_tfidf, weight_skills, top_k or user_id: {e}") from e
+		return cls(
+			resume_text=resume_text,
+			user_id=user_id,
+			weight_tfidf=weight_tfidf,
+			weight_skills=weight_skills,
+			top_k=top_k,
+			filters=parse_filters(data),
+			upload=upload,
+			timings=str(data.get("timings", "")).lower() in ("1", "true", "yes"),
+		)
+
+	@property
+	def key(self) -> tuple:
+		"""
+		Identical for requests that must produce identical results.
+		"""
+		if self.upload is not None:
+			name, data = self.upload
+			# the suffix picks the parser, so it is part of the identity
+			source = ("file", os.path.splitext(name)[1].lower(), content_digest(data))
+		elif not self.resume_text and self.user_id:
+			source = ("user", self.user_id)
+		else:
+			source = ("text", fingerprint(self.resume_text or ""))
+		filters = json.dumps(self.filters, sort_keys=True) if self.filters else None
+		return source, self.weight_tfidf, self.weight_skills, self.top_k, filters
+
+
+def run_match(job_index: JobIndex, parser_pool: ParserPool, req: MatchRequest) -> Tuple[List[dict], Dict[str, float]]:
+	"""
+	Ranked job items for a request, and the seconds spent per stage (empty
+	unless METRICS is on; coalesced requests share them). Raises ValueError
+	for unparseable files or bad filters and LookupError for an unknown user.
+	Runs on executor threads, so everything it needs is passed in rather than
+	read from the Flask app context.
+	"""
+	with collect_timings() as timings, stage("match"):
+		items = _match_items(job_index, parser_pool, req)
+	return items, timings
+
+
+def match_response(req: MatchRequest, items: List[dict], timings: Dict[str, float]) -> Tuple[dict, Dict[str, str]]:
+	"""
+	Body and headers for a finished match: a Server-Timing header whenever
+	stages were recorded, and a "timings" field (ms) when the request asked.
+	"""
+	body = {"items": items}
+	if req.timings and timings:
+		body["timings"] = timings_ms(timings)
+	return body, ({"Server-Timing": server_timing(timings)} if timings else {})
+
+
+def _match_items(job_index: JobIndex, parser_pool: ParserPool, req: MatchRequest) -> List[dict]:
+	resume_text = req.resume_text
+	if req.upload is not None:
+		# parsed text is cached by content hash, so re-uploads skip extraction
+		resume_text = parser_pool.parse(*req.upload)
+	rec = job_index.sync()
+	if not resume_text and req.user_id:
+		# stored vectors: no text is loaded or processed
+		stored = load_user_features(rec, [req.user_id]).get(req.user_id)
+		if stored is None:
+			raise LookupError("user not found")
+		ranked = rec.rank_features(
+			*stored,
+			weight_tfidf=req.weight_tfidf,
+			weight_skills=req.weight_skills,
+			top_k=req.top_k,
+			filters=req.filters,
+		)
+	else:
+		# scoring runs over index rows only, with no session open
+		ranked = rec.rank(
+			resume_text or "",
+			weight_tfidf=req.weight_tfidf,
+			weight_skills=req.weight_skills,
+			top_k=req.top_k,
+			filters=req.filters,
+		)
+	return ranked_items(ranked, job_rows(r.id for r in ranked))
@@ -1,8 +1,10 @@
 from pathlib import Path
-from typing import Iterable, List, Set
+from typing import TYPE_CHECKING, Iterable, List, Set, Union
 
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
+from app.processing import SkillMatcher, extract_skills
+
+if TYPE_CHECKING:
+	from sklearn.feature_extraction.text import TfidfVectorizer
 
 
 _nlp = None
@@ -11,6 +13,9 @@ _nlp = None
 def load_spacy() -> None:
 	global _nlp
 	if _nlp is None:
+		# spaCy takes about a second to import, so only when a pipeline is wanted
+		import spacy
+
 		try:
 			_nlp = spacy.load("en_core_web_sm")
 		except Exception:
@@ -18,19 +23,15 @@ def load_spacy() -> None:
 			_nlp = spacy.blank("en")
 
 
-def extract_skills_spacy(text: str, skills_phrases: Iterable[str]) -> Set[str]:
-	load_spacy()
-	doc = _nlp(text)
-	lower_text = f" {text.lower()} "
-	found: Set[str] = set()
-	for phrase in skills_phrases:
-		p = phrase.strip().lower()
-		if not p:
-			continue
-		if f" {p} " in lower_text:
-			found.add(phrase)
-	return found
+def extract_skills_spacy(text: str, skills_phrases: Union[SkillMatcher, Iterable[str]]) -> Set[str]:
+	"""
+	Whole-token skill phrase matching through a compiled SkillMatcher.
+	No spaCy pipeline is run; its parse was never used for matching.
+	"""
+	return extract_skills(text, skills_phrases)
+
 
+def build_tfidf(corpus: List[str]) -> "TfidfVectorizer":
+	from sklearn.feature_extraction.text import TfidfVectorizer
 
-def build_tfidf(corpus: List[str]) -> TfidfVectorizer:
 	return TfidfVectorizer(stop_words="english", ngram_range=(1, 2), max_features=50000)
@@ -0,0 +1,27 @@
+import os
+
+from flask import current_app
+
+from app.parser import ParserPool
+from app.resume_cache import get_resume_cache
+
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0")) or None
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "30"))
+PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "20")) or None
+PARSE_MAX_MB = float(os.getenv("PARSE_MAX_MB", "10"))
+
+
+def create_parser_pool() -> ParserPool:
+	# worker processes are spawned on the first parse, not at startup
+	return ParserPool(
+		workers=PARSE_WORKERS,
+		timeout=PARSE_TIMEOUT,
+		max_pages=PARSE_MAX_PAGES,
+		max_bytes=int(PARSE_MAX_MB * (1 << 20)),
+		cache=get_resume_cache(),
+	)
+
+
+def get_parser_pool() -> ParserPool:
+	return current_app.extensions["parser_pool"]
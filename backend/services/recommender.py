@@ -1,47 +1,345 @@
+import itertools
+import uuid
 from dataclasses import dataclass
-from typing import List, Sequence, Set
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
 import numpy as np
-from rapidfuzz.fuzz import ratio as fuzz_ratio
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
+
+from app.cache import ScoreVectors, fingerprint, get_result_cache
+from app.facets import FacetIndex, FilterValue
+from app.index_store import load_index, save_index
+from app.metrics import stage
+from app.neighbors import NeighborTable
+from app.processing import SkillMatcher, normalize_text
+from app.ranking import subset_top_k
+from app.resume_cache import ResumeFeatures, cached_features, get_resume_cache, model_version
+from app.shards import get_scorer
+from app.skills import SkillVocabulary, skill_id_rows, stack_skill_rows
 
-from ..models.job import Job
 from .nlp import build_tfidf, extract_skills_spacy
 
 
+def split_skills(skills: Optional[str]) -> List[str]:
+	return [t.strip() for t in (skills or "").split(";") if t.strip()]
+
+
 @dataclass
 class RankedJob:
-	job: Job
+	id: int
 	score: float
 
 
 class RecommenderService:
-	def __init__(self, jobs: Sequence[Job], skills_master: List[str]):
-		self.jobs = list(jobs)
+	"""
+	Ranking model over job rows identified only by Job.id.
+
+	jobs is any iterable of rows with id, title, company, location,
+	description and skills attributes (Job objects or select() rows) in
+	ascending id order. It is consumed once and not retained, so no job text
+	or ORM state outlives construction; title, company and location only
+	survive as filter postings.
+
+	Instances are never mutated after construction, so each one gets its own
+	token in the shared result cache.
+	"""
+
+	def __init__(self, jobs: Iterable, skills_master: List[str]):
+		self.cache_token = uuid.uuid4().hex
 		self.skills_master = skills_master
-		self.corpus = [j.description or "" for j in self.jobs]
-		self.vectorizer = build_tfidf(self.corpus)
-		self.job_tfidf = self.vectorizer.fit_transform(self.corpus)
-
-	def _skills_overlap(self, resume_skills: Set[str], job_skills: List[str]) -> float:
-		if not resume_skills or not job_skills:
-			return 0.0
-		matched = 0
-		for rs in resume_skills:
-			for js in job_skills:
-				if fuzz_ratio(rs.lower(), js.lower()) >= 85:
-					matched += 1
-					break
-		denom = len(resume_skills.union(set(job_skills)))
-		return matched / max(1, denom)
-
-	def rank(self, resume_text: str, weight_tfidf: float = 0.7, weight_skills: float = 0.3, top_k: int = 10) -> List[RankedJob]:
-		resume_vec = self.vectorizer.transform([resume_text])
-		tfidf_sim = cosine_similarity(resume_vec, self.job_tfidf).ravel()
-		resume_skills = extract_skills_spacy(resume_text, self.skills_master)
-		skill_scores = np.array([
-			self._skills_overlap(resume_skills, (j.skills or "").split(";")) for j in self.jobs
-		])
-		score = weight_tfidf * tfidf_sim + weight_skills * skill_scores
-		order = np.argsort(-score)[:top_k]
-		return [RankedJob(self.jobs[i], float(score[i])) for i in order]
+		self.skill_matcher = SkillMatcher(skills_master)
+		self.skill_vocab = SkillVocabulary(skills_master)
+		ids: List[int] = []
+		skills: List[List[str]] = []
+		facets: List[tuple] = []
+
+		def corpus() -> Iterator[str]:
+			for j in jobs:
+				ids.append(j.id)
+				skills.append(split_skills(j.skills))
+				facets.append((j.location, j.company, j.title))
+				yield j.description or ""
+
+		documents = corpus()
+		first = next(documents, None)
+		self.vectorizer = build_tfidf([])
+		with stage("fit"):
+			self.job_tfidf = self.vectorizer.fit_transform(itertools.chain([first], documents)) if first is not None else None
+		# Job.id per row; rows are kept in ascending id order
+		self.ids = np.array(ids, dtype=np.int64)
+		self.n_fitted = len(self.ids)
+		self.job_skills = self.skill_vocab.matrix(skills)
+		self.facets = FacetIndex.build(*self._facet_columns(facets), self.job_skills)
+		self.model_version = model_version(self.vectorizer, skills_master) if first is not None else None
+		# similar-jobs lists stored with a prebuilt index, covering its first len(neighbors) rows
+		self.neighbors: Optional[NeighborTable] = None
+
+	@classmethod
+	def from_index(cls, index_dir: Path, skills_master: List[str]) -> "RecommenderService":
+		"""
+		Open an index written by save_index(); matrices stay memory-mapped.
+		"""
+		stored = load_index(index_dir)
+		if stored.ids is None:
+			raise ValueError(f"{stored.path} has no job ids; build it with `python -m backend.build_index`")
+		service = object.__new__(cls)
+		service.cache_token = uuid.uuid4().hex
+		service.ids = np.asarray(stored.ids)
+		service.skills_master = skills_master
+		service.skill_matcher = SkillMatcher(skills_master)
+		service.vectorizer = stored.vectorizer
+		service.job_tfidf = stored.job_tfidf
+		service.n_fitted = len(service.ids)
+		service.skill_vocab = stored.skill_vocab
+		service.job_skills = stored.job_skills
+		if stored.facets is None:
+			raise ValueError(f"{stored.path} has no filter postings; rebuild it with `python -m backend.build_index`")
+		service.facets = stored.facets
+		service.neighbors = stored.neighbors
+		service.model_version = model_version(service.vectorizer, skills_master)
+		return service
+
+	@staticmethod
+	def _facet_columns(rows: Sequence[tuple]):
+		# (location, company, title) tuples -> three columns for FacetIndex
+		return tuple(zip(*rows)) if rows else ((), (), ())
+
+	def save_index(self, out_dir: Path, neighbors: Optional[NeighborTable] = None) -> Path:
+		if self.job_tfidf is None:
+			raise ValueError("cannot save an empty index")
+		# job metadata lives in the database and is fetched per result page
+		return save_index(
+			out_dir,
+			self.vectorizer,
+			self.job_tfidf,
+			self.skill_vocab,
+			self.job_skills,
+			{},
+			ids=self.ids,
+			facets=self.facets,
+			neighbors=neighbors,
+		)
+
+	def __len__(self) -> int:
+		return len(self.ids)
+
+	@property
+	def drift(self) -> float:
+		"""
+		Appended jobs as a fraction of the jobs the vocabulary and IDF were fitted on.
+		"""
+		return (len(self.ids) - self.n_fitted) / max(1, self.n_fitted)
+
+	def extended(self, jobs: Sequence) -> "RecommenderService":
+		"""
+		Return a new service with jobs appended, reusing the fitted vocabulary
+		and IDF weights. The receiver is left untouched so in-flight requests
+		keep a consistent view.
+		"""
+		if self.job_tfidf is None:
+			raise ValueError("cannot extend an empty index; rebuild instead")
+		jobs = list(jobs)
+		new_tfidf = self.vectorizer.transform([j.description or "" for j in jobs])
+		service = object.__new__(RecommenderService)
+		service.cache_token = uuid.uuid4().hex
+		service.ids = np.concatenate([self.ids, np.array([j.id for j in jobs], dtype=np.int64)])
+		service.skills_master = self.skills_master
+		service.skill_matcher = self.skill_matcher
+		service.vectorizer = self.vectorizer
+		service.model_version = self.model_version
+		service.job_tfidf = sp.vstack([self.job_tfidf, new_tfidf], format="csr")
+		service.n_fitted = self.n_fitted
+		# the vocabulary is append-only, so sharing it with the previous service is safe
+		service.skill_vocab = self.skill_vocab
+		service.job_skills = stack_skill_rows(self.job_skills, self.skill_vocab.matrix(split_skills(j.skills) for j in jobs))
+		service.facets = self.facets.extended(
+			*self._facet_columns([(j.location, j.company, j.title) for j in jobs]), service.job_skills
+		)
+		# still valid for the leading rows; services.similar extends them over the appended ones
+		service.neighbors = self.neighbors
+		return service
+
+	def row_for_id(self, job_pk: int) -> Optional[int]:
+		row = int(np.searchsorted(self.ids, job_pk))
+		return row if row < len(self.ids) and self.ids[row] == job_pk else None
+
+	def resume_features(self, resume_texts: Sequence[str]) -> List[ResumeFeatures]:
+		"""
+		TF-IDF rows and skill ids per raw resume, through the on-disk resume cache.
+		"""
+		def compute(texts: List[str]) -> List[ResumeFeatures]:
+			with stage("tfidf_transform"):
+				texts_norm = [normalize_text(t) for t in texts]
+				vecs = self.vectorizer.transform(texts_norm)
+			with stage("skill_extract"):
+				skill_ids = [self.skill_vocab.encode(extract_skills_spacy(t, self.skill_matcher)) for t in texts_norm]
+			return [ResumeFeatures(vecs[i], skill_ids[i]) for i in range(len(texts_norm))]
+
+		with stage("features"):
+			return cached_features(get_resume_cache(), self.model_version, resume_texts, compute)
+
+	def _vectors(self, features: ResumeFeatures) -> ScoreVectors:
+		tfidf, skills = get_scorer().score_vectors(features.tfidf, self.job_tfidf, features.skill_ids, self.job_skills)
+		return ScoreVectors(tfidf=tfidf, skills=skills, resume_skill_ids=features.skill_ids)
+
+	def score_vectors(self, resume_text: str) -> ScoreVectors:
+		"""
+		Raw per-job TF-IDF and skill scores, shared through the process-wide result cache.
+		"""
+		cache = get_result_cache()
+		# features only see the normalised text, so texts normalising alike share an entry
+		key = fingerprint(normalize_text(resume_text))
+		cached = cache.get(self.cache_token, key)
+		if cached is not None:
+			return cached
+		vectors = self._vectors(self.resume_features([resume_text])[0])
+		cache.put(self.cache_token, key, vectors)
+		return vectors
+
+	def score_features(self, digest: str, features: ResumeFeatures) -> ScoreVectors:
+		"""
+		score_vectors() for precomputed features; digest is the fingerprint of their normalised resume text.
+		"""
+		cache = get_result_cache()
+		cached = cache.get(self.cache_token, digest)
+		if cached is not None:
+			return cached
+		vectors = self._vectors(features)
+		cache.put(self.cache_token, digest, vectors)
+		return vectors
+
+	def _top(self, vectors: ScoreVectors, weight_tfidf: float, weight_skills: float, top_k: int) -> List[RankedJob]:
+		order, scores = get_scorer().top_k(
+			vectors.tfidf, vectors.skills, top_k, weight_tfidf=weight_tfidf, weight_skills=weight_skills
+		)
+		return [RankedJob(int(self.ids[i]), float(score)) for i, score in zip(order, scores)]
+
+	def filter_rows(self, filters: Optional[Dict[str, FilterValue]]) -> Optional[np.ndarray]:
+		"""
+		Index rows passing filters (see app.facets), or None when unfiltered; ValueError on unknown facets.
+		"""
+		with stage("filter"):
+			return self.facets.rows(filters, self.skill_vocab)
+
+	def _top_rows(
+		self, rows: np.ndarray, features: ResumeFeatures, weight_tfidf: float, weight_skills: float, top_k: int
+	) -> List[RankedJob]:
+		with stage("subset_score"):
+			order, scores = subset_top_k(
+				rows,
+				features.tfidf,
+				self.job_tfidf,
+				features.skill_ids,
+				self.job_skills,
+				top_k,
+				weight_tfidf=weight_tfidf,
+				weight_skills=weight_skills,
+			)
+		return [RankedJob(int(self.ids[i]), float(score)) for i, score in zip(order, scores)]
+
+	def rank(
+		self,
+		resume_text: str,
+		weight_tfidf: float = 0.7,
+		weight_skills: float = 0.3,
+		top_k: int = 10,
+		filters: Optional[Dict[str, FilterValue]] = None,
+	) -> List[RankedJob]:
+		"""
+		Top jobs for a resume; with filters only the matching rows are scored.
+		"""
+		if self.job_tfidf is None:
+			return []
+		rows = self.filter_rows(filters)
+		if rows is not None:
+			return self._top_rows(rows, self.resume_features([resume_text])[0], weight_tfidf, weight_skills, top_k)
+		return self._top(self.score_vectors(resume_text), weight_tfidf, weight_skills, top_k)
+
+	def rank_features(
+		self,
+		digest: str,
+		features: ResumeFeatures,
+		weight_tfidf: float = 0.7,
+		weight_skills: float = 0.3,
+		top_k: int = 10,
+		filters: Optional[Dict[str, FilterValue]] = None,
+	) -> List[RankedJob]:
+		"""
+		rank() for a resume already vectorised against this model (see services.user_features).
+		"""
+		if self.job_tfidf is None:
+			return []
+		rows = self.filter_rows(filters)
+		if rows is not None:
+			return self._top_rows(rows, features, weight_tfidf, weight_skills, top_k)
+		return self._top(self.score_features(digest, features), weight_tfidf, weight_skills, top_k)
+
+	def rank_many(
+		self,
+		resume_texts: Sequence[str],
+		weight_tfidf: float = 0.7,
+		weight_skills: float = 0.3,
+		top_k: int = 10,
+		filters: Optional[Dict[str, FilterValue]] = None,
+	) -> Iterator[List[RankedJob]]:
+		"""
+		rank() for many resumes, yielding one result list per resume in input order.
+		"""
+		if self.job_tfidf is None or not resume_texts:
+			return iter([[] for _ in resume_texts])
+		return self.rank_many_features(
+			self.resume_features(resume_texts),
+			weight_tfidf=weight_tfidf,
+			weight_skills=weight_skills,
+			top_k=top_k,
+			filters=filters,
+		)
+
+	def rank_many_features(
+		self,
+		features: Sequence[ResumeFeatures],
+		weight_tfidf: float = 0.7,
+		weight_skills: float = 0.3,
+		top_k: int = 10,
+		filters: Optional[Dict[str, FilterValue]] = None,
+	) -> Iterator[List[RankedJob]]:
+		"""
+		rank_many() for resumes already vectorised against this model.
+		Filters are resolved before this returns, so a bad filter raises here
+		rather than halfway through a streamed response.
+		"""
+		if self.job_tfidf is None or not features:
+			return iter([[] for _ in features])
+		rows = self.filter_rows(filters)
+		return self._ranked_many(features, rows, weight_tfidf, weight_skills, top_k)
+
+	def _ranked_many(
+		self,
+		features: Sequence[ResumeFeatures],
+		rows: Optional[np.ndarray],
+		weight_tfidf: float,
+		weight_skills: float,
+		top_k: int,
+	) -> Iterator[List[RankedJob]]:
+		if rows is not None and not len(rows):
+			for _ in features:
+				yield []
+			return
+		job_tfidf = self.job_tfidf if rows is None else self.job_tfidf[rows]
+		job_skills = self.job_skills if rows is None else self.job_skills[rows]
+		resume_vecs = sp.vstack([f.tfidf for f in features], format="csr")
+		resume_skills = skill_id_rows([f.skill_ids for f in features], len(self.skill_vocab))
+		ranked = get_scorer().top_k_many(
+			resume_vecs,
+			job_tfidf,
+			resume_skills,
+			job_skills,
+			top_k,
+			weight_tfidf=weight_tfidf,
+			weight_skills=weight_skills,
+		)
+		for order, scores in ranked:
+			if rows is not None:
+				order = rows[order]
+			yield [RankedJob(int(self.ids[i]), float(score)) for i, score in zip(order, scores)]
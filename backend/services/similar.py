@@ -0,0 +1,127 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+
+from flask import current_app
+
+from app.neighbors import DEFAULT_NEIGHBORS, NeighborTable
+
+from .recommender import RecommenderService
+
+
+SIMILAR_JOBS_N = int(os.getenv("SIMILAR_JOBS_N", str(DEFAULT_NEIGHBORS)))
+# building all pairs is quadratic in the catalog; by default only prebuilt lists are served and extended
+SIMILAR_JOBS_BUILD = os.getenv("SIMILAR_JOBS_BUILD", "0").lower() in ("1", "true", "yes")
+
+
+class SimilarJobs:
+	"""
+	Precomputed similar-jobs lists (app.neighbors) following the JobIndex.
+
+	Lists come from a prebuilt index (`python -m backend.build_index
+	--neighbors N`) and are extended on a background thread, never on a
+	request, by scoring only the rows appended to the index. Computing them
+	from scratch, at startup without prebuilt lists and after every refit,
+	only happens with build set (SIMILAR_JOBS_BUILD=1). Until they catch
+	up, lookups are answered from the previous lists through the job ids
+	those were built for, so a lookup is always a row slice; jobs newer
+	than every list get None.
+	"""
+
+	def __init__(self, n_neighbors: int = SIMILAR_JOBS_N, build: bool = SIMILAR_JOBS_BUILD):
+		self.n_neighbors = n_neighbors
+		self.build = build
+		self._lock = threading.Lock()
+		# the service the lists belong to, and the newest one asked for
+		self._service: Optional[RecommenderService] = None
+		self._table: Optional[NeighborTable] = None
+		self._wanted: Optional[RecommenderService] = None
+		self._thread: Optional[threading.Thread] = None
+
+	@property
+	def enabled(self) -> bool:
+		return self.n_neighbors > 0
+
+	@property
+	def computing(self) -> bool:
+		return self._thread is not None
+
+	@staticmethod
+	def _extendable(
+		base: Optional[RecommenderService], table: Optional[NeighborTable], service: RecommenderService
+	) -> Optional[NeighborTable]:
+		if base is None or base.vectorizer is not service.vectorizer or len(base) > len(service):
+			# refitted since: only prebuilt lists the service came with still apply
+			table = service.neighbors
+		return table if table is not None and len(table) <= len(service) else None
+
+	def _lists_for(
+		self, base: Optional[RecommenderService], table: Optional[NeighborTable], service: RecommenderService
+	) -> NeighborTable:
+		table = self._extendable(base, table, service)
+		if table is None:
+			return NeighborTable.build(service.job_tfidf, self.n_neighbors)
+		return table.extended(service.job_tfidf)
+
+	def _run(self) -> None:
+		try:
+			while True:
+				with self._lock:
+					service, base, table = self._wanted, self._service, self._table
+					# checked and cleared under one lock, so a refresh() racing with the exit is not lost
+					if service is base:
+						self._thread = None
+						return
+				table = self._lists_for(base, table, service)
+				with self._lock:
+					self._service, self._table = service, table
+		except BaseException:
+			# the next refresh() starts over
+			with self._lock:
+				self._thread = None
+			raise
+
+	def refresh(self, service: RecommenderService) -> None:
+		"""
+		Bring the lists up to date with service in the background; cheap when they already are.
+		"""
+		if not self.enabled or service.job_tfidf is None:
+			return
+		with self._lock:
+			if not self.build and self._extendable(self._service, self._table, service) is None:
+				# nothing to extend and building from scratch is off; keep serving the old lists
+				return
+			self._wanted = service
+			if self._service is service or self._thread is not None:
+				return
+			self._thread = threading.Thread(target=self._run, name="similar-jobs", daemon=True)
+			self._thread.start()
+
+	def similar(self, service: RecommenderService, job_pk: int, top_k: int = 10) -> Optional[List[Tuple[int, float]]]:
+		"""
+		(Job.id, score) of the jobs most similar to job_pk, or None while no list covers it yet.
+		"""
+		self.refresh(service)
+		with self._lock:
+			base, table = self._service, self._table
+		if table is None:
+			return None
+		row = base.row_for_id(job_pk)
+		if row is None:
+			return None
+		rows, scores = table.neighbors(row, top_k)
+		return [(int(base.ids[r]), float(s)) for r, s in zip(rows, scores)]
+
+	def stats(self) -> dict:
+		with self._lock:
+			table, current = self._table, self._service is self._wanted
+		return {
+			"neighbors": table.n_neighbors if table is not None else self.n_neighbors,
+			"jobs": len(table) if table is not None else 0,
+			"up_to_date": current and table is not None,
+			"computing": self.computing,
+		}
+
+
+def get_similar_jobs() -> SimilarJobs:
+	return current_app.extensions["similar_jobs"]
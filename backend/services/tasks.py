@@ -0,0 +1,83 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app
+
+
+@dataclass
+class Task:
+	id: str
+	name: str
+	status: str = "queued"  # queued -> running -> done | failed
+	created_at: float = field(default_factory=time.time)
+	started_at: Optional[float] = None
+	finished_at: Optional[float] = None
+	progress: Dict[str, Any] = field(default_factory=dict)
+	result: Any = None
+	error: Optional[str] = None
+
+	def to_dict(self) -> dict:
+		return {
+			"id": self.id,
+			"name": self.name,
+			"status": self.status,
+			"created_at": self.created_at,
+			"started_at": self.started_at,
+			"finished_at": self.finished_at,
+			"progress": self.progress,
+			"result": self.result,
+			"error": self.error,
+		}
+
+
+class TaskRegistry:
+	"""
+	In-process background jobs for work too slow for a request thread.
+	Finished tasks are kept (up to max_finished) so clients can poll for status.
+	"""
+
+	def __init__(self, max_workers: int = 2, max_finished: int = 100):
+		self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task")
+		self._lock = threading.Lock()
+		self._tasks: Dict[str, Task] = {}
+		self.max_finished = max_finished
+
+	def submit(self, name: str, fn: Callable[[Task], Any]) -> Task:
+		"""
+		Run fn(task) in the background; fn may update task.progress as it goes.
+		"""
+		task = Task(id=uuid.uuid4().hex, name=name)
+		with self._lock:
+			self._tasks[task.id] = task
+			self._prune_locked()
+		self._executor.submit(self._run, task, fn)
+		return task
+
+	@staticmethod
+	def _run(task: Task, fn: Callable[[Task], Any]) -> None:
+		task.status = "running"
+		task.started_at = time.time()
+		try:
+			task.result = fn(task)
+			task.status = "done"
+		except Exception as e:
+			task.error = f"{type(e).__name__}: {e}"
+			task.status = "failed"
+		finally:
+			task.finished_at = time.time()
+
+	def get(self, task_id: str) -> Optional[Task]:
+		return self._tasks.get(task_id)
+
+	def _prune_locked(self) -> None:
+		finished = [t for t in self._tasks.values() if t.finished_at is not None]
+		for t in sorted(finished, key=lambda t: t.finished_at)[:-self.max_finished or None]:
+			del self._tasks[t.id]
+
+
+def get_tasks() -> TaskRegistry:
+	return current_app.extensions["tasks"]
@@ -0,0 +1,94 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import select
+
+from app.cache import fingerprint
+from app.processing import normalize_text
+from app.resume_cache import ResumeFeatures
+
+from ..database import session_scope
+from ..models.user import User
+from ..models.user_features import UserFeatures
+from .recommender import RecommenderService
+
+# (normalised resume text fingerprint, features) per user
+StoredFeatures = Tuple[str, ResumeFeatures]
+
+_CHUNK = 500
+
+
+def _empty_features() -> ResumeFeatures:
+	return ResumeFeatures(sp.csr_matrix((1, 0), dtype=np.float32), np.zeros(0, dtype=np.int32))
+
+
+def _row(service: RecommenderService, user_id: int, digest: str, features: ResumeFeatures) -> UserFeatures:
+	indices, data, skill_ids = features.to_blobs()
+	return UserFeatures(
+		user_id=user_id,
+		model_version=service.model_version,
+		digest=digest,
+		n_features=features.tfidf.shape[1],
+		tfidf_indices=indices,
+		tfidf_data=data,
+		skill_ids=skill_ids,
+	)
+
+
+def _compute(service: RecommenderService, texts: Dict[int, str]) -> Dict[int, StoredFeatures]:
+	user_ids = list(texts)
+	if service.model_version is None:
+		# nothing to score against yet; there is no vocabulary to vectorise with
+		return {u: (fingerprint(normalize_text(texts[u])), _empty_features()) for u in user_ids}
+	features = service.resume_features([texts[u] for u in user_ids])
+	computed = {u: (fingerprint(normalize_text(texts[u])), f) for u, f in zip(user_ids, features)}
+	with session_scope() as s:
+		for u, (digest, f) in computed.items():
+			s.merge(_row(service, u, digest, f))
+	return computed
+
+
+def store_user_features(service: RecommenderService, user_id: int, resume_text: Optional[str]) -> StoredFeatures:
+	"""
+	Vectorise a user's resume against the current index and persist it, so
+	matching by user id never re-reads or re-processes the text.
+	"""
+	return _compute(service, {user_id: resume_text or ""})[user_id]
+
+
+def load_user_features(service: RecommenderService, user_ids: Iterable[int]) -> Dict[int, StoredFeatures]:
+	"""
+	Stored features for existing users, keyed by user id (unknown ids are left out).
+
+	Rows written under another model version, or never written, are
+	recomputed from users.resume_text in one batch and stored again; after a
+	refit the first match per user pays for it, later ones are pure scoring.
+	"""
+	ids = list(dict.fromkeys(int(u) for u in user_ids))
+	found: Dict[int, StoredFeatures] = {}
+	texts: Dict[int, str] = {}
+	with session_scope(read_only=True) as s:
+		for start in range(0, len(ids), _CHUNK):
+			chunk = ids[start:start + _CHUNK]
+			if service.model_version is not None:
+				rows = s.execute(
+					select(UserFeatures).where(
+						UserFeatures.user_id.in_(chunk), UserFeatures.model_version == service.model_version
+					)
+				).scalars()
+				for r in rows:
+					found[r.user_id] = (
+						r.digest,
+						ResumeFeatures.from_blobs(r.n_features, r.tfidf_indices, r.tfidf_data, r.skill_ids),
+					)
+			stale = [u for u in chunk if u not in found]
+			if stale:
+				texts.update(
+					(row.id, row.resume_text or "")
+					for row in s.execute(select(User.id, User.resume_text).where(User.id.in_(stale)))
+				)
+	if texts:
+		found.update(_compute(service, texts))
+	return found
+
@@ -0,0 +1,60 @@
+"""
+Two-stage IVF retrieval vs exact ranking: recall@k and latency per nprobe.
+
+    python -m benchmarks.bench_ann --jobs 1000000 --nprobe 1 4 8 16 32
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.ann import IVFIndex, ann_top_k
+from app.ranking import hybrid_top_k
+
+from .synth import idf_weights, random_skill_matrix, topic_tfidf_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default sqrt(jobs))")
+    parser.add_argument("--components", type=int, default=64)
+    args = parser.parse_args()
+
+    job_tfidf = topic_tfidf_matrix(args.jobs, seed=1)
+    job_skills = random_skill_matrix(args.jobs, seed=1)
+    queries = topic_tfidf_matrix(args.queries, nnz_per_row=150, seed=2, idf=idf_weights(job_tfidf))
+    rng = np.random.default_rng(3)
+    skill_queries = [np.unique(rng.integers(0, 500, size=8)).astype(np.int32) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    ann = IVFIndex.build(job_tfidf, n_components=args.components, n_lists=args.lists)
+    print(f"jobs={args.jobs} lists={ann.n_lists} build={time.perf_counter() - start:.1f}s")
+
+    exact, exact_ms = [], []
+    for q, r in zip(queries, skill_queries):
+        start = time.perf_counter()
+        idx, _ = hybrid_top_k(q, job_tfidf, r, job_skills, args.top_k)
+        exact_ms.append((time.perf_counter() - start) * 1000.0)
+        exact.append(set(idx.tolist()))
+    print(f"{'mode':>10} {'recall@k':>9} {'cands':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    print(f"{'exact':>10} {1.0:>9.3f} {args.jobs:>9} {np.percentile(exact_ms, 50):>9.2f} {np.percentile(exact_ms, 99):>9.2f}")
+
+    for nprobe in args.nprobe:
+        recalls, lat, cands = [], [], []
+        for q, r, truth in zip(queries, skill_queries, exact):
+            start = time.perf_counter()
+            idx, _ = ann_top_k(ann, q, job_tfidf, r, job_skills, args.top_k, nprobe=nprobe)
+            lat.append((time.perf_counter() - start) * 1000.0)
+            recalls.append(len(truth & set(idx.tolist())) / max(1, len(truth)))
+            cands.append(len(ann.candidates(q, nprobe=nprobe, min_candidates=args.top_k)))
+        name = f"nprobe={nprobe}"
+        print(f"{name:>10} {np.mean(recalls):>9.3f} {int(np.mean(cands)):>9} "
+              f"{np.percentile(lat, 50):>9.2f} {np.percentile(lat, 99):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Batch ranking throughput: one hybrid_top_k call per resume vs hybrid_top_k_many.
+
+    python -m benchmarks.bench_batch --jobs 100000 --resumes 500
+"""
+import argparse
+import time
+
+from app.ranking import hybrid_top_k, hybrid_top_k_many
+
+from .synth import random_skill_matrix, random_tfidf_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    job_tfidf = random_tfidf_matrix(args.jobs)
+    job_skills = random_skill_matrix(args.jobs)
+    resumes = random_tfidf_matrix(args.resumes, nnz_per_row=150, seed=1)
+    resume_skills = random_skill_matrix(args.resumes, skills_per_row=8, seed=1)
+
+    start = time.perf_counter()
+    for i in range(args.resumes):
+        hybrid_top_k(resumes[i], job_tfidf, resume_skills[i].indices, job_skills, args.top_k)
+    single = args.resumes / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in hybrid_top_k_many(resumes, job_tfidf, resume_skills, job_skills, args.top_k):
+        pass
+    batch = args.resumes / (time.perf_counter() - start)
+
+    print(f"jobs={args.jobs} resumes={args.resumes}")
+    print(f"  per-resume: {single:10.1f} resumes/s")
+    print(f"  batched:    {batch:10.1f} resumes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Filtered ranking: facet postings + subset scoring vs scoring every job.
+
+    python -m benchmarks.bench_filters --jobs 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.facets import FacetIndex
+from app.ranking import hybrid_top_k, subset_top_k
+from app.skills import SkillVocabulary
+
+from .synth import random_skill_matrix, random_tfidf_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--companies", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    job_tfidf = random_tfidf_matrix(args.jobs, seed=1)
+    job_skills = random_skill_matrix(args.jobs, seed=1)
+    vocab = SkillVocabulary(f"skill {i}" for i in range(job_skills.shape[1]))
+    # Zipf-ish city sizes, like real postings
+    locations = [f"city {i}" for i in (rng.zipf(1.5, size=args.jobs) % args.locations)]
+    companies = [f"company {i}" for i in rng.integers(0, args.companies, size=args.jobs)]
+    titles = [f"{a} {b}" for a, b in zip(rng.choice(["senior", "junior", "lead", "staff"], size=args.jobs),
+                                          rng.choice(["data engineer", "analyst", "developer", "scientist"], size=args.jobs))]
+    start = time.perf_counter()
+    facets = FacetIndex.build(locations, companies, titles, job_skills)
+    print(f"jobs={args.jobs} facet build={time.perf_counter() - start:.1f}s")
+
+    queries = random_tfidf_matrix(args.queries, nnz_per_row=150, seed=2)
+    skill_queries = [np.unique(rng.integers(0, 500, size=8)).astype(np.int32) for _ in range(args.queries)]
+    cases = {
+        "none": None,
+        "big city": {"location": "city 1"},
+        "small city": {"location": f"city {args.locations - 1}"},
+        "city+title": {"location": "city 1", "title": "senior engineer"},
+        "company": {"company": "company 7"},
+        "skills": {"skills": ["skill 3", "skill 4"]},
+    }
+    print(f"{'filter':>12} {'rows':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, filters in cases.items():
+        lat, n_rows = [], args.jobs
+        for q, r in zip(queries, skill_queries):
+            start = time.perf_counter()
+            rows = facets.rows(filters, vocab)
+            if rows is None:
+                hybrid_top_k(q, job_tfidf, r, job_skills, args.top_k)
+            else:
+                n_rows = len(rows)
+                subset_top_k(rows, q, job_tfidf, r, job_skills, args.top_k)
+            lat.append((time.perf_counter() - start) * 1000.0)
+        print(f"{name:>12} {n_rows:>9} {np.percentile(lat, 50):>9.2f} {np.percentile(lat, 99):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Job metadata memory: the JobTable columns vs the DataFrame JobRecommender used to keep.
+
+    python -m benchmarks.bench_job_table --jobs 200000
+
+All layouts are built from the same synthetic CSV (benchmarks.catalog).
+Sizes are the Python and NumPy allocations tracemalloc sees while each one
+is built and still alive, scaled to 1M jobs. "JobTable" is the default
+(descriptions read from the CSV on demand), "JobTable+text" keeps them in
+memory as well.
+"""
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.job_table import JobTable
+from app.processing import normalize_text
+from app.skills import load_skills_master
+
+from .catalog import write_jobs_csv
+
+SKILLS_PATH = Path(__file__).resolve().parents[1] / "data" / "skills_master.txt"
+
+
+def dataframe_layout(path: Path):
+    """
+    jobs_df as JobRecommender built it before JobTable: raw columns plus description_norm and skills_list.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    df["description_norm"] = df["description"].fillna("").astype(str).map(normalize_text)
+    df["skills_list"] = df["skills"].fillna("").astype(str).map(lambda s: [t.strip() for t in s.split(";") if t.strip()])
+    return df
+
+
+def measure(build, path: Path):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build(path)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current, peak, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # pandas itself is imported before measuring, so its module state is not counted
+    import pandas  # noqa: F401
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_jobs_csv(Path(tmp) / "jobs.csv", args.jobs, load_skills_master(SKILLS_PATH))
+        scale = 1_000_000 / args.jobs / (1 << 20)
+        print(f"jobs={args.jobs} csv={path.stat().st_size / (1 << 20):.0f} MB")
+        print(f"{'layout':>14} {'MB / 1M jobs':>13} {'peak MB / 1M':>13} {'build s':>8}")
+        sizes = {}
+        layouts = (
+            ("DataFrame", dataframe_layout),
+            ("JobTable+text", lambda p: JobTable.from_csv(p, descriptions_in_memory=True)),
+            ("JobTable", JobTable.from_csv),
+        )
+        for name, build in layouts:
+            current, peak, seconds = measure(build, path)
+            sizes[name] = current
+            print(f"{name:>14} {current * scale:>13.0f} {peak * scale:>13.0f} {seconds:>8.1f}")
+        for name in ("JobTable+text", "JobTable"):
+            print(f"{name} is {sizes['DataFrame'] / sizes[name]:.1f}x smaller than the DataFrame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Similar-jobs lists: full build time per worker count, incremental appends and lookups.
+
+    python -m benchmarks.bench_neighbors --jobs 100000 --workers 1 2 4 8 --append 100
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.neighbors import DEFAULT_NEIGHBORS, NeighborTable
+from app.ranking import top_k_indices
+
+from .synth import random_tfidf_matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--neighbors", type=int, default=DEFAULT_NEIGHBORS)
+    parser.add_argument("--append", type=int, default=100, help="rows appended for the incremental update")
+    parser.add_argument("--check", type=int, default=20, help="rows checked against brute-force scoring")
+    args = parser.parse_args()
+
+    job_tfidf = random_tfidf_matrix(args.jobs + args.append, seed=1)
+    base = job_tfidf[:args.jobs]
+    print(f"jobs={args.jobs} neighbors={args.neighbors} cpus={os.cpu_count()}")
+    print(f"{'workers':>8} {'build s':>9} {'jobs/s':>9} {'speedup':>8}")
+    first = None
+    table = None
+    for workers in sorted(set(args.workers)):
+        start = time.perf_counter()
+        table = NeighborTable.build(base, args.neighbors, workers=workers)
+        seconds = time.perf_counter() - start
+        first = first or seconds
+        print(f"{workers:>8} {seconds:>9.1f} {args.jobs / seconds:>9.0f} {first / seconds:>7.2f}x")
+
+    rng = np.random.default_rng(0)
+    for row in rng.integers(0, args.jobs, size=args.check):
+        scores = sp.csr_matrix(base @ base[int(row)].T).toarray().ravel()
+        scores[row] = -np.inf
+        expected = scores[top_k_indices(scores, args.neighbors)]
+        _, got = table.neighbors(int(row))
+        assert np.allclose(got, expected[:len(got)], atol=1e-5), f"row {row} differs from brute force"
+
+    start = time.perf_counter()
+    extended = table.extended(job_tfidf)
+    seconds = time.perf_counter() - start
+    print(f"append {args.append} jobs: {seconds * 1000:.0f} ms ({seconds / max(args.append, 1) * 1000:.2f} ms/job)")
+
+    rows = rng.integers(0, len(extended), size=10_000)
+    start = time.perf_counter()
+    for row in rows:
+        extended.neighbors(int(row))
+    print(f"lookup: {(time.perf_counter() - start) / len(rows) * 1e6:.1f} us")
+    print(f"lists: {extended.nbytes / len(extended) * 1_000_000 / (1 << 20):.0f} MB / 1M jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Ranking kernel latency: cosine_similarity + full argsort vs sparse mat-vec + argpartition.
+
+    python -m benchmarks.bench_ranking --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.ranking import hybrid_top_k
+from app.skills import overlap_scores
+
+from .synth import random_skill_matrix, random_tfidf_matrix
+
+
+def _baseline(resume_vec, job_tfidf, resume_ids, job_skills, top_k):
+    score = 0.7 * cosine_similarity(resume_vec, job_tfidf).ravel()
+    score += 0.3 * overlap_scores(job_skills, resume_ids)
+    order = np.argsort(-score)[:top_k]
+    return order, score[order]
+
+
+def _kernel(resume_vec, job_tfidf, resume_ids, job_skills, top_k):
+    return hybrid_top_k(resume_vec, job_tfidf, resume_ids, job_skills, top_k)
+
+
+def _latencies(fn, queries, job_tfidf, skill_queries, job_skills, top_k):
+    out = []
+    for q, r in zip(queries, skill_queries):
+        start = time.perf_counter()
+        fn(q, job_tfidf, r, job_skills, top_k)
+        out.append((time.perf_counter() - start) * 1000.0)
+    return np.array(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    queries = random_tfidf_matrix(args.queries, nnz_per_row=150, seed=1)
+    skill_queries = [np.unique(rng.integers(0, 500, size=8)).astype(np.int32) for _ in range(args.queries)]
+
+    print(f"{'jobs':>10} {'kernel':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for n in args.sizes:
+        job_tfidf = random_tfidf_matrix(n)
+        job_skills = random_skill_matrix(n)
+        query_rows = [queries[i] for i in range(args.queries)]
+        for name, fn in (("baseline", _baseline), ("argpart", _kernel)):
+            lat = _latencies(fn, query_rows, job_tfidf, skill_queries, job_skills, args.top_k)
+            print(f"{n:>10} {name:>10} {np.percentile(lat, 50):>9.2f} {np.percentile(lat, 99):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Sharded scoring: latency and speedup from 1 to N worker threads.
+
+    python -m benchmarks.bench_shards --jobs 1000000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.ranking import hybrid_top_k
+from app.shards import ShardedScorer
+from app.skills import skill_id_rows
+
+from .synth import random_skill_matrix, random_tfidf_matrix
+
+
+def _single(scorer, q, job_tfidf, r, job_skills, top_k):
+    tfidf, skills = scorer.score_vectors(q, job_tfidf, r, job_skills)
+    return scorer.top_k(tfidf, skills, top_k)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, os.cpu_count() or 1])
+    parser.add_argument("--shards-per-worker", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    job_tfidf = random_tfidf_matrix(args.jobs, seed=1)
+    job_skills = random_skill_matrix(args.jobs, seed=1)
+    queries = random_tfidf_matrix(max(args.queries, args.batch), nnz_per_row=150, seed=2)
+    skill_queries = [np.unique(rng.integers(0, 500, size=8)).astype(np.int32) for _ in range(queries.shape[0])]
+    batch_skills = skill_id_rows(skill_queries[:args.batch], job_skills.shape[1])
+
+    # sharded results must match the single-core kernel
+    expected, _ = hybrid_top_k(queries[0], job_tfidf, skill_queries[0], job_skills, args.top_k)
+    print(f"jobs={args.jobs} cpus={os.cpu_count()}")
+    print(f"{'workers':>8} {'shards':>7} {'p50 ms':>9} {'p99 ms':>9} {'speedup':>8} {'batch/s':>9}")
+    base = None
+    for workers in sorted(set(args.workers)):
+        scorer = ShardedScorer(shards=workers * args.shards_per_worker, workers=workers)
+        got, _ = _single(scorer, queries[0], job_tfidf, skill_queries[0], job_skills, args.top_k)
+        assert np.array_equal(np.sort(got), np.sort(expected)), "sharded top-k differs from exact"
+        lat = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            _single(scorer, queries[i], job_tfidf, skill_queries[i], job_skills, args.top_k)
+            lat.append((time.perf_counter() - start) * 1000.0)
+        start = time.perf_counter()
+        for _ in scorer.top_k_many(queries[:args.batch], job_tfidf, batch_skills, job_skills, args.top_k):
+            pass
+        per_sec = args.batch / (time.perf_counter() - start)
+        p50 = np.percentile(lat, 50)
+        base = base or p50
+        n_shards = len(scorer.bounds(args.jobs))
+        print(f"{workers:>8} {n_shards:>7} {p50:>9.2f} {np.percentile(lat, 99):>9.2f} {base / p50:>7.2f}x {per_sec:>9.1f}")
+        scorer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold-start cost: import time of app.recommender and backend, and backend.create_app(), each in a fresh interpreter.
+
+    python -m benchmarks.bench_startup --runs 5 --budget-import 1.0 --budget-create-app 3.0
+
+Exits non-zero when a median exceeds its budget, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# libraries that must not load until they are needed
+HEAVY_MODULES = ("sklearn", "spacy", "nltk", "pandas", "rapidfuzz", "pdfminer", "docx")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+SCENARIOS = {
+    "import app.recommender": "import app.recommender",
+    "import backend": "import backend",
+    "backend.create_app()": "from backend import create_app\ncreate_app()",
+}
+
+
+def _run(body: str, env: dict) -> dict:
+    code = _PROBE.format(body=body, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-import", type=float, default=1.0, help="seconds, per import scenario")
+    parser.add_argument("--budget-create-app", type=float, default=3.0, help="seconds, empty database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # an empty database and no resume cache: measures startup, not index fitting;
+        # create_app() still imports sklearn for the (empty) vectorizer
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(tmp) / 'startup.db'}",
+            "RESUME_CACHE_PATH": "",
+            "NLP_OFFLINE": "1",
+        }
+        print(f"{'scenario':>24} {'p50 s':>8} {'max s':>8} {'budget':>7}  heavy modules loaded")
+        failed = False
+        for name, body in SCENARIOS.items():
+            results = [_run(body, env) for _ in range(args.runs)]
+            seconds = np.array([r["seconds"] for r in results])
+            budget = args.budget_create_app if "create_app" in name else args.budget_import
+            p50 = float(np.median(seconds))
+            failed |= p50 > budget
+            heavy = sorted({m for r in results for m in r["heavy"]})
+            flag = "" if p50 <= budget else "  OVER BUDGET"
+            print(f"{name:>24} {p50:>8.3f} {seconds.max():>8.3f} {budget:>7.1f}  {', '.join(heavy) or '-'}{flag}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Synthetic job catalogs and resumes in the repo's own formats: a jobs CSV
+shaped like data/jobs_sample.csv, resume texts, and TXT/DOCX/PDF resume files.
+
+Skills come from the skills master with Zipf popularity, so a few skills
+appear in most postings and the long tail in few, as in real catalogs.
+Locations and companies are Zipf-sized, and free text is drawn from a
+pseudo-word vocabulary with a Zipf frequency, which gives TfidfVectorizer
+a realistically long tail. Everything is seeded, so the same arguments
+always produce the same files.
+"""
+import csv
+import io
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+SENIORITY = ["Junior", "Senior", "Lead", "Staff", "Principal", "Associate"]
+ROLES = [
+    "Data Scientist", "Machine Learning Engineer", "Data Analyst", "Data Engineer", "Backend Developer",
+    "MLOps Engineer", "NLP Engineer", "BI Developer", "Cloud Engineer", "Software Engineer",
+]
+CITIES = [
+    "Bengaluru", "Hyderabad", "Pune", "Chennai", "Mumbai", "Delhi", "Gurugram", "Noida", "Kolkata", "Remote",
+]
+_SYLLABLES = ["ka", "ri", "to", "mel", "an", "su", "vor", "de", "li", "pra", "qu", "zen", "bo", "tas", "ne", "gor"]
+
+JOB_FIELDS = ["job_id", "title", "company", "location", "description", "skills"]
+
+
+def _vocabulary(size: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    words = np.array(sorted({"".join(rng.choice(_SYLLABLES, size=rng.integers(2, 5))) for _ in range(size * 2)}))
+    # shuffled, so Zipf rank is unrelated to spelling
+    return words[rng.permutation(len(words))][:size]
+
+
+class TextSampler:
+    """
+    Seeded draws of skills, places, companies and filler words.
+    """
+
+    def __init__(self, skills: Sequence[str], seed: int = 0, n_companies: int = 5000, n_words: int = 5000):
+        self.rng = np.random.default_rng(seed)
+        # skill popularity follows the (fixed, seed-independent) shuffled master order
+        self.skills = np.array(skills)[np.random.default_rng(0).permutation(len(skills))]
+        self.skill_cdf = self._zipf_cdf(len(self.skills), 1.1)
+        self.words = _vocabulary(n_words, seed=0)
+        self.word_cdf = self._zipf_cdf(len(self.words), 1.05)
+        self.companies = np.array([f"{w.title()} {s}" for w, s in zip(
+            _vocabulary(n_companies, seed=1), np.resize(["Analytics", "Labs", "Tech", "Systems", "AI"], n_companies)
+        )])
+        self.company_cdf = self._zipf_cdf(len(self.companies), 1.0)
+        extra = [f"{c} {i}" for i in range(2, 20) for c in CITIES[:-1]]
+        self.cities = np.array(CITIES + extra)
+        self.city_cdf = self._zipf_cdf(len(self.cities), 1.3)
+
+    @staticmethod
+    def _zipf_cdf(n: int, a: float) -> np.ndarray:
+        cdf = np.cumsum(1.0 / np.arange(1, n + 1) ** a)
+        return cdf / cdf[-1]
+
+    def _draw(self, cdf: np.ndarray, n: int) -> np.ndarray:
+        # inverse-CDF sampling; rng.choice(p=...) rebuilds the CDF on every call
+        return np.minimum(np.searchsorted(cdf, self.rng.random(n)), len(cdf) - 1)
+
+    def skill_set(self, low: int, high: int) -> List[str]:
+        k = min(len(self.skills), int(self.rng.integers(low, high + 1)))
+        picked = dict.fromkeys(self._draw(self.skill_cdf, 4 * k).tolist())
+        while len(picked) < k:
+            picked.update(dict.fromkeys(self._draw(self.skill_cdf, k).tolist()))
+        return [str(self.skills[i]) for i in list(picked)[:k]]
+
+    def filler(self, n: int) -> List[str]:
+        return self.words[self._draw(self.word_cdf, n)].tolist()
+
+    def title(self) -> str:
+        return f"{self.rng.choice(SENIORITY)} {self.rng.choice(ROLES)}"
+
+    def company(self) -> str:
+        return str(self.companies[self._draw(self.company_cdf, 1)[0]])
+
+    def city(self) -> str:
+        return str(self.cities[self._draw(self.city_cdf, 1)[0]])
+
+    def prose(self, skills: Sequence[str], n_words: int) -> str:
+        words = self.filler(n_words)
+        # skills are mentioned in the running text, as in real postings and resumes
+        for skill in skills:
+            words.insert(int(self.rng.integers(0, len(words) + 1)), skill)
+        sentences = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, len(words), 12)]
+        return " ".join(sentences)
+
+
+def job_rows(n_jobs: int, skills: Sequence[str], seed: int = 0) -> Iterator[Dict[str, str]]:
+    sampler = TextSampler(skills, seed)
+    for i in range(n_jobs):
+        job_skills = sampler.skill_set(3, 8)
+        title = sampler.title()
+        yield {
+            "job_id": f"S{i:08d}",
+            "title": title,
+            "company": sampler.company(),
+            "location": sampler.city(),
+            "description": f"We are hiring a {title}. " + sampler.prose(job_skills, int(sampler.rng.integers(30, 90))),
+            "skills": ";".join(job_skills),
+        }
+
+
+def write_jobs_csv(path: Path, n_jobs: int, skills: Sequence[str], seed: int = 0) -> Path:
+    """
+    Stream n_jobs synthetic postings to a CSV with the jobs_sample.csv header.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=JOB_FIELDS)
+        writer.writeheader()
+        for row in job_rows(n_jobs, skills, seed):
+            writer.writerow(row)
+    return path
+
+
+def resume_texts(n_resumes: int, skills: Sequence[str], seed: int = 1) -> List[str]:
+    sampler = TextSampler(skills, seed)
+    texts = []
+    for _ in range(n_resumes):
+        own = sampler.skill_set(4, 12)
+        texts.append(
+            f"{sampler.title()} based in {sampler.city()}. Skills: {', '.join(own)}.\n"
+            + sampler.prose(own, int(sampler.rng.integers(120, 400)))
+        )
+    return texts
+
+
+def minimal_pdf(text: str) -> bytes:
+    """
+    A one-font PDF with the text as one line per 90 characters; enough for pdfminer.
+    """
+    lines = [text[i:i + 90] for i in range(0, len(text), 90)] or [""]
+    escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+    stream = "BT /F1 9 Tf 11 TL 36 806 Td " + " ".join(f"({line}) '" for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out.write("".join(f"{o:010d} 00000 n \n" for o in offsets).encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def resume_files(texts: Sequence[str], kinds: Sequence[str] = ("txt", "docx", "pdf")) -> List[tuple]:
+    """
+    (name, bytes) resume uploads cycling through kinds, as ParserPool.parse_many() takes them.
+    """
+    files = []
+    for i, text in enumerate(texts):
+        kind = kinds[i % len(kinds)]
+        if kind == "txt":
+            data = text.encode("utf-8")
+        elif kind == "docx":
+            from docx import Document
+
+            doc = Document()
+            for paragraph in text.split("\n"):
+                doc.add_paragraph(paragraph)
+            buf = io.BytesIO()
+            doc.save(buf)
+            data = buf.getvalue()
+        elif kind == "pdf":
+            data = minimal_pdf(text.replace("\n", " "))
+        else:
+            raise ValueError(f"Unsupported resume kind: {kind}")
+        files.append((f"resume_{i:05d}.{kind}", data))
+    return files
@@ -0,0 +1,372 @@
+"""
+End-to-end benchmark suite over a synthetic catalog, with JSON results and a regression compare.
+
+    python -m benchmarks.suite run --jobs 100000 --resumes 200 --out bench.json
+    python -m benchmarks.suite compare base.json bench.json --threshold 0.10
+
+Scenarios (--scenarios, default all):
+  recommend  JobRecommender build from the CSV, recommend() unfiltered and filtered
+  rank       RecommenderService build from rows, rank() unfiltered and filtered
+  seed       seed_jobs_from_csv() into an empty SQLite database
+  parse      ParserPool.parse_many() over TXT/DOCX/PDF resumes
+  api        Flask test client: POST /api/match and a GET /api/jobs cursor walk
+
+Each scenario runs in a fresh interpreter against its own SQLite file, with
+the resume cache disabled, so peak RSS and timings are its own. Every
+measurement reports throughput and p50/p95/p99 latency; compare exits 1
+when any of them, or a scenario's peak RSS, is worse by more than the
+threshold. Generated catalogs are kept in --data-dir and reused.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SKILLS_PATH = ROOT / "data" / "skills_master.txt"
+FILTER = {"location": "Bengaluru"}
+# metric -> True when higher is better
+METRICS = {"throughput": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+
+def summarize(latencies: List[float], wall: float, units: Optional[float] = None, unit: str = "ops/s") -> dict:
+    """
+    Throughput (units, default one per latency sample, per wall second) and latency percentiles in ms.
+    """
+    ms = np.array(latencies, dtype=np.float64) * 1000.0
+    units = len(ms) if units is None else units
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (float("nan"),) * 3
+    return {
+        "ops": len(ms),
+        "seconds": round(wall, 4),
+        "throughput": round(units / wall, 2) if wall > 0 else None,
+        "unit": unit,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+def timed(fn: Callable, items: Iterable, warmup: Iterable = (), unit: str = "queries/s") -> dict:
+    """
+    Latency of fn per item; warmup items run first, untimed.
+    """
+    for item in warmup:
+        fn(item)
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - start, unit=unit)
+
+
+def once(fn: Callable, units: float, unit: str):
+    """
+    Run fn once; returns (its result, a summary with units per second).
+    """
+    start = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - start
+    return result, summarize([wall], wall, units=units, unit=unit)
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _resumes(ctx: dict) -> Tuple[List[str], List[str]]:
+    """
+    (warmup, timed) resume texts; distinct, so warmup never turns timed queries into cache hits.
+    """
+    from app.skills import load_skills_master
+
+    from .catalog import resume_texts
+
+    texts = resume_texts(ctx["warmup"] + ctx["resumes"], load_skills_master(SKILLS_PATH), seed=ctx["seed"] + 1)
+    return texts[:ctx["warmup"]], texts[ctx["warmup"]:]
+
+
+def scenario_recommend(ctx: dict) -> Dict[str, dict]:
+    from app.recommender import JobRecommender
+
+    warm, texts = _resumes(ctx)
+    rec, build = once(lambda: JobRecommender(Path(ctx["jobs_csv"]), SKILLS_PATH), ctx["jobs"], "jobs/s")
+    # job metadata held per 1M jobs (app.job_table)
+    build["job_table_mb_per_1m"] = round(rec.jobs.nbytes / max(1, len(rec.jobs)) * 1_000_000 / (1 << 20), 1)
+    top_k = ctx["top_k"]
+    return {
+        "build": build,
+        "query": timed(lambda t: rec.recommend(t, top_k=top_k), texts, warm),
+        "query_filtered": timed(lambda t: rec.recommend(t, top_k=top_k, filters=FILTER), texts, warm),
+    }
+
+
+def _job_rows(jobs_csv: Path) -> Iterable:
+    import csv
+    from types import SimpleNamespace
+
+    with open(jobs_csv, newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f), start=1):
+            yield SimpleNamespace(id=i, **row)
+
+
+def scenario_rank(ctx: dict) -> Dict[str, dict]:
+    from app.skills import load_skills_master
+    from backend.services.recommender import RecommenderService
+
+    warm, texts = _resumes(ctx)
+    skills = load_skills_master(SKILLS_PATH)
+    service, build = once(lambda: RecommenderService(_job_rows(Path(ctx["jobs_csv"])), skills), ctx["jobs"], "jobs/s")
+    top_k = ctx["top_k"]
+    return {
+        "build": build,
+        "query": timed(lambda t: service.rank(t, top_k=top_k), texts, warm),
+        "query_filtered": timed(lambda t: service.rank(t, top_k=top_k, filters=FILTER), texts, warm),
+    }
+
+
+def scenario_seed(ctx: dict) -> Dict[str, dict]:
+    from backend.seed import seed_jobs_from_csv
+
+    chunk_seconds: List[float] = []
+    last = [0.0]
+
+    def progress(stats) -> None:
+        chunk_seconds.append(stats.seconds - last[0])
+        last[0] = stats.seconds
+
+    stats = seed_jobs_from_csv(Path(ctx["jobs_csv"]), chunk_size=ctx["chunk_size"], progress=progress)
+    # latencies are per chunk upsert, throughput is rows
+    return {"upsert": summarize(chunk_seconds, stats.seconds, units=stats.rows, unit="rows/s")}
+
+
+def scenario_parse(ctx: dict) -> Dict[str, dict]:
+    from app.parser import ParserPool
+
+    from .catalog import resume_files
+
+    warm, texts = _resumes(ctx)
+    pool = ParserPool(workers=ctx["parse_workers"])
+    try:
+        # the first documents start the worker processes
+        list(pool.parse_many(resume_files(warm)))
+        files = resume_files(texts)
+        start = time.perf_counter()
+        results = list(pool.parse_many(files))
+        wall = time.perf_counter() - start
+    finally:
+        pool.close()
+    parsed = summarize([r.seconds for r in results if r.ok], wall, units=len(results), unit="docs/s")
+    parsed["errors"] = sum(1 for r in results if not r.ok)
+    return {"parse": parsed}
+
+
+def scenario_api(ctx: dict) -> Dict[str, dict]:
+    from backend import create_app
+    from backend.seed import seed_jobs_from_csv
+
+    warm, texts = _resumes(ctx)
+    seed_jobs_from_csv(Path(ctx["jobs_csv"]), chunk_size=ctx["chunk_size"])
+    app, startup = once(create_app, ctx["jobs"], "jobs/s")
+    client = app.test_client()
+    top_k = ctx["top_k"]
+
+    def match(text: str, filters: Optional[dict] = None) -> None:
+        r = client.post("/api/match/", json={"resume_text": text, "top_k": top_k, "filters": filters})
+        assert r.status_code == 200, r.get_data(as_text=True)
+
+    cursor = [None]
+
+    def page(_) -> None:
+        query = "limit=20&fields=id,title,company,location" + (f"&cursor={cursor[0]}" if cursor[0] else "")
+        r = client.get(f"/api/jobs/?{query}")
+        assert r.status_code == 200, r.get_data(as_text=True)
+        cursor[0] = r.get_json()["next_cursor"]
+
+    return {
+        "create_app": startup,
+        "match": timed(match, texts, warm, unit="requests/s"),
+        "match_filtered": timed(lambda t: match(t, FILTER), texts, warm, unit="requests/s"),
+        "jobs_page": timed(page, range(ctx["pages"]), unit="requests/s"),
+    }
+
+
+SCENARIOS = {
+    "recommend": scenario_recommend,
+    "rank": scenario_rank,
+    "seed": scenario_seed,
+    "parse": scenario_parse,
+    "api": scenario_api,
+}
+
+
+def _run_scenario(name: str, ctx: dict) -> dict:
+    workdir = Path(ctx["workdir"])
+    db = workdir / f"{name}.db"
+    for path in (db, db.with_name(db.name + "-wal"), db.with_name(db.name + "-shm")):
+        path.unlink(missing_ok=True)
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db}", "RESUME_CACHE_PATH": ""}
+    env.pop("INDEX_DIR", None)
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "scenario", name, json.dumps(ctx)],
+        capture_output=True, text=True, env=env, cwd=ROOT,
+    )
+    if out.returncode:
+        raise RuntimeError(f"scenario {name} failed:\n{out.stderr[-4000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(args: argparse.Namespace) -> None:
+    from app.skills import load_skills_master
+
+    from .catalog import write_jobs_csv
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    jobs_csv = data_dir / f"jobs_{args.jobs}_{args.seed}.csv"
+    if not jobs_csv.exists():
+        start = time.perf_counter()
+        tmp = jobs_csv.with_suffix(".tmp")
+        write_jobs_csv(tmp, args.jobs, load_skills_master(SKILLS_PATH), seed=args.seed)
+        tmp.replace(jobs_csv)
+        print(f"generated {jobs_csv} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    ctx = {
+        "jobs_csv": str(jobs_csv),
+        "workdir": str(data_dir),
+        "jobs": args.jobs,
+        "resumes": args.resumes,
+        "seed": args.seed,
+        "top_k": args.top_k,
+        "warmup": args.warmup,
+        "chunk_size": args.chunk_size,
+        "parse_workers": args.parse_workers,
+        "pages": args.pages,
+    }
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": {k: v for k, v in ctx.items() if k not in ("jobs_csv", "workdir")},
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        print(f"running {name} ...", file=sys.stderr)
+        results["scenarios"][name] = scenario = _run_scenario(name, ctx)
+        for measure, m in scenario["measures"].items():
+            print(
+                f"{name:>10} {measure:<15} {m['throughput'] or 0:>12.1f} {m['unit']:<11}"
+                f" p50 {m['p50_ms']:>9.2f} p95 {m['p95_ms']:>9.2f} p99 {m['p99_ms']:>9.2f} ms",
+                file=sys.stderr,
+            )
+        print(f"{name:>10} peak RSS {scenario['peak_rss_mb']} MB", file=sys.stderr)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+def compare(args: argparse.Namespace) -> None:
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    rows = []
+    for name, scenario in new["scenarios"].items():
+        old = base["scenarios"].get(name)
+        if old is None:
+            continue
+        for measure, m in scenario["measures"].items():
+            for metric, higher_is_better in METRICS.items():
+                if m.get("ops") == 1 and metric in ("p95_ms", "p99_ms"):
+                    # one-off builds: every percentile is the same sample
+                    continue
+                before = old["measures"].get(measure, {}).get(metric)
+                rows.append((f"{name}/{measure}", metric, before, m.get(metric), higher_is_better))
+        rows.append((name, "peak_rss_mb", old.get("peak_rss_mb"), scenario.get("peak_rss_mb"), False))
+
+    print(f"base {base['meta'].get('commit')} ({base['meta']['created']}) -> new {new['meta'].get('commit')} ({new['meta']['created']})")
+    if base["meta"].get("args") != new["meta"].get("args"):
+        print(f"warning: runs used different arguments: {base['meta'].get('args')} vs {new['meta'].get('args')}")
+    print(f"{'measure':<28} {'metric':<12} {'base':>11} {'new':>11} {'change':>8}")
+    regressions = 0
+    for measure, metric, before, after, higher_is_better in rows:
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "  improved"
+        print(f"{measure:<28} {metric:<12} {before:>11.2f} {after:>11.2f} {change:>+8.1%}{flag}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("run", help="generate data if needed, run scenarios, write JSON")
+    p.add_argument("--jobs", type=int, default=10_000, help="catalog rows, e.g. 10000 to 5000000")
+    p.add_argument("--resumes", type=int, default=100, help="queries (and parsed documents) per measurement")
+    p.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--top-k", type=int, default=10)
+    p.add_argument("--warmup", type=int, default=3, help="untimed queries first (lazy imports, worker start-up)")
+    p.add_argument("--chunk-size", type=int, default=5000)
+    p.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--pages", type=int, default=50, help="GET /api/jobs pages walked")
+    p.add_argument("--data-dir", default=str(ROOT / ".bench"))
+    p.add_argument("--out", help="JSON results path (default stdout)")
+
+    p = commands.add_parser("compare", help="diff two result files; exit 1 on regressions")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+
+    p = commands.add_parser("scenario", help="run one scenario in this process and print its JSON (used by run)")
+    p.add_argument("name", choices=list(SCENARIOS))
+    p.add_argument("ctx")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    elif args.command == "compare":
+        compare(args)
+    else:
+        measures = SCENARIOS[args.name](json.loads(args.ctx))
+        print(json.dumps({"measures": measures, "peak_rss_mb": peak_rss_mb()}))
+
+
+if __name__ == "__main__":
+    main()
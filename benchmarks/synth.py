@@ -0,0 +1,73 @@
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+def random_tfidf_matrix(n_rows: int, n_features: int = 50000, nnz_per_row: int = 80, seed: int = 0) -> sp.csr_matrix:
+    """
+    L2-normalised CSR matrix shaped like TfidfVectorizer output, with a
+    Zipf-ish term distribution so a few columns are dense.
+    """
+    rng = np.random.default_rng(seed)
+    indptr = np.arange(0, (n_rows + 1) * nnz_per_row, nnz_per_row, dtype=np.int64)
+    indices = (rng.zipf(1.3, size=n_rows * nnz_per_row) % n_features).astype(np.int32)
+    data = rng.random(n_rows * nnz_per_row, dtype=np.float32) + 0.05
+    matrix = sp.csr_matrix((data, indices, indptr), shape=(n_rows, n_features))
+    matrix.sum_duplicates()
+    return normalize(matrix, norm="l2", copy=False)
+
+
+def random_skill_matrix(n_rows: int, n_skills: int = 500, skills_per_row: int = 6, seed: int = 0) -> sp.csr_matrix:
+    """
+    Binary jobs x skills matrix with unique sorted ids per row.
+    """
+    rng = np.random.default_rng(seed)
+    indptr = np.arange(0, (n_rows + 1) * skills_per_row, skills_per_row, dtype=np.int64)
+    indices = rng.integers(0, n_skills, size=n_rows * skills_per_row, dtype=np.int32)
+    matrix = sp.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(n_rows, n_skills))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix
+
+
+def idf_weights(matrix: sp.csr_matrix) -> np.ndarray:
+    """
+    Smoothed IDF per column, as TfidfVectorizer computes it.
+    """
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    return np.log((1 + matrix.shape[0]) / (1 + df)) + 1.0
+
+
+def topic_tfidf_matrix(
+    n_rows: int,
+    n_features: int = 50000,
+    n_topics: int = 200,
+    nnz_per_row: int = 80,
+    topic_share: float = 0.7,
+    seed: int = 0,
+    topic_seed: int = 0,
+    idf: Optional[np.ndarray] = None,
+) -> sp.csr_matrix:
+    """
+    Like random_tfidf_matrix, but each row draws topic_share of its terms from
+    one of n_topics term pools, so rows cluster the way job families do, and
+    terms are IDF-weighted so the Zipf-common ones do not dominate cosine.
+    Matrices built with the same topic_seed share topics; pass the jobs'
+    idf_weights() when generating resumes against them.
+    """
+    topics = np.random.default_rng(topic_seed).integers(0, n_features, size=(n_topics, 400), dtype=np.int32)
+    rng = np.random.default_rng(seed)
+    n_topic_terms = int(nnz_per_row * topic_share)
+    row_topic = rng.integers(0, n_topics, size=n_rows)
+    topic_terms = topics[row_topic[:, None], rng.integers(0, topics.shape[1], size=(n_rows, n_topic_terms))]
+    noise = rng.zipf(1.3, size=(n_rows, nnz_per_row - n_topic_terms)) % n_features
+    indices = np.concatenate([topic_terms, noise.astype(np.int32)], axis=1).ravel()
+    indptr = np.arange(0, (n_rows + 1) * nnz_per_row, nnz_per_row, dtype=np.int64)
+    data = rng.random(n_rows * nnz_per_row, dtype=np.float32) + 0.05
+    matrix = sp.csr_matrix((data, indices, indptr), shape=(n_rows, n_features))
+    matrix.sum_duplicates()
+    weights = idf_weights(matrix) if idf is None else idf
+    matrix.data *= weights[matrix.indices].astype(np.float32)
+    return normalize(matrix, norm="l2", copy=False)
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# make the app and backend packages importable however pytest is started
+_project_root = Path(__file__).resolve().parents[1]
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
@@ -0,0 +1,62 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from app.neighbors import NeighborTable
+
+
+def _brute_force(matrix: sp.csr_matrix) -> np.ndarray:
+    scores = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(scores, -np.inf)
+    return scores
+
+
+def _random_matrix(n_rows: int, seed: int = 0) -> sp.csr_matrix:
+    rng = np.random.default_rng(seed)
+    dense = rng.random((n_rows, 40)) * (rng.random((n_rows, 40)) < 0.2)
+    return normalize(sp.csr_matrix(dense), norm="l2")
+
+
+def test_build_matches_brute_force():
+    matrix = _random_matrix(60)
+    table = NeighborTable.build(matrix, 5, workers=3, block_cells=200)
+    scores = _brute_force(matrix)
+    for row in range(60):
+        got_rows, got_scores = table.neighbors(row)
+        expected = np.sort(scores[row][scores[row] > 0])[::-1][:5]
+        np.testing.assert_allclose(got_scores, expected, rtol=1e-5)
+        assert row not in got_rows
+
+
+def test_pads_rows_without_positive_neighbours():
+    matrix = sp.csr_matrix(np.array([[1.0, 0.0], [0.0, 1.0], [0.6, 0.8]]))
+    table = NeighborTable.build(matrix, 3)
+    rows, scores = table.neighbors(0)
+    assert rows.tolist() == [2]
+    np.testing.assert_allclose(scores, [0.6])
+    assert table.rows[0].tolist() == [2, -1, -1]
+
+
+def test_extended_equals_rebuild():
+    matrix = _random_matrix(80, seed=1)
+    full = NeighborTable.build(matrix, 4, workers=2)
+    grown = NeighborTable.build(matrix[:50], 4, workers=2).extended(matrix[:65]).extended(matrix)
+    np.testing.assert_allclose(grown.scores, full.scores)
+    np.testing.assert_array_equal(grown.rows, full.rows)
+
+
+def test_extended_with_job_that_beats_no_existing_neighbour():
+    matrix = sp.csr_matrix(np.array([[1.0, 0.0, 0.0], [0.6, 0.8, 0.0], [0.0, 1.0, 0.0]]))
+    table = NeighborTable.build(matrix, 2)
+    grown = table.extended(sp.vstack([matrix, sp.csr_matrix([[0.0, 0.0, 1.0]])], format="csr"))
+    np.testing.assert_array_equal(grown.rows[:3], table.rows)
+    assert grown.neighbors(3)[0].tolist() == []
+
+
+def test_extended_leaves_receiver_untouched():
+    matrix = _random_matrix(30, seed=2)
+    table = NeighborTable.build(matrix[:20], 3)
+    before = table.rows.copy()
+    table.extended(matrix)
+    np.testing.assert_array_equal(table.rows, before)
+    assert len(table) == 20
@@ -0,0 +1,91 @@
+import numpy as np
+
+from app import cache as cache_module
+from app.cache import ResultCache, ScoreVectors
+
+
+def _vectors(n_jobs: int = 4) -> ScoreVectors:
+    return ScoreVectors(
+        tfidf=np.zeros(n_jobs, dtype=np.float64),
+        skills=np.zeros(n_jobs, dtype=np.float64),
+        resume_skill_ids=np.zeros(0, dtype=np.int32),
+    )
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_and_miss_are_counted():
+    cache = ResultCache()
+    value = _vectors()
+    assert cache.get("v1", "a") is None
+    cache.put("v1", "a", value)
+    assert cache.get("v1", "a") is value
+    # the owner token is part of the key
+    assert cache.get("v2", "a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert stats["bytes"] == value.nbytes
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = ResultCache(ttl=10.0)
+    cache.put("v1", "a", _vectors())
+    clock.now += 10.0
+    assert cache.get("v1", "a") is not None
+    clock.now += 0.5
+    assert cache.get("v1", "a") is None
+    # an expired entry is dropped on lookup and its bytes released
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_evicts_least_recently_used_by_entry_count():
+    cache = ResultCache(max_entries=2)
+    cache.put("v1", "a", _vectors())
+    cache.put("v1", "b", _vectors())
+    assert cache.get("v1", "a") is not None
+    cache.put("v1", "c", _vectors())
+    assert cache.get("v1", "b") is None
+    assert cache.get("v1", "a") is not None
+    assert cache.get("v1", "c") is not None
+
+
+def test_evicts_by_byte_budget_and_skips_oversized_values():
+    one = _vectors().nbytes
+    cache = ResultCache(max_bytes=2 * one)
+    cache.put("v1", "a", _vectors())
+    cache.put("v1", "b", _vectors())
+    cache.put("v1", "c", _vectors())
+    assert cache.get("v1", "a") is None
+    assert cache.stats()["bytes"] == 2 * one
+    cache.put("v1", "big", _vectors(n_jobs=100))
+    assert cache.get("v1", "big") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_replacing_a_key_keeps_the_byte_count_exact():
+    cache = ResultCache()
+    cache.put("v1", "a", _vectors(n_jobs=4))
+    cache.put("v1", "a", _vectors(n_jobs=8))
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == _vectors(n_jobs=8).nbytes
+
+
+def test_invalidate_drops_only_that_owner():
+    cache = ResultCache()
+    cache.put("v1", "a", _vectors())
+    cache.put("v1", "b", _vectors())
+    cache.put("v2", "a", _vectors())
+    cache.invalidate("v1")
+    assert cache.get("v1", "a") is None
+    assert cache.get("v1", "b") is None
+    assert cache.get("v2", "a") is not None
+    assert cache.stats()["bytes"] == _vectors().nbytes
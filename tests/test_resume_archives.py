@@ -0,0 +1,57 @@
+import io
+import zipfile
+
+from backend.routes.resumes import MAX_ARCHIVE_MEMBERS, _expand
+
+
+def _zip(files, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _expand_all(uploads, max_bytes=1 << 20):
+    errors = []
+    items = list(_expand(uploads, max_bytes, errors))
+    return items, {e.name: e.error for e in errors}
+
+
+def test_plain_files_and_archive_members_pass_through():
+    archive = _zip({"r1.txt": "python sql", "notes.md": "x", "dir/r2.txt": "excel"})
+    items, errors = _expand_all([("a.txt", b"aws"), ("batch.zip", archive)])
+    assert items == [("a.txt", b"aws"), ("r1.txt", b"python sql"), ("notes.md", b""), ("dir/r2.txt", b"excel")]
+    assert errors == {}
+
+
+def test_corrupt_archive_is_an_error_entry():
+    items, errors = _expand_all([("broken.zip", b"PK\x03\x04 not really a zip"), ("ok.txt", b"python")])
+    assert items == [("ok.txt", b"python")]
+    assert errors["broken.zip"].startswith("Unreadable archive")
+
+
+def test_oversized_member_is_rejected_before_reading():
+    # highly compressible, so the archive itself is tiny
+    archive = _zip({"bomb.txt": b"a" * (5 << 20), "small.txt": b"python"})
+    assert len(archive) < 64 << 10
+    items, errors = _expand_all([("bomb.zip", archive)], max_bytes=1 << 20)
+    assert items == [("small.txt", b"python")]
+    assert errors["bomb.txt"].startswith("File too large")
+
+
+def test_corrupt_member_is_an_error_entry():
+    archive = bytearray(_zip({"r.txt": b"python sql docker " * 50}, compression=zipfile.ZIP_STORED))
+    # flip payload bytes so the CRC check fails on read
+    start = archive.index(b"python")
+    archive[start:start + 6] = b"XXXXXX"
+    items, errors = _expand_all([("bad.zip", bytes(archive))])
+    assert items == []
+    assert errors["r.txt"].startswith("Unreadable archive member")
+
+
+def test_member_count_is_capped():
+    archive = _zip({f"r{i}.txt": "x" for i in range(MAX_ARCHIVE_MEMBERS + 3)}, compression=zipfile.ZIP_STORED)
+    items, errors = _expand_all([("many.zip", archive)])
+    assert len(items) == MAX_ARCHIVE_MEMBERS
+    assert "limit" in errors["many.zip"]
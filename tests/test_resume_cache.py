@@ -0,0 +1,63 @@
+import numpy as np
+import scipy.sparse as sp
+
+from app import resume_cache as resume_cache_module
+from app.resume_cache import ResumeCache, ResumeFeatures, get_resume_cache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _features() -> ResumeFeatures:
+    return ResumeFeatures(sp.csr_matrix(np.array([[0.0, 0.5, 0.5]], dtype=np.float32)), np.array([1, 4], dtype=np.int32))
+
+
+def test_off_unless_a_path_is_configured(monkeypatch):
+    monkeypatch.delenv("RESUME_CACHE_PATH", raising=False)
+    assert get_resume_cache() is None
+
+
+def test_round_trips_text_and_features(tmp_path):
+    cache = ResumeCache(tmp_path / "cache.db")
+    cache.put_text("d1", "Python, SQL", "python sql")
+    cache.put_features("f1", "m1", _features())
+    assert cache.get_text("d1") == ("Python, SQL", "python sql")
+    got = cache.get_features("f1", "m1")
+    np.testing.assert_array_equal(got.tfidf.toarray(), _features().tfidf.toarray())
+    np.testing.assert_array_equal(got.skill_ids, [1, 4])
+    assert cache.get_features("f1", "m2") is None
+
+
+def test_entries_unused_for_ttl_are_not_served_and_are_deleted(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resume_cache_module.time, "time", clock)
+    cache = ResumeCache(tmp_path / "cache.db", ttl=100.0)
+    cache.put_text("old", "old resume", "old resume")
+    cache.put_features("old", "m1", _features())
+    clock.now += 50.0
+    # a hit refreshes last_used
+    assert cache.get_text("old") is not None
+    clock.now += 101.0
+    assert cache.get_text("old") is None
+    assert cache.get_features("old", "m1") is None
+
+    # the next write purges expired rows from the file
+    cache.put_text("new", "new resume", "new resume")
+    rows = cache._conn.execute("SELECT digest FROM documents").fetchall()
+    assert rows == [("new",)]
+    assert cache._conn.execute("SELECT COUNT(*) FROM features").fetchone()[0] == 0
+    assert cache.stats()["bytes"] == len("new resume") * 2
+
+
+def test_zero_ttl_keeps_entries(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(resume_cache_module.time, "time", clock)
+    cache = ResumeCache(tmp_path / "cache.db", ttl=0)
+    cache.put_text("d1", "text", "text")
+    clock.now += 10 * 365 * 24 * 3600.0
+    assert cache.get_text("d1") == ("text", "text")